@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_add_accessory_entities(
+    entry: ConfigEntry,
+    coordinator: DataUpdateCoordinator,
+    factories: dict[str, Callable[[], Entity]],
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add accessory entities once the coordinator sees the hardware.
+
+    `factories` maps a peripheral name (profiles.ACCESSORY_EXIST_KEYS) to a
+    function creating its entity. Accessories that are present (or not yet
+    reported) are added right away; missing ones are added from a coordinator
+    listener as soon as they are plugged in, without reloading the entry.
+    """
+    pending = dict(factories)
+
+    @callback
+    def _add_present() -> None:
+        present = [name for name in pending if coordinator.accessory_present(name)]
+        if not present:
+            return
+        _LOGGER.debug("Adding xTool accessory entities: %s", ", ".join(present))
+        async_add_entities([pending.pop(name)() for name in present])
+
+    _add_present()
+    if pending:
+        entry.async_on_unload(coordinator.async_add_listener(_add_present))
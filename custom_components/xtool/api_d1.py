@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from typing import Any
 
-from aiohttp import ClientSession, ClientTimeout
+from aiohttp import ClientSession, ClientTimeout, MultipartWriter
+
+# Uploads of large raster jobs can take minutes; only bound the idle time
+UPLOAD_TIMEOUT = ClientTimeout(total=None, sock_connect=10, sock_read=120)
 
 
 @dataclass
@@ -66,3 +70,17 @@ class XToolD1Api:
             return data if isinstance(data, dict) else None
         except Exception:
             return None
+
+    async def upload_job(self, filename: str, chunks: AsyncIterator[bytes]) -> Any:
+        """Stream a G-code file to the device (multipart, chunked transfer)."""
+        with MultipartWriter("form-data") as mp:
+            part = mp.append(chunks, {"Content-Type": "application/octet-stream"})
+            part.set_content_disposition("form-data", name="file", filename=filename)
+
+        url = f"{self.base}/cnc/data?filetype=1"
+        async with self.session.post(url, data=mp, timeout=UPLOAD_TIMEOUT) as resp:
+            resp.raise_for_status()
+            ctype = (resp.headers.get("Content-Type") or "").lower()
+            if "application/json" in ctype:
+                return await resp.json()
+            return (await resp.text()).strip()
@@ -4,6 +4,8 @@ import asyncio
 import json
 import logging
 import re
+import time
+from collections.abc import Callable
 from typing import Any
 
 from aiohttp import ClientSession, ClientWebSocketResponse, WSMsgType
@@ -13,7 +15,17 @@ _LOGGER = logging.getLogger(__name__)
 _WS_PORT = 8081
 _CONNECT_TIMEOUT = 8.0
 _SEND_TIMEOUT = 5.0
-
+# Upper bound for outstanding query() calls; further queries are refused
+_MAX_PENDING_QUERIES = 16
+
+# Leading M-code of a reply frame ("M2003{...}", "M303 X.. Y..")
+_CODE_RE = re.compile(r'M\d+')
+# Binary frames wrap the M-code text in a binary header/footer: runs of control
+# bytes separate the text payloads
+_BINARY_SEP_RE = re.compile(rb'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]+')
+_BINARY_CODE_RE = re.compile(rb'M\d+')
+# Non-ASCII bytes a binary footer may leave at the end of a payload
+_HIGH_BYTES = bytes(range(0x80, 0x100))
 # Regex for M105 format "X0.00Y0.00Z0.00" (no spaces between axes)
 _M105_RE = re.compile(r'([XYZ])([+-]?\d+\.\d+)')
 # Regex for M313 "Zxx.xxx"
@@ -21,7 +33,7 @@ _M313_RE = re.compile(r'Z([+-]?\d+\.\d+)')
 # Regex for M340 "Axx"
 _M340_RE = re.compile(r'A(\S+)')
 # Regex for M222 "Sxx"
-_M222_RE = re.compile(r'S(\S+)')
+_M222_RE = re.compile(r'S?(\S+)')
 # Regex for M810 filename (quoted)
 _M810_RE = re.compile(r'"([^"]*)"')
 # Regex for M303 "X... Y..."
@@ -63,6 +75,12 @@ def _parse_m105(val: str) -> dict[str, Any]:
     return out
 
 
+def _work_state_raw(val: str) -> str:
+    """Normalize an M222 value ("S3" or just "3", depending on firmware) to "S3"."""
+    val = val.strip()
+    return val if val.startswith("S") else "S" + val
+
+
 def _parse_m13(val: str) -> dict[str, Any]:
     """Parse 'A70 B70' into fan_a/fan_b ints."""
     out: dict[str, Any] = {}
@@ -80,6 +98,59 @@ def _parse_m13(val: str) -> dict[str, Any]:
     return out
 
 
+def _split_lines(text: str, messages: list[str]) -> None:
+    """Append one message per M-code line of `text` to `messages`.
+
+    Lines that do not start with an M-code continue the previous message
+    (e.g. a pretty-printed M2003 JSON body); text before the first M-code is
+    dropped.
+    """
+    current: list[str] | None = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if _CODE_RE.match(line):
+            if current:
+                messages.append("\n".join(current))
+            current = [line]
+        elif current is not None:
+            current.append(line)
+    if current:
+        messages.append("\n".join(current))
+
+
+def split_text_frame(text: str) -> list[str]:
+    """Return every M-code message contained in a text frame."""
+    messages: list[str] = []
+    _split_lines(text, messages)
+    return messages
+
+
+def _decode_payload(payload: bytes) -> str:
+    """Decode a binary payload: UTF-8, else latin-1 like the old firmware path."""
+    try:
+        return payload.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    try:
+        # Footer residue after otherwise valid UTF-8 text
+        return payload.rstrip(_HIGH_BYTES).decode("utf-8")
+    except UnicodeDecodeError:
+        return payload.decode("latin-1")
+
+
+def split_binary_frame(raw: bytes) -> list[str]:
+    """Return every M-code message contained in a binary frame."""
+    messages: list[str] = []
+    for segment in _BINARY_SEP_RE.split(raw):
+        # Skip printable leftovers of the header in front of the first code
+        m = _BINARY_CODE_RE.search(segment)
+        if m:
+            _split_lines(_decode_payload(segment[m.start():]), messages)
+    return messages
+
+
 class XToolS1Api:
     """WebSocket API client for the xTool S1."""
 
@@ -89,6 +160,11 @@ class XToolS1Api:
         self._ws: ClientWebSocketResponse | None = None
         self._listen_task: asyncio.Task | None = None
         self._state: dict[str, Any] = {"_unavailable": True}
+        self._position_listeners: list[Callable[[float, float], None]] = []
+        # time.monotonic() of the last frame received from the device
+        self._last_frame: float | None = None
+        # Outstanding query() futures by the M-code of the expected reply
+        self._waiters: dict[str, list[asyncio.Future[dict[str, Any]]]] = {}
 
     @property
     def connected(self) -> bool:
@@ -98,6 +174,33 @@ class XToolS1Api:
     def state(self) -> dict[str, Any]:
         return self._state
 
+    @property
+    def data_age(self) -> float | None:
+        """Seconds since the last frame was received (None before the first one)."""
+        if self._last_frame is None:
+            return None
+        return time.monotonic() - self._last_frame
+
+    def add_position_listener(
+        self, listener: Callable[[float, float], None]
+    ) -> Callable[[], None]:
+        """Call `listener(x, y)` for every head position the device reports."""
+        self._position_listeners.append(listener)
+
+        def _remove() -> None:
+            if listener in self._position_listeners:
+                self._position_listeners.remove(listener)
+
+        return _remove
+
+    def _notify_position(self) -> None:
+        x = self._state.get("pos_x")
+        y = self._state.get("pos_y")
+        if x is None or y is None:
+            return
+        for listener in self._position_listeners:
+            listener(x, y)
+
     async def connect(self) -> bool:
         """Open WebSocket connection and start background listener."""
         url = f"ws://{self._ip}:{_WS_PORT}/"
@@ -106,6 +209,7 @@ class XToolS1Api:
                 url, timeout=_CONNECT_TIMEOUT, heartbeat=30
             )
             self._state = {"_unavailable": False}
+            self._last_frame = time.monotonic()
             self._listen_task = asyncio.ensure_future(self._listen_loop())
             _LOGGER.debug("S1 %s WebSocket connected", self._ip)
             return True
@@ -126,18 +230,62 @@ class XToolS1Api:
         if self._ws and not self._ws.closed:
             await self._ws.close()
         self._ws = None
+        self._fail_waiters()
+
+    async def query(self, code: str, timeout: float = 3.0) -> dict[str, Any] | None:
+        """Send `code` and return the parsed fields of its reply.
+
+        Returns None on timeout, disconnect, or when too many queries are
+        already pending.
+        """
+        if not self.connected:
+            return None
+        if sum(len(w) for w in self._waiters.values()) >= _MAX_PENDING_QUERIES:
+            _LOGGER.debug("S1 %s too many pending queries, dropping %s", self._ip, code)
+            return None
+
+        fut: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.setdefault(code, [])
+        waiters.append(fut)
+        try:
+            await self._send(f"{code}\n")
+            return await asyncio.wait_for(fut, timeout)
+        except (asyncio.TimeoutError, ConnectionError):
+            _LOGGER.debug("S1 %s no reply to %s", self._ip, code)
+            return None
+        finally:
+            if fut in waiters:
+                waiters.remove(fut)
+            if not waiters and self._waiters.get(code) is waiters:
+                del self._waiters[code]
+
+    def _resolve_waiters(self, code: str, update: dict[str, Any]) -> None:
+        for fut in self._waiters.pop(code, ()):
+            if not fut.done():
+                fut.set_result(update)
+
+    def _fail_waiters(self) -> None:
+        waiters, self._waiters = self._waiters, {}
+        for futs in waiters.values():
+            for fut in futs:
+                if not fut.done():
+                    fut.set_exception(ConnectionError("S1 WebSocket closed"))
+
+    async def send_code(self, code: str) -> None:
+        """Send an M-code without waiting for its reply."""
+        await self._send(f"{code}\n")
 
     async def request_status(self) -> None:
         """Send M2003 to trigger a full status push from the device."""
-        await self._send("M2003\n")
+        await self.send_code("M2003")
 
     async def ping(self) -> None:
         """Send M303 as keepalive/position refresh."""
-        await self._send("M303\n")
+        await self.send_code("M303")
 
     async def request_purifier_status(self) -> None:
         """Send M9039 to request current air cleaner state."""
-        await self._send("M9039\n")
+        await self.send_code("M9039")
 
     async def _send(self, text: str) -> None:
         if not self.connected:
@@ -151,18 +299,15 @@ class XToolS1Api:
         """Background task: read frames and update _state."""
         try:
             async for msg in self._ws:
+                self._last_frame = time.monotonic()
                 if msg.type == WSMsgType.TEXT:
-                    self._handle_message(msg.data)
+                    for message in split_text_frame(msg.data):
+                        self._handle_message(message)
                 elif msg.type == WSMsgType.BINARY:
                     # Some messages (e.g. M9039) arrive as binary frames with a
-                    # binary header/footer. Extract the M-code text payload.
-                    try:
-                        decoded = msg.data.decode("latin-1")
-                        m = re.search(r'(M\d+ \S.*)', decoded)
-                        if m:
-                            self._handle_message(m.group(1))
-                    except Exception as err:
-                        _LOGGER.debug("S1 %s binary frame parse error: %s", self._ip, err)
+                    # binary header/footer, possibly several per frame
+                    for message in split_binary_frame(msg.data):
+                        self._handle_message(message)
                 elif msg.type in (WSMsgType.CLOSE, WSMsgType.ERROR, WSMsgType.CLOSED):
                     break
         except asyncio.CancelledError:
@@ -173,83 +318,108 @@ class XToolS1Api:
             _LOGGER.debug("S1 %s WebSocket listener stopped", self._ip)
             self._state["_unavailable"] = True
             self._ws = None
+            self._fail_waiters()
 
     def _handle_message(self, text: str) -> None:
-        """Parse an incoming WebSocket frame and merge into _state."""
+        """Parse one M-code message and merge it into _state."""
         text = text.strip()
         if not text:
             return
 
         try:
-            if text.startswith("M2003{"):
-                # Full status JSON: strip prefix, parse JSON
-                json_str = text[len("M2003"):]
-                data = json.loads(json_str)
-                self._state.update(self._parse_m2003(data))
-                self._state["_unavailable"] = False
-
-            elif text.startswith("M222 "):
-                m = _M222_RE.search(text[5:])
-                if m:
-                    self._state["work_state_raw"] = m.group(1)
-
-            elif text.startswith("M810 "):
-                m = _M810_RE.search(text[5:])
-                if m:
-                    val = m.group(1)
-                    self._state["job_file"] = None if val.upper() == "NULL" else val
-
-            elif text.startswith("M340 "):
-                m = _M340_RE.search(text[5:])
-                if m:
-                    alarm_raw = m.group(1)
-                    self._state["alarm_raw"] = alarm_raw
-                    self._state["alarm_present"] = (alarm_raw != "A0" and alarm_raw != "0")
-
-            elif text.startswith("M303 "):
-                m = _M303_RE.search(text[5:])
-                if m:
-                    try:
-                        self._state["pos_x"] = float(m.group(1))
-                        self._state["pos_y"] = float(m.group(2))
-                    except ValueError:
-                        pass
-
-            elif text.startswith("M313 "):
-                m = _M313_RE.search(text[5:])
-                if m:
-                    try:
-                        self._state["probe_z"] = float(m.group(1))
-                    except ValueError:
-                        pass
-
-            elif text.startswith("M9039 "):
-                body = text[6:]
-                # A{n} = running at speed n (1-4), C{n} = off
-                m = _M9039_SPEED_RE.search(body)
-                if m:
-                    prefix, num = m.group(1), int(m.group(2))
-                    speed = 0 if prefix == "C" else num
-                    self._state["purifier_speed"] = speed
-                    self._state["purifier_on"] = speed > 0
-                # H-L = filter remaining percentages
-                f = _M9039_FILTERS_RE.search(body)
-                if f:
-                    self._state["filter_pre"] = int(f.group(1))
-                    self._state["filter_medium"] = int(f.group(2))
-                    self._state["filter_carbon"] = int(f.group(3))
-                    self._state["filter_dense_carbon"] = int(f.group(4))
-                    self._state["filter_hepa"] = int(f.group(5))
-                # D and S = unknown fields
-                d = _M9039_D_RE.search(body)
-                if d:
-                    self._state["purifier_sensor_d"] = int(d.group(1))
-                s = _M9039_S_RE.search(body)
-                if s:
-                    self._state["purifier_sensor_s"] = int(s.group(1))
-
+            parsed = self._parse_message(text)
         except Exception as err:
             _LOGGER.debug("S1 %s message parse error: %s | text=%r", self._ip, err, text)
+            return
+        if parsed is None:
+            return
+
+        code, update = parsed
+        self._state.update(update)
+        if code == "M2003":
+            self._state["_unavailable"] = False
+        if "pos_x" in update or "pos_y" in update:
+            self._notify_position()
+        self._resolve_waiters(code, update)
+
+    def _parse_message(self, text: str) -> tuple[str, dict[str, Any]] | None:
+        """Return (M-code, state update) for a message, None if not understood."""
+        m = _CODE_RE.match(text)
+        if not m:
+            return None
+        code = m.group(0)
+        body = text[len(code):].strip()
+        update: dict[str, Any] = {}
+
+        if code == "M2003":
+            if not body.startswith("{"):
+                return None
+            # Full status JSON
+            update = self._parse_m2003(json.loads(body))
+
+        elif code == "M222":
+            m = _M222_RE.search(body)
+            if m:
+                update["work_state_raw"] = _work_state_raw(m.group(1))
+
+        elif code == "M810":
+            m = _M810_RE.search(body)
+            if m:
+                val = m.group(1)
+                update["job_file"] = None if val.upper() == "NULL" else val
+
+        elif code == "M340":
+            m = _M340_RE.search(body)
+            if m:
+                alarm_raw = m.group(1)
+                update["alarm_raw"] = alarm_raw
+                update["alarm_present"] = (alarm_raw != "A0" and alarm_raw != "0")
+
+        elif code == "M303":
+            m = _M303_RE.search(body)
+            if m:
+                try:
+                    update["pos_x"] = float(m.group(1))
+                    update["pos_y"] = float(m.group(2))
+                except ValueError:
+                    update = {}
+
+        elif code == "M313":
+            m = _M313_RE.search(body)
+            if m:
+                try:
+                    update["probe_z"] = float(m.group(1))
+                except ValueError:
+                    pass
+
+        elif code == "M9039":
+            # A{n} = running at speed n (1-4), C{n} = off
+            m = _M9039_SPEED_RE.search(body)
+            if m:
+                prefix, num = m.group(1), int(m.group(2))
+                speed = 0 if prefix == "C" else num
+                update["purifier_speed"] = speed
+                update["purifier_on"] = speed > 0
+            # H-L = filter remaining percentages
+            f = _M9039_FILTERS_RE.search(body)
+            if f:
+                update["filter_pre"] = int(f.group(1))
+                update["filter_medium"] = int(f.group(2))
+                update["filter_carbon"] = int(f.group(3))
+                update["filter_dense_carbon"] = int(f.group(4))
+                update["filter_hepa"] = int(f.group(5))
+            # D and S = unknown fields
+            d = _M9039_D_RE.search(body)
+            if d:
+                update["purifier_sensor_d"] = int(d.group(1))
+            s = _M9039_S_RE.search(body)
+            if s:
+                update["purifier_sensor_s"] = int(s.group(1))
+
+        else:
+            return None
+
+        return code, update
 
     def _parse_m2003(self, data: dict[str, Any]) -> dict[str, Any]:
         """Map M2003 JSON fields to normalized _state keys."""
@@ -258,11 +428,7 @@ class XToolS1Api:
         # Work state from M222 field (primary state indicator, M97 is ignored)
         m222 = data.get("M222")
         if m222 is not None:
-            # M222 value in JSON may be "S3" or just "3" depending on firmware
-            raw = str(m222).strip()
-            if not raw.startswith("S"):
-                raw = "S" + raw
-            out["work_state_raw"] = raw
+            out["work_state_raw"] = _work_state_raw(str(m222))
 
         # Position
         m27 = data.get("M27")
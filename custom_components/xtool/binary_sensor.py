@@ -12,6 +12,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, MANUFACTURER
+from .profiles import DeviceProfile
 
 
 async def async_setup_entry(
@@ -72,7 +73,7 @@ async def async_setup_entry(
                 ),
             ]
         )
-        async_add_entities(entities, True)
+        async_add_entities(entities)
         return
 
     if device_type == "s1":
@@ -84,7 +85,7 @@ async def async_setup_entry(
                 S1PurifierRunningBinarySensor(coordinator, name, entry_id, device_type),
             ]
         )
-        async_add_entities(entities, True)
+        async_add_entities(entities)
         return
 
     if device_type == "d1":
@@ -144,7 +145,7 @@ async def async_setup_entry(
                 )
             )
 
-        async_add_entities(entities, True)
+        async_add_entities(entities)
         return
 
     entities.extend(
@@ -156,13 +157,14 @@ async def async_setup_entry(
         ]
     )
 
-    if device_type != "p2":
+    profile: DeviceProfile = store["profile"]
+    if profile.machine_lock_entity:
         entities.append(XToolMachineLockBinarySensor(coordinator, name, entry_id, device_type))
 
-    if device_type not in ("m1u", "m1 ultra", "f1"):
+    if profile.has_drawer:
         entities.append(XToolDrawerOpenBinarySensor(coordinator, name, entry_id, device_type))
 
-    if device_type in ("m1u", "m1 ultra"):
+    if profile.module_entities:
         entities.extend(
             [
                 XToolAirAssistConnectedBinarySensor(coordinator, name, entry_id, device_type),
@@ -173,7 +175,7 @@ async def async_setup_entry(
             ]
         )
 
-    async_add_entities(entities, True)
+    async_add_entities(entities)
 
 
 class _BaseBinary(CoordinatorEntity, BinarySensorEntity):
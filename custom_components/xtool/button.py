@@ -9,6 +9,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, MANUFACTURER
+from .profiles import DeviceProfile
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -23,7 +24,8 @@ async def async_setup_entry(
     device_type: str = store.get("device_type", "").lower()
 
     # Only add the Sync button for the M1 Ultra
-    if device_type in ("m1u", "m1 ultra"):
+    profile: DeviceProfile = store["profile"]
+    if profile.module_entities:
         async_add_entities([XToolSyncKnifeButton(coordinator, name, entry_id, device_type)])
 
 
@@ -1,27 +1,34 @@
 from __future__ import annotations
 
+import asyncio
+from collections import OrderedDict
+import hashlib
 import logging
-from typing import Optional
+import threading
+from typing import TYPE_CHECKING, Optional
 from datetime import timedelta
 
-import requests
-
-from homeassistant.components.camera import Camera, CameraEntityFeature
+from aiohttp import web
+from homeassistant.components.camera import Camera, CameraEntityFeature, Image
+from homeassistant.components.camera.img_util import scale_jpeg_camera_image
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
-from . import XToolCoordinator
 from .const import (
     DOMAIN,
     CONF_IP_ADDRESS,
     CONF_DEVICE_TYPE,
     MANUFACTURER,
+    V2_ACTIVE_MODES,
 )
 
+if TYPE_CHECKING:
+    from .coordinator import XToolCoordinator
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -30,7 +37,58 @@ STREAM_PATHS: dict[int, str] = {
     1: "/camera/snap?stream=1",
 }
 
-MIN_SNAPSHOT_INTERVAL = timedelta(seconds=30)
+# Snapshot refresh policy, derived from the coordinator state
+ACTIVE_SNAPSHOT_INTERVAL = timedelta(seconds=3)  # job running / lid just opened
+IDLE_SNAPSHOT_INTERVAL = timedelta(minutes=5)
+LID_OPEN_ACTIVE_PERIOD = timedelta(minutes=2)
+
+# Live (MJPEG) stream: one shared producer per camera, seconds between frames
+STREAM_ACTIVE_INTERVAL = 1.0
+STREAM_IDLE_INTERVAL = 10.0
+STREAM_KEEPALIVE_INTERVAL = 30.0  # resend the last frame while nothing is fetched
+# Above this many viewers the frame rate is halved to bound the outgoing traffic
+STREAM_MANY_VIEWERS = 5
+
+# Scaled snapshot variants (dashboard thumbnails, notifications) shared by all cameras
+THUMBNAIL_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+ACTIVITY_OFF = "off"
+ACTIVITY_IDLE = "idle"
+ACTIVITY_ACTIVE = "active"
+
+
+class _ThumbnailCache:
+    """LRU cache of scaled JPEGs keyed by (camera, frame hash, width, height)."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._items: OrderedDict[tuple[str, str, int, int], bytes] = OrderedDict()
+        # camera_image() runs in executor threads
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str, int, int]) -> bytes | None:
+        with self._lock:
+            image = self._items.get(key)
+            if image is not None:
+                self._items.move_to_end(key)
+            return image
+
+    def put(self, key: tuple[str, str, int, int], image: bytes) -> None:
+        if len(image) > self._max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[key] = image
+            self._size += len(image)
+            while self._size > self._max_bytes:
+                _key, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+
+_THUMBNAILS = _ThumbnailCache(THUMBNAIL_CACHE_MAX_BYTES)
 
 
 async def async_setup_entry(
@@ -83,7 +141,7 @@ async def async_setup_entry(
     async_add_entities(cameras)
 
 
-class XToolCamera(CoordinatorEntity[XToolCoordinator], Camera):
+class XToolCamera(CoordinatorEntity["XToolCoordinator"], Camera):
     _attr_has_entity_name = True
     _attr_should_poll = False
 
@@ -124,8 +182,15 @@ class XToolCamera(CoordinatorEntity[XToolCoordinator], Camera):
         self._attr_available = True
 
         self._last_image: bytes | None = None
+        # (image, sha1) of the current frame, replaced atomically for executor readers
+        self._frame: tuple[bytes, str] | None = None
         self._last_updated = None
 
+        self._activity: tuple[str, bool | None] | None = None
+        self._lid_opened_at = None
+
+        self._stream = _SnapshotBroadcaster(self)
+
         _LOGGER.debug(
             "xTool P2 Camera %s initialized: ip=%s, unique_id=%s",
             index,
@@ -151,29 +216,143 @@ class XToolCamera(CoordinatorEntity[XToolCoordinator], Camera):
 
         return True
 
+    def _activity_level(self) -> str:
+        """Classify the machine state for the snapshot refresh policy."""
+        if self._is_unavailable():
+            return ACTIVITY_OFF
+
+        data = self.coordinator.data or {}
+        mode = str(data.get("work_state_raw") or "").upper()
+
+        if "SLEEP" in mode or "STANDBY" in mode:
+            return ACTIVITY_OFF
+        if mode in V2_ACTIVE_MODES:
+            return ACTIVITY_ACTIVE
+        if (
+            self._lid_opened_at is not None
+            and dt_util.utcnow() - self._lid_opened_at < LID_OPEN_ACTIVE_PERIOD
+        ):
+            return ACTIVITY_ACTIVE
+        return ACTIVITY_IDLE
+
+    def _snapshot_interval(self) -> timedelta | None:
+        """Return the max frame age for the current state (None = never fetch)."""
+        level = self._activity_level()
+        if level == ACTIVITY_OFF:
+            return None
+        if level == ACTIVITY_ACTIVE:
+            return ACTIVE_SNAPSHOT_INTERVAL
+        return IDLE_SNAPSHOT_INTERVAL
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        data = self.coordinator.data or {}
+        activity = (
+            str(data.get("work_state_raw") or "").upper(),
+            data.get("lid_open"),
+        )
+        if activity != self._activity:
+            if self._activity is not None:
+                # State changed: the next request fetches a fresh frame
+                self._last_updated = None
+                if activity[1] and not self._activity[1]:
+                    self._lid_opened_at = dt_util.utcnow()
+            self._activity = activity
+            self._stream.wake()
+        super()._handle_coordinator_update()
+
+    async def async_will_remove_from_hass(self) -> None:
+        await self._stream.async_stop()
+        await super().async_will_remove_from_hass()
+
+    async def handle_async_mjpeg_stream(
+        self, request: web.Request
+    ) -> web.StreamResponse | None:
+        """Serve a multipart JPEG stream fed by the shared snapshot producer."""
+        response = web.StreamResponse()
+        response.content_type = "multipart/x-mixed-replace;boundary=frame"
+        await response.prepare(request)
+
+        queue = self._stream.subscribe()
+        try:
+            while True:
+                frame = await queue.get()
+                await response.write(
+                    b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: "
+                    + str(len(frame)).encode()
+                    + b"\r\n\r\n"
+                    + frame
+                    + b"\r\n"
+                )
+        except ConnectionResetError:
+            pass
+        finally:
+            self._stream.unsubscribe(queue)
+        return response
+
+    async def async_stream_frame(self, max_age: float) -> bytes | None:
+        """Return a frame no older than `max_age` seconds, fetching if needed."""
+        now = dt_util.utcnow()
+        if (
+            self._last_image is not None
+            and self._last_updated is not None
+            and (now - self._last_updated).total_seconds() < max_age
+        ):
+            return self._last_image
+
+        image = await self.hass.async_add_executor_job(self._fetch_snapshot, self._index)
+        if image is not None:
+            self._set_frame(image)
+        return self._last_image
+
+    def _set_frame(self, image: bytes) -> None:
+        self._frame = (image, hashlib.sha1(image).hexdigest())
+        self._last_image = image
+        self._last_updated = dt_util.utcnow()
+
+    def _scaled(self, width: int | None, height: int | None) -> bytes | None:
+        """Return the current frame scaled to the requested size (cached)."""
+        frame = self._frame
+        if frame is None or not width or not height:
+            return self._last_image
+
+        image, frame_hash = frame
+
+        key = (self._attr_unique_id, frame_hash, width, height)
+        scaled = _THUMBNAILS.get(key)
+        if scaled is None:
+            scaled = scale_jpeg_camera_image(Image("image/jpeg", image), width, height)
+            _THUMBNAILS.put(key, scaled)
+        return scaled
+
     def camera_image(
         self,
         width: Optional[int] = None,
         height: Optional[int] = None,
     ) -> bytes | None:
+        self._refresh_frame()
+        return self._scaled(width, height)
+
+    def _refresh_frame(self) -> None:
         now = dt_util.utcnow()
 
         if self._is_unavailable():
-            return self._last_image
+            return
+
+        interval = self._snapshot_interval()
+        if interval is None:
+            return
 
         if (
             self._last_image is not None
             and self._last_updated is not None
-            and now - self._last_updated < MIN_SNAPSHOT_INTERVAL
+            and now - self._last_updated < interval
         ):
-            return self._last_image
+            return
 
         image = self._fetch_snapshot(self._index)
         if image is not None:
-            self._last_image = image
-            self._last_updated = now
-
-        return self._last_image
+            self._set_frame(image)
 
     def _fetch_snapshot(self, index: int) -> bytes | None:
         path = STREAM_PATHS.get(index)
@@ -188,6 +367,9 @@ class XToolCamera(CoordinatorEntity[XToolCoordinator], Camera):
             url,
         )
 
+        # Imported here (executor) so other device types never load requests
+        import requests
+
         try:
             response = requests.get(url, timeout=5)
             response.raise_for_status()
@@ -200,3 +382,86 @@ class XToolCamera(CoordinatorEntity[XToolCoordinator], Camera):
                 err,
             )
             return None
+
+
+class _SnapshotBroadcaster:
+    """Fan one camera's snapshots out to all connected MJPEG viewers.
+
+    A single producer task fetches frames while at least one viewer is
+    connected, so the device load does not depend on the number of viewers.
+    Every viewer has a one-slot queue; slow viewers skip frames instead of
+    buffering them.
+    """
+
+    def __init__(self, camera: XToolCamera) -> None:
+        self._camera = camera
+        self._viewers: set[asyncio.Queue[bytes]] = set()
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+
+    def subscribe(self) -> asyncio.Queue[bytes]:
+        queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=1)
+        if self._camera._last_image is not None:
+            # New viewers see the cached frame immediately
+            queue.put_nowait(self._camera._last_image)
+        self._viewers.add(queue)
+        if self._task is None:
+            self._task = self._camera.hass.async_create_background_task(
+                self._run(), f"xtool camera stream {self._camera.entity_id}"
+            )
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[bytes]) -> None:
+        self._viewers.discard(queue)
+        if not self._viewers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    async def async_stop(self) -> None:
+        task, self._task = self._task, None
+        self._viewers.clear()
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def _interval(self) -> float | None:
+        level = self._camera._activity_level()
+        if level == ACTIVITY_OFF:
+            return None
+        interval = (
+            STREAM_ACTIVE_INTERVAL if level == ACTIVITY_ACTIVE else STREAM_IDLE_INTERVAL
+        )
+        if len(self._viewers) > STREAM_MANY_VIEWERS:
+            interval *= 2
+        return interval
+
+    def _publish(self, frame: bytes) -> None:
+        for queue in self._viewers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(frame)
+
+    async def _run(self) -> None:
+        last_sent: bytes | None = None
+        while self._viewers:
+            interval = self._interval()
+            if interval is None:
+                frame = self._camera._last_image
+                interval = STREAM_KEEPALIVE_INTERVAL
+            else:
+                frame = await self._camera.async_stream_frame(interval)
+
+            keepalive = interval >= STREAM_KEEPALIVE_INTERVAL
+            if frame is not None and (frame is not last_sent or keepalive):
+                self._publish(frame)
+                last_sent = frame
+
+            # State changes (job start, lid opened) cut the wait short
+            try:
+                await asyncio.wait_for(self._wake.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
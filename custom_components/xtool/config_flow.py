@@ -4,6 +4,7 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_validation as cv
 
@@ -12,6 +13,8 @@ from .const import (
     CONF_IP_ADDRESS,
     CONF_DEVICE_TYPE,
     CONF_HAS_AP2,
+    CONF_FINISH_LEAD_TIME,
+    DEFAULT_FINISH_LEAD_TIME,
     SUPPORTED_DEVICE_TYPES,
 )
 
@@ -38,6 +41,13 @@ class XToolConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         self._data: dict = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        return XToolOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input: dict | None = None) -> FlowResult:
         if user_input is not None:
             device_type = _map_device_type(user_input[CONF_DEVICE_TYPE])
@@ -87,3 +97,29 @@ class XToolConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         return self.async_show_form(step_id="s1_accessories", data_schema=schema)
+
+
+class XToolOptionsFlow(config_entries.OptionsFlow):
+    """Runtime options (job finish notification lead time)."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        # Kept under our own name: HA only sets `config_entry` itself since
+        # 2024.11 and warns when a flow assigns it
+        self._config_entry = config_entry
+
+    async def async_step_init(self, user_input: dict | None = None) -> FlowResult:
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_FINISH_LEAD_TIME,
+                    default=self._config_entry.options.get(
+                        CONF_FINISH_LEAD_TIME, DEFAULT_FINISH_LEAD_TIME
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+            }
+        )
+
+        return self.async_show_form(step_id="init", data_schema=schema)
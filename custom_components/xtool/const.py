@@ -2,11 +2,13 @@
 DOMAIN = "xtool"
 
 # Supported Home Assistant platforms
-PLATFORMS: list[str] = ["sensor", "binary_sensor", "camera", "switch", "button"]
+PLATFORMS: list[str] = ["sensor", "binary_sensor", "camera", "switch", "button", "image"]
 
 CONF_IP_ADDRESS = "ip_address"
 CONF_DEVICE_TYPE = "device_type"
 CONF_HAS_AP2 = "has_ap2"  # Whether the S1 has an AP2 air cleaner attached
+CONF_FINISH_LEAD_TIME = "finish_lead_time"  # Minutes before the ETA to fire "finishing soon"
+DEFAULT_FINISH_LEAD_TIME = 5
 
 # Mapping of display names to internal device type codes
 SUPPORTED_DEVICE_TYPES: dict[str, str] = {
@@ -30,3 +32,52 @@ MANUFACTURER = "xTool"
 DEFAULT_UPDATE_INTERVAL = 10          # Fast update interval in seconds
 DEFAULT_SLOW_UPDATE_INTERVAL = 120    # Slow update interval (e.g. for static settings)
 HTTP_TIMEOUT = 5
+S1_PURIFIER_POLL_INTERVAL = 600     # AP2 filter/purifier refresh (M9039) in seconds
+S1_RUNNING_STATES = frozenset({"S13", "S14", "S19"})  # M222 states of an active job
+V2_ACTIVE_MODES = frozenset({"WORK", "P_WORK", "P_WORKING"})  # v2 HTTP modes of an active job
+D1_RUNNING_UPDATE_INTERVAL = 2      # D1 tick while a job is running (progress)
+D1_IDLE_UPDATE_INTERVAL = 20        # D1 heartbeat while idle (no /progress)
+D1_PERIPHERAL_UPDATE_INTERVAL = 20  # D1 /peripherystatus while running
+
+# AP2 filter keys reported by M9039 (H-L) and their display names
+AP2_FILTERS: dict[str, str] = {
+    "filter_pre": "Pre-filter",
+    "filter_medium": "Medium Efficiency Filter",
+    "filter_carbon": "Activated Carbon Filter",
+    "filter_dense_carbon": "Ultra Dense Carbon Mesh Filter",
+    "filter_hepa": "High Efficiency Filter",
+}
+# S1 telemetry: sampled from the live WebSocket state, never written to the recorder
+TELEMETRY_FIELDS: tuple[str, ...] = (
+    "pos_x",
+    "pos_y",
+    "temp_x",
+    "temp_y",
+    "temp_z",
+    "fan_a",
+    "fan_b",
+)
+# P2 camera streams recorded by the timelapse
+TIMELAPSE_STREAMS: tuple[int, ...] = (0, 1)
+
+# Events
+EVENT_FILTER_LOW = f"{DOMAIN}_filter_low"
+EVENT_JOB_FINISHING_SOON = f"{DOMAIN}_job_finishing_soon"
+
+# Services
+SERVICE_GET_JOB_HISTORY = "get_job_history"
+SERVICE_GET_TELEMETRY = "get_telemetry"
+SERVICE_GET_TIMELAPSE = "get_timelapse"
+SERVICE_UPLOAD_JOB = "upload_job"
+
+ATTR_ENTRY_ID = "entry_id"
+ATTR_LIMIT = "limit"
+ATTR_SINCE = "since"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_FIELDS = "fields"
+ATTR_MAX_POINTS = "max_points"
+ATTR_JOB = "job"
+ATTR_STREAM = "stream"
+ATTR_ASSEMBLE = "assemble"
+ATTR_PATH = "path"
@@ -0,0 +1,544 @@
+from __future__ import annotations
+
+from datetime import timedelta
+import logging
+from typing import Any
+
+import requests
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import (
+    DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_SLOW_UPDATE_INTERVAL,
+    HTTP_TIMEOUT,
+)
+from .profiles import ACCESSORY_EXIST_KEYS, PERIPHERAL_ENDPOINTS, get_profile
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _safe_json(resp: requests.Response) -> Any:
+    """Safely parse JSON responses."""
+    try:
+        return resp.json()
+    except Exception:  # noqa: BLE001
+        return (resp.text or "").strip()
+
+
+_PROGRESS_KEYS = ("progress", "workProgress", "percent")
+
+
+def _extract_progress(*sources: Any) -> float | None:
+    """Return the first job progress percentage found in the given payload dicts."""
+    for src in sources:
+        if not isinstance(src, dict):
+            continue
+        for key in _PROGRESS_KEYS:
+            try:
+                value = float(src[key])
+            except (KeyError, TypeError, ValueError):
+                continue
+            return value
+    return None
+
+
+# Display status per runningStatus mode
+_MODE_DISPLAY: dict[str, str] = {
+    "P_ERROR": "Error",
+    "WORK": "Running",
+    "P_WORK": "Running",
+    "P_WORKING": "Running",
+    "P_WORK_DONE": "Done",
+    "P_FINISH": "Done",
+    "P_IDLE": "Idle",
+    "P_SLEEP": "Sleep",
+    "P_ONLINE_READY_WORK": "Ready",
+    "P_OFFLINE_READY_WORK": "Ready",
+    "P_READY": "Ready",
+    "P_MEASURE": "Measuring",
+}
+
+
+def _is_invalid_or_not_supported(payload: Any) -> bool:
+    """Detect unsupported endpoints / invalid request payloads."""
+    if isinstance(payload, str):
+        s = payload.strip().lower()
+        return s in {"invalid request", "not support", "not supported"}
+    if isinstance(payload, dict) and payload.get("code") == 10:
+        msg = str(payload.get("msg", "")).lower()
+        return "device not support" in msg
+    return False
+
+
+class XToolCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """
+    Coordinator for the v2 HTTP models (P2/P3/F1/F2/M1/M1 Ultra/Apparel) + legacy fallback.
+
+    Which peripherals are read, the lid polarity and whether reads pause
+    while sleeping come from the model's DeviceProfile (profiles.py); the
+    list of reads is built once here instead of on every tick.
+    """
+
+    def __init__(self, hass: HomeAssistant, ip_address: str, device_type: str) -> None:
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"xtool_{ip_address}",
+            update_interval=timedelta(seconds=DEFAULT_UPDATE_INTERVAL),
+        )
+        self.ip_address = ip_address
+        self.device_type = device_type.lower()
+        self.profile = get_profile(self.device_type)
+        self._peripheral_reads: list[tuple[str, str, str, Any]] = [
+            (name, *PERIPHERAL_ENDPOINTS[name], getattr(self, f"_normalize_{name}"))
+            for name in self.profile.peripherals
+        ]
+        # Detected accessory presence by peripheral name (see ACCESSORY_EXIST_KEYS)
+        self.accessories: dict[str, bool] = {}
+
+        self._reachable_last: bool | None = None
+
+        self._slow_every = max(
+            1, int(DEFAULT_SLOW_UPDATE_INTERVAL / max(1, DEFAULT_UPDATE_INTERVAL))
+        )
+        self._tick = 0
+
+        self._cached_machine_info: dict[str, Any] | None = None
+        self._cached_working_info: dict[str, Any] | None = None
+        self._cached_config: dict[str, Any] | None = None
+
+        self._warnings_hash_last: str | None = None
+
+    def accessory_present(self, name: str) -> bool:
+        """False only once the device has reported the accessory as missing."""
+        return self.accessories.get(name) is not False
+
+    def _get(self, path: str) -> Any:
+        url = f"http://{self.ip_address}:8080{path}"
+        resp = requests.get(url, timeout=HTTP_TIMEOUT)
+        resp.raise_for_status()
+        return _safe_json(resp)
+
+    def _post(self, path: str, payload: dict[str, Any]) -> Any:
+        url = f"http://{self.ip_address}:8080{path}"
+        resp = requests.post(url, json=payload, timeout=HTTP_TIMEOUT)
+        resp.raise_for_status()
+        return _safe_json(resp)
+
+    def _warnings_list(self, alarm_obj: Any) -> list[dict[str, Any]]:
+        out: list[dict[str, Any]] = []
+        if not isinstance(alarm_obj, dict):
+            return out
+
+        alarm_list = alarm_obj.get("alarm")
+        if isinstance(alarm_list, list):
+            return [a for a in alarm_list if isinstance(a, dict)]
+
+        for k, v in alarm_obj.items():
+            if str(k).isdigit() and isinstance(v, dict):
+                out.append(v)
+        return out
+
+    def _warnings_summary(self, warnings: list[dict[str, Any]]) -> str:
+        parts: list[str] = []
+        for w in warnings:
+            module = str(w.get("module", "")).strip()
+            typ = str(w.get("type", "")).strip()
+            level = str(w.get("level", "")).strip()
+            info = str(w.get("info", "")).strip()
+
+            p = f"{module}:{typ}" if (module or typ) else "UNKNOWN"
+            if level:
+                p += f" ({level})"
+            if info:
+                p += f" - {info}"
+            parts.append(p)
+        return "; ".join(parts)
+
+    def _warnings_hash(self, warnings: list[dict[str, Any]]) -> str:
+        items: list[tuple[str, str, str, str]] = []
+        for w in warnings:
+            items.append(
+                (
+                    str(w.get("module", "")),
+                    str(w.get("type", "")),
+                    str(w.get("level", "")),
+                    str(w.get("info", "")),
+                )
+            )
+        items.sort()
+        return "|".join(["/".join(i) for i in items])
+
+    def _count_warnings(self, alarm_obj: Any) -> int:
+        if not isinstance(alarm_obj, dict):
+            return 0
+        alarm_list = alarm_obj.get("alarm")
+        if isinstance(alarm_list, list):
+            return len(alarm_list)
+        keys = [k for k in alarm_obj.keys() if str(k).isdigit()]
+        return len(keys)
+
+    def _normalize_running_status(self, raw: Any) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "work_state_raw": None,
+            "task_id": None,
+            "cpu_temp": None,
+            "alarm_present": None,
+            "alarm_current": None,
+            "alarm_history": None,
+            "dev_time": None,
+            "progress_pct": None,
+        }
+
+        if not isinstance(raw, dict):
+            return out
+
+        data = raw.get("data") if isinstance(raw.get("data"), dict) else {}
+        cur_mode = data.get("curMode") if isinstance(data.get("curMode"), dict) else {}
+
+        out["cpu_temp"] = data.get("cpuTemp")
+        out["dev_time"] = data.get("devTime")
+        out["work_state_raw"] = cur_mode.get("mode")
+        out["task_id"] = cur_mode.get("taskId")
+        out["progress_pct"] = _extract_progress(cur_mode, data)
+
+        cur_alarm = data.get("curAlarmInfo")
+        alarm_hist = data.get("alarmInfo")
+
+        out["alarm_current"] = cur_alarm
+        out["alarm_history"] = alarm_hist
+
+        warnings = self._warnings_list(cur_alarm)
+        out["alarm_present"] = len(warnings) > 0
+        return out
+
+    def _normalize_gap(self, raw: Any) -> dict[str, Any]:
+        """Normalize lid/gap state."""
+        lid_open = None
+        if isinstance(raw, dict):
+            data = raw.get("data") if isinstance(raw.get("data"), dict) else {}
+            state = str(data.get("state", "")).lower()
+            if state in {"on", "off"}:
+                # on = open (P2/F1/M1); M1 Ultra reports off = open
+                lid_open = state == ("off" if self.profile.gap_inverted else "on")
+        return {"lid_open": lid_open}
+
+    def _normalize_smoking_fan(self, raw: Any) -> dict[str, Any]:
+        """Normalize exhaust fan state and connectivity."""
+        out = {"fan_state": None, "fan_exist": None}
+        if isinstance(raw, dict) and isinstance(raw.get("data"), dict):
+            data = raw.get("data", {})
+            s = str(data.get("state", "")).lower()
+            if s in {"on", "off"}:
+                out["fan_state"] = s
+            if isinstance(data.get("exist"), bool):
+                out["fan_exist"] = data.get("exist")
+        return out
+
+    def _normalize_ext_purifier(self, raw: Any) -> dict[str, Any]:
+        out = {
+            "ext_purifier_state": None,
+            "ext_purifier_exist": None,
+            "ext_purifier_power": None,
+            "ext_purifier_current": None,
+        }
+        if isinstance(raw, dict) and isinstance(raw.get("data"), dict):
+            data = raw["data"]
+            st = str(data.get("state", "")).lower()
+            if st in {"on", "off"}:
+                out["ext_purifier_state"] = st
+            exist = data.get("exist")
+            if isinstance(exist, bool):
+                out["ext_purifier_exist"] = exist
+            else:
+                out["ext_purifier_exist"] = str(data.get("version", "{}")) != "{}"
+            out["ext_purifier_power"] = data.get("power")
+            out["ext_purifier_current"] = data.get("current")
+        return out
+
+    def _normalize_machine_lock(self, raw: Any) -> dict[str, Any]:
+        locked = None
+        if isinstance(raw, dict) and isinstance(raw.get("data"), dict):
+            st = str(raw["data"].get("state", "")).lower()
+            if st in {"on", "off"}:
+                locked = st == "on"
+        return {"machine_lock": locked}
+
+    def _normalize_drawer(self, raw: Any) -> dict[str, Any]:
+        """Normalize bottom drawer state (not applicable for M1 Ultra / F1)."""
+        drawer_open = None
+        if isinstance(raw, dict) and isinstance(raw.get("data"), dict):
+            st = str(raw["data"].get("state", "")).lower()
+            if st in {"on", "off"}:
+                # on = open, off = closed (your confirmed semantics)
+                drawer_open = st == "on"
+        return {"drawer_open": drawer_open}
+
+    def _normalize_airassist(self, raw: Any) -> dict[str, Any]:
+        """Normalize AirAssist connectivity and running state."""
+        out = {
+            "airassist_state": None,
+            "airassist_exist": None,
+            "airassist_power": None,
+            "airassist_version": None,
+            "airassist_fire_trigger": None,
+        }
+        if isinstance(raw, dict) and isinstance(raw.get("data"), dict):
+            data = raw["data"]
+            try:
+                power = float(data.get("power", 0))
+            except (ValueError, TypeError):
+                power = 0.0
+
+            # more stable across firmwares: "on" only if power > 0
+            out["airassist_state"] = "on" if power > 0 else "off"
+
+            version = str(data.get("version", "")).strip()
+            out["airassist_exist"] = bool(version)
+
+            out["airassist_power"] = power
+            out["airassist_version"] = version
+            out["airassist_fire_trigger"] = data.get("fireTiggerSta")
+        return out
+
+    def _normalize_heighten(self, raw: Any) -> dict[str, Any]:
+        """M1 Ultra hatch (door) state."""
+        if isinstance(raw, dict) and isinstance(raw.get("data"), dict):
+            door = str(raw["data"].get("door", "")).lower()
+            if door in ("on", "off"):
+                return {"hatch_open": door == "off"}
+        return {}
+
+    def _normalize_workhead(self, raw: Any) -> dict[str, Any]:
+        if isinstance(raw, dict) and isinstance(raw.get("data"), dict):
+            return {
+                "workhead_drived": raw["data"].get("drived"),
+                "workhead_driving": raw["data"].get("driving"),
+            }
+        return {}
+
+    def _normalize_knife_head(self, raw: Any) -> dict[str, Any]:
+        if isinstance(raw, dict) and isinstance(raw.get("data"), dict):
+            return {"knife_driving": raw["data"].get("driving")}
+        return {}
+
+    def _normalize_inkjet(self, raw: Any) -> dict[str, Any]:
+        if isinstance(raw, dict) and isinstance(raw.get("data"), dict):
+            return {"inkjet_exist": raw["data"].get("exist")}
+        return {}
+
+    def _fetch_data_sync(self) -> dict[str, Any]:
+        self._tick += 1
+
+        # Start from previous data (prevents flicker to None/Unavailable)
+        normalized: dict[str, Any] = dict(self.data or {})
+        normalized["_unavailable"] = False
+
+        # 1) runningStatus always (silent; PR behavior)
+        try:
+            raw_run = self._get("/device/runningStatus")
+            if _is_invalid_or_not_supported(raw_run):
+                raise RuntimeError("v2 runningStatus not supported")
+
+            normalized.update(self._normalize_running_status(raw_run))
+            self._log_reachability(True)
+
+        except requests.exceptions.ConnectionError as err:
+            self._log_reachability(False)
+            _LOGGER.debug("XTool %s connection error: %s", self.ip_address, err)
+            normalized["_unavailable"] = True
+            return normalized
+
+        except Exception:
+            # legacy fallback
+            try:
+                raw_status = self._get("/status")
+                if _is_invalid_or_not_supported(raw_status):
+                    raise RuntimeError("legacy /status not supported")
+
+                normalized["legacy"] = raw_status
+
+                if isinstance(raw_status, dict):
+                    if "STATUS" in raw_status:
+                        normalized["work_state_raw"] = str(raw_status.get("STATUS") or "").strip()
+                    elif "mode" in raw_status:
+                        normalized["work_state_raw"] = str(raw_status.get("mode") or "").strip()
+
+                    if "CPU_TEMP" in raw_status:
+                        normalized["cpu_temp"] = raw_status.get("CPU_TEMP")
+
+                self._log_reachability(True)
+
+            except requests.exceptions.ConnectionError as err2:
+                self._log_reachability(False)
+                _LOGGER.debug(
+                    "XTool %s connection error (fallback): %s",
+                    self.ip_address,
+                    err2,
+                )
+                normalized["_unavailable"] = True
+                return normalized
+            except Exception as err2:  # noqa: BLE001
+                self._log_reachability(False)
+                _LOGGER.debug("XTool %s update failed: %s", self.ip_address, err2)
+                normalized["_unavailable"] = True
+                return normalized
+
+        # Sleep detection (PR logic)
+        mode = str(normalized.get("work_state_raw") or "").upper()
+        is_sleeping = "SLEEP" in mode or "STANDBY" in mode
+
+        # Warnings
+        normalized["warnings_count"] = self._count_warnings(normalized.get("alarm_current"))
+        warnings = self._warnings_list(normalized.get("alarm_current"))
+        normalized["warnings_details"] = warnings
+        normalized["warnings_summary"] = self._warnings_summary(warnings)
+
+        h = self._warnings_hash(warnings)
+        normalized["warnings_hash"] = h
+        normalized["warnings_changed"] = (
+            self._warnings_hash_last is not None and h != self._warnings_hash_last
+        )
+        self._warnings_hash_last = h
+
+        # Polling strategy: models with a quiet sleep profile (M1U) skip
+        # peripherals and slow GETs while sleeping; the config POST is never
+        # sent while sleeping.
+        should_poll_reads = not (is_sleeping and self.profile.quiet_sleep)
+        should_poll_slow_posts = not is_sleeping
+
+        # Missing accessories are only probed on the slow tier, so plugging
+        # one in is noticed within DEFAULT_SLOW_UPDATE_INTERVAL
+        slow_tick = self._tick == 1 or (self._tick % self._slow_every) == 0
+
+        # 2) Peripherals (and M1 Ultra module endpoints)
+        if should_poll_reads:
+            for name, method, path, normalizer in self._peripheral_reads:
+                if not slow_tick and not self.accessory_present(name):
+                    continue
+                try:
+                    if method == "GET":
+                        raw = self._get(path)
+                    else:
+                        raw = self._post(path, {"action": "get"})
+                    if not _is_invalid_or_not_supported(raw):
+                        update = normalizer(raw)
+                        normalized.update(update)
+                        self._update_accessory(name, update)
+                except Exception:
+                    pass
+
+        # 4) Slow extras
+        if slow_tick:
+            if should_poll_reads:
+                try:
+                    mi = self._get("/device/machineInfo")
+                    if not _is_invalid_or_not_supported(mi) and isinstance(mi, dict):
+                        self._cached_machine_info = mi
+                        normalized["machine_info"] = mi
+                except Exception:
+                    pass
+
+                try:
+                    wi = self._get("/device/workingInfo")
+                    if not _is_invalid_or_not_supported(wi) and isinstance(wi, dict):
+                        self._cached_working_info = wi
+                        normalized["working_info"] = wi
+                except Exception:
+                    pass
+
+            # POST config never in sleep (esp. M1U sleep bug)
+            if should_poll_slow_posts:
+                try:
+                    cfg = self._post(
+                        "/config/get",
+                        {
+                            "alias": "config",
+                            "type": "user",
+                            "kv": [
+                                "beepEnable",
+                                "fillLightBrightness",
+                                "purifierTimeout",
+                                "taskId",
+                                "workingMode",
+                            ],
+                        },
+                    )
+                    if not _is_invalid_or_not_supported(cfg) and isinstance(cfg, dict):
+                        self._cached_config = cfg
+                        normalized["config"] = cfg
+                except Exception:
+                    pass
+
+        # Always expose cached values
+        if "machine_info" not in normalized:
+            normalized["machine_info"] = self._cached_machine_info
+        if "working_info" not in normalized:
+            normalized["working_info"] = self._cached_working_info
+        if "config" not in normalized:
+            normalized["config"] = self._cached_config
+
+        if normalized.get("progress_pct") is None:
+            wi = normalized.get("working_info")
+            normalized["progress_pct"] = _extract_progress(
+                wi.get("data") if isinstance(wi, dict) else None
+            )
+
+        self._derive_display_values(normalized)
+        return normalized
+
+    def _derive_display_values(self, normalized: dict[str, Any]) -> None:
+        """Values the entities show, computed once per snapshot."""
+        status = ""
+        if self.profile.legacy_status:
+            legacy = normalized.get("legacy")
+            if isinstance(legacy, dict):
+                status = str(legacy.get("STATUS", "")).strip().upper()
+        if not status:
+            status = str(normalized.get("work_state_raw") or "").strip().upper()
+        normalized["display_status"] = _MODE_DISPLAY.get(status, "Unknown")
+
+        wi = normalized.get("working_info")
+        wi_data = wi.get("data") if isinstance(wi, dict) else None
+        if not isinstance(wi_data, dict):
+            wi_data = {}
+        normalized["jobs_total"] = wi_data.get("numOnlineWorking")
+        seconds = wi_data.get("timeSystemWork")
+        try:
+            normalized["runtime_system_h"] = (
+                round(float(seconds) / 3600.0, 2) if seconds is not None else None
+            )
+        except (TypeError, ValueError):
+            normalized["runtime_system_h"] = None
+
+    def _update_accessory(self, name: str, update: dict[str, Any]) -> None:
+        if name not in self.profile.accessories:
+            return
+        exist = update.get(ACCESSORY_EXIST_KEYS[name])
+        if exist is None:
+            return
+        present = bool(exist)
+        if self.accessories.get(name) != present:
+            _LOGGER.debug(
+                "XTool %s accessory %s %s",
+                self.ip_address,
+                name,
+                "detected" if present else "not connected",
+            )
+            self.accessories[name] = present
+
+    def _log_reachability(self, reachable: bool) -> None:
+        if self._reachable_last is None:
+            self._reachable_last = reachable
+            return
+        if reachable != self._reachable_last:
+            self._reachable_last = reachable
+            if reachable:
+                _LOGGER.info("XTool %s is back online", self.ip_address)
+            else:
+                _LOGGER.warning("XTool %s is offline/unreachable", self.ip_address)
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        return await self.hass.async_add_executor_job(self._fetch_data_sync)
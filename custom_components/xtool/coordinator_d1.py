@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import timedelta
 import logging
 from typing import Any
@@ -9,7 +10,11 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .api_d1 import XToolD1Api
-from .const import DEFAULT_UPDATE_INTERVAL
+from .const import (
+    D1_IDLE_UPDATE_INTERVAL,
+    D1_PERIPHERAL_UPDATE_INTERVAL,
+    D1_RUNNING_UPDATE_INTERVAL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,7 +25,7 @@ class XToolD1Coordinator(DataUpdateCoordinator[dict[str, Any]]):
             hass,
             _LOGGER,
             name=f"xtool_d1_{ip_address}",
-            update_interval=timedelta(seconds=DEFAULT_UPDATE_INTERVAL),
+            update_interval=timedelta(seconds=D1_IDLE_UPDATE_INTERVAL),
         )
         self.ip_address = ip_address
         self.api = XToolD1Api(ip_address, async_get_clientsession(hass))
@@ -28,6 +33,16 @@ class XToolD1Coordinator(DataUpdateCoordinator[dict[str, Any]]):
         # cache static-ish
         self._machine_type: str | None = None
 
+        # /progress is only polled while running; keep the last reply otherwise
+        self._last_progress: dict[str, Any] = {}
+        # /peripherystatus only every _periph_every running ticks; keep the last
+        # reply in between
+        self._last_periph: dict[str, Any] | None = None
+        self._periph_every = max(
+            1, int(D1_PERIPHERAL_UPDATE_INTERVAL / max(1, D1_RUNNING_UPDATE_INTERVAL))
+        )
+        self._tick = 0
+
     def _map_working_state(self, sta: str | None) -> str:
         # based on common D1 mapping:
         # "0" idle, "1" running via API, "2" running via button
@@ -39,20 +54,52 @@ class XToolD1Coordinator(DataUpdateCoordinator[dict[str, Any]]):
         return mapping.get(str(sta).strip(), "Unknown")
 
     async def _async_update_data(self) -> dict[str, Any]:
-        # Read-only snapshot
-        online = await self.api.ping()
-        if not online:
-            return {"_unavailable": True}
+        # Read-only snapshot: all reads of a tick go out concurrently
+        self._tick += 1
+        was_running = bool(self.data) and self.data.get("working_state") == "Running"
+        poll_progress = was_running or not self._last_progress
+        poll_periph = (
+            not was_running
+            or self._last_periph is None
+            or self._tick % self._periph_every == 0
+        )
+        reads = [self.api.get_working_state()]
+        if poll_periph:
+            reads.append(self.api.get_peripheral_status())
+        if poll_progress:
+            reads.append(self.api.get_progress())
+        if self._machine_type is None:
+            reads.append(self.api.get_machine_type())
 
-        # machine type (cache)
+        results = await asyncio.gather(*reads)
+        replies = iter(results)
+        working_state_raw = next(replies)
+        periph = next(replies) if poll_periph else None
+        progress = next(replies) if poll_progress else None
         if self._machine_type is None:
-            self._machine_type = await self.api.get_machine_type()
+            self._machine_type = next(replies)
 
-        working_state_raw = await self.api.get_working_state()
-        working_state = self._map_working_state(working_state_raw)
+        # Any reply proves the device is reachable; /ping only when all failed
+        if all(r is None for r in results) and not await self.api.ping():
+            self.update_interval = timedelta(seconds=D1_IDLE_UPDATE_INTERVAL)
+            return {"_unavailable": True}
 
-        progress = await self.api.get_progress() or {}
-        periph = await self.api.get_peripheral_status() or {}
+        working_state = self._map_working_state(working_state_raw)
+        running = working_state == "Running"
+
+        if running and not poll_progress:
+            # Job just started: fetch progress now instead of on the next tick
+            progress = await self.api.get_progress()
+        if progress is not None:
+            self._last_progress = progress
+        progress = self._last_progress
+        if periph is not None:
+            self._last_periph = periph
+        periph = self._last_periph or {}
+
+        self.update_interval = timedelta(
+            seconds=D1_RUNNING_UPDATE_INTERVAL if running else D1_IDLE_UPDATE_INTERVAL
+        )
 
         # normalize ints when possible (values are often strings)
         def _to_int(v: Any) -> int | None:
@@ -4,15 +4,17 @@ import asyncio
 from datetime import timedelta
 import json
 import logging
-import ssl
 import time
+from collections.abc import Callable
 from typing import Any
 import uuid
 
 import aiohttp
 
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util.ssl import get_default_no_verify_context
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,8 +22,80 @@ XTOOL_WS_PORT = 28900
 XTOOL_WS_HANDSHAKE = "bWFrZWJsb2NrLXh0b29s"
 XTOOL_WS_PING = b"\xC0\x00"
 
+# Heartbeat interval by machine state; no pings at all while sleeping so the
+# device can stay asleep. A ping is only sent when nothing was received for a
+# full interval, and the link counts as dead after this many silent intervals.
+HEARTBEAT_WORKING = 2
+HEARTBEAT_IDLE = 10
+HEARTBEAT_MAX_MISSED = 3
+# Seconds to wait before reconnecting after the websocket closed
+RECONNECT_DELAY = 10
+
 VALID_SLEEP_RAW_STATES = {"P_SLEEP", "SLEEP"}
 
+# Current-state snapshot after (re)connect, read from the HTTP API
+XTOOL_HTTP_PORT = 8080
+SNAPSHOT_TIMEOUT = 5
+SNAPSHOT_CONFIG_KEYS = [
+    "beepEnable",
+    "flameAlarm",
+    "gapCheck",
+    "gapCheckWithKey",
+    "machineLockCheck",
+    "purifierTimeout",
+    "workingMode",
+]
+
+
+# MODE_CHANGE mode -> status
+_MODE_STATUS: dict[str, str] = {
+    "P_SLEEP": "sleep",
+    "P_WORK": "ready",
+    "P_ONLINE_READY_WORK": "ready",
+    "P_OFFLINE_READY_WORK": "ready",
+    "P_READY": "ready",
+    "P_WORKING": "working",
+    "P_IDLE": "idle",
+    "IDLE": "idle",
+    "P_WORK_DONE": "finished",
+    "P_FINISH": "finished",
+    "P_ERROR": "error",
+}
+
+# /device/status WORK_* type -> (status while framing, status otherwise)
+_WORK_STATUS: dict[str, tuple[str, str]] = {
+    "WORK_PREPARED": ("framing", "prepared"),
+    "WORK_STARTED": ("framing", "working"),
+    "WORK_FINISHED": ("idle", "finished"),
+}
+
+_RUNNING_STATUSES = frozenset({"framing", "prepared", "ready", "working"})
+
+# state key -> DEVICE_CONFIG info key
+_CONFIG_FIELDS: dict[str, str] = {
+    "flame_alarm_enabled": "flameAlarm",
+    "beep_enabled": "beepEnable",
+    "gap_check_enabled": "gapCheck",
+    "gap_check_with_key_enabled": "gapCheckWithKey",
+    "machine_lock_check_enabled": "machineLockCheck",
+    "purifier_timeout": "purifierTimeout",
+    "working_mode": "workingMode",
+}
+
+# Distinct unhandled (url, module, type) keys that are counted individually
+MAX_UNKNOWN_EVENT_KEYS = 50
+
+
+def _event(url: str, module: str, typ: str, info: Any = None) -> dict[str, Any]:
+    """Build an event in the shape the websocket delivers."""
+    return {"url": url, "data": {"module": module, "type": typ, "info": info}}
+
+
+def _http_data(payload: Any) -> dict[str, Any]:
+    if isinstance(payload, dict) and isinstance(payload.get("data"), dict):
+        return payload["data"]
+    return {}
+
 
 class XToolF1V2Coordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Event based coordinator for F1 firmware 40.51+."""
@@ -37,6 +111,32 @@ class XToolF1V2Coordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.device_type = "f1_v2"
         self._task: asyncio.Task | None = None
         self._stop_event = asyncio.Event()
+        # Set on status changes so the heartbeat picks up the new interval
+        self._heartbeat_wake = asyncio.Event()
+        self._last_rx = 0.0
+        # Live events received while the connect snapshot is still loading
+        self._pending_events: list[dict[str, Any]] | None = None
+
+        # Event routing: (url, module, type) -> handler; type None matches any type.
+        # Supporting a new firmware event means adding a row here.
+        self._routes: dict[
+            tuple[str, str, str | None], Callable[[Any, Any, dict[str, Any]], bool]
+        ] = {
+            ("/work/mode", "STATUS_CONTROLLER", "MODE_CHANGE"): self._on_mode_change,
+            ("/work/result", "WORK_RESULT", "WORK_FINISHED"): self._on_work_result,
+            ("/device/config", "DEVICE_CONFIG", "INFO"): self._on_config,
+            ("/gap/status", "GAP", "OPEN"): self._on_gap,
+            ("/gap/status", "GAP", "CLOSE"): self._on_gap,
+            ("/machine_lock/status", "MACHINE_LOCK", "OPEN"): self._on_machine_lock,
+            ("/machine_lock/status", "MACHINE_LOCK", "CLOSE"): self._on_machine_lock,
+            ("/button/status", "BUTTON", None): self._on_button,
+        }
+        for work_type in _WORK_STATUS:
+            self._routes[("/device/status", "STATUS_CONTROLLER", work_type)] = (
+                self._on_work_status
+            )
+        self.unknown_events: dict[tuple[Any, Any, Any], int] = {}
+        self.unknown_event_total = 0
 
         self._state: dict[str, Any] = {
             "_unavailable": True,
@@ -80,7 +180,7 @@ class XToolF1V2Coordinator(DataUpdateCoordinator[dict[str, Any]]):
                 _LOGGER.debug("F1 V2 websocket disconnected: %s", err)
 
             self._handle_disconnect()
-            await asyncio.sleep(10)
+            await asyncio.sleep(RECONNECT_DELAY)
 
     def _handle_disconnect(self) -> None:
         """Handle websocket disconnect without treating sleep as unavailable.
@@ -111,16 +211,13 @@ class XToolF1V2Coordinator(DataUpdateCoordinator[dict[str, Any]]):
             f"?id={uuid.uuid4()}&function=instruction"
         )
 
-        ssl_ctx = ssl.create_default_context()
-        ssl_ctx.check_hostname = False
-        ssl_ctx.verify_mode = ssl.CERT_NONE
-
         timeout = aiohttp.ClientTimeout(total=None, sock_connect=5)
 
         async with aiohttp.ClientSession(timeout=timeout) as session:
             async with session.ws_connect(
                 url,
-                ssl=ssl_ctx,
+                # Self-signed device certificate; HA's shared no-verify context
+                ssl=get_default_no_verify_context(),
                 heartbeat=None,
                 max_msg_size=0,
             ) as ws:
@@ -129,20 +226,26 @@ class XToolF1V2Coordinator(DataUpdateCoordinator[dict[str, Any]]):
                 self.async_set_updated_data(dict(self._state))
 
                 await ws.send_str(XTOOL_WS_HANDSHAKE)
+                self._last_rx = time.monotonic()
 
+                # Events only report changes: load the current state first and
+                # hold back live events until it has been merged
+                self._pending_events = []
+                snapshot_task = self.hass.loop.create_task(self._async_sync_snapshot())
                 ping_task = self.hass.loop.create_task(self._heartbeat(ws))
 
                 try:
                     async for msg in ws:
+                        self._last_rx = time.monotonic()
                         if msg.type == aiohttp.WSMsgType.BINARY:
                             event = self._parse_frame(msg.data)
                             if event:
-                                self._handle_event(event)
+                                self._dispatch_event(event)
 
                         elif msg.type == aiohttp.WSMsgType.TEXT:
                             try:
                                 event = json.loads(msg.data)
-                                self._handle_event(event)
+                                self._dispatch_event(event)
                             except Exception:
                                 _LOGGER.debug(
                                     "Unable to parse F1 V2 text websocket message",
@@ -156,16 +259,131 @@ class XToolF1V2Coordinator(DataUpdateCoordinator[dict[str, Any]]):
                         ):
                             break
                 finally:
-                    ping_task.cancel()
-                    try:
-                        await ping_task
-                    except asyncio.CancelledError:
-                        pass
+                    self._pending_events = None
+                    for task in (snapshot_task, ping_task):
+                        task.cancel()
+                        try:
+                            await task
+                        except asyncio.CancelledError:
+                            pass
+
+    def _dispatch_event(self, event: dict[str, Any]) -> None:
+        if self._pending_events is not None:
+            self._pending_events.append(event)
+        else:
+            self._handle_event(event)
+
+    async def _async_sync_snapshot(self) -> None:
+        """Merge the current device state, then replay held-back live events."""
+        try:
+            events = await self._async_fetch_snapshot()
+        except Exception:  # noqa: BLE001
+            _LOGGER.debug("F1 V2 state snapshot failed", exc_info=True)
+            events = []
+
+        pending, self._pending_events = self._pending_events or [], None
+        changed = False
+        for event in [*events, *pending]:
+            changed |= self._apply_event(event)
+        if changed:
+            self._publish()
+
+    async def _async_fetch_snapshot(self) -> list[dict[str, Any]]:
+        """Read mode, lid, lock and config over HTTP as synthetic events."""
+        session = async_get_clientsession(self.hass)
+        base = f"http://{self.ip_address}:{XTOOL_HTTP_PORT}"
+        timeout = aiohttp.ClientTimeout(total=SNAPSHOT_TIMEOUT)
+
+        async def _request(method: str, path: str, payload: Any = None) -> Any:
+            try:
+                async with session.request(
+                    method, f"{base}{path}", json=payload, timeout=timeout
+                ) as resp:
+                    resp.raise_for_status()
+                    return await resp.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+                _LOGGER.debug("F1 V2 snapshot %s failed: %s", path, err)
+                return None
+
+        running, gap, lock, config = await asyncio.gather(
+            _request("GET", "/device/runningStatus"),
+            _request("GET", "/peripheral/gap"),
+            _request("GET", "/peripheral/machine_lock"),
+            _request(
+                "POST",
+                "/config/get",
+                {"alias": "config", "type": "user", "kv": SNAPSHOT_CONFIG_KEYS},
+            ),
+        )
+
+        events: list[dict[str, Any]] = []
+
+        cur_mode = _http_data(running).get("curMode")
+        if isinstance(cur_mode, dict) and cur_mode.get("mode"):
+            events.append(
+                _event(
+                    "/work/mode",
+                    "STATUS_CONTROLLER",
+                    "MODE_CHANGE",
+                    {"mode": cur_mode["mode"]},
+                )
+            )
+
+        gap_state = str(_http_data(gap).get("state", "")).lower()
+        if gap_state in ("on", "off"):
+            # on = open (same as the F1 HTTP API)
+            events.append(_event("/gap/status", "GAP", "OPEN" if gap_state == "on" else "CLOSE"))
+
+        lock_state = str(_http_data(lock).get("state", "")).lower()
+        if lock_state in ("on", "off"):
+            # on = locked; the event reports a locked machine as CLOSE
+            events.append(
+                _event(
+                    "/machine_lock/status",
+                    "MACHINE_LOCK",
+                    "CLOSE" if lock_state == "on" else "OPEN",
+                )
+            )
+
+        config_data = _http_data(config)
+        if any(key in config_data for key in SNAPSHOT_CONFIG_KEYS):
+            events.append(_event("/device/config", "DEVICE_CONFIG", "INFO", config_data))
+
+        _LOGGER.debug("F1 V2 %s snapshot: %d state events", self.ip_address, len(events))
+        return events
+
+    def _heartbeat_interval(self) -> float | None:
+        if self._is_sleep_state():
+            return None
+        return HEARTBEAT_WORKING if self._state.get("running") else HEARTBEAT_IDLE
 
     async def _heartbeat(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        """Ping only on silence and close the socket once replies stop."""
+        last_ping = 0.0
         while not self._stop_event.is_set():
-            await asyncio.sleep(2)
-            await ws.send_bytes(XTOOL_WS_PING)
+            interval = self._heartbeat_interval()
+            delay: float | None = None
+            if interval is not None:
+                now = time.monotonic()
+                if now - self._last_rx > interval * HEARTBEAT_MAX_MISSED:
+                    _LOGGER.debug(
+                        "F1 V2 %s silent for %.0fs, reconnecting",
+                        self.ip_address,
+                        now - self._last_rx,
+                    )
+                    await ws.close()
+                    return
+                if now - max(self._last_rx, last_ping) >= interval:
+                    await ws.send_bytes(XTOOL_WS_PING)
+                    last_ping = now
+                delay = max(self._last_rx, last_ping) + interval - now
+
+            # Sleeps until the next check, or until the status changes
+            self._heartbeat_wake.clear()
+            try:
+                await asyncio.wait_for(self._heartbeat_wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
 
     def _parse_frame(self, raw: bytes) -> dict[str, Any] | None:
         idx = raw.find(b"{")
@@ -181,125 +399,83 @@ class XToolF1V2Coordinator(DataUpdateCoordinator[dict[str, Any]]):
     def _set_status(self, status: str, raw: str | None = None) -> None:
         self._state["status"] = status
         self._state["work_state_raw"] = raw or status
-        self._state["running"] = status in {
-            "framing",
-            "prepared",
-            "ready",
-            "working",
-        }
+        self._state["running"] = status in _RUNNING_STATUSES
+        self._heartbeat_wake.set()
 
     def _handle_event(self, event: dict[str, Any]) -> None:
-        url = event.get("url")
+        if self._apply_event(event):
+            self._publish()
+
+    def _publish(self) -> None:
+        self._state["_unavailable"] = False
+        self._state["connection_state"] = "connected"
+        self.async_set_updated_data(dict(self._state))
+
+    def _apply_event(self, event: dict[str, Any]) -> bool:
+        """Merge one event into the state; return True if anything changed."""
         data = event.get("data") if isinstance(event.get("data"), dict) else {}
 
         module = data.get("module")
         typ = data.get("type")
-        info = data.get("info")
-
-        changed = False
-
-        if url == "/work/mode" and module == "STATUS_CONTROLLER" and typ == "MODE_CHANGE":
-            if isinstance(info, dict):
-                mode = str(info.get("mode", "")).upper()
-
-                if mode == "P_SLEEP":
-                    self._set_status("sleep", mode)
-                elif mode in {
-                    "P_WORK",
-                    "P_ONLINE_READY_WORK",
-                    "P_OFFLINE_READY_WORK",
-                    "P_READY",
-                }:
-                    self._set_status("ready", mode)
-                elif mode == "P_WORKING":
-                    self._set_status("working", mode)
-                elif mode in {"P_IDLE", "IDLE"}:
-                    self._set_status("idle", mode)
-                elif mode in {"P_WORK_DONE", "P_FINISH"}:
-                    self._set_status("finished", mode)
-                elif mode == "P_ERROR":
-                    self._set_status("error", mode)
-                else:
-                    self._set_status("unknown", mode)
-
-                changed = True
-
-        elif url == "/device/status" and module == "STATUS_CONTROLLER":
-            info_str = str(info).lower()
-
-            if typ == "WORK_PREPARED":
-                if info_str == "framing":
-                    self._set_status("framing", "WORK_PREPARED")
-                elif info_str == "working":
-                    self._set_status("prepared", "WORK_PREPARED")
-                else:
-                    self._set_status("prepared", "WORK_PREPARED")
-                changed = True
-
-            elif typ == "WORK_STARTED":
-                if info_str == "framing":
-                    self._set_status("framing", "WORK_STARTED")
-                elif info_str == "working":
-                    self._set_status("working", "WORK_STARTED")
-                else:
-                    self._set_status("working", "WORK_STARTED")
-                changed = True
-
-            elif typ == "WORK_FINISHED":
-                if info_str == "framing":
-                    self._set_status("idle", "WORK_FINISHED")
-                elif info_str == "working":
-                    self._set_status("finished", "WORK_FINISHED")
-                else:
-                    self._set_status("finished", "WORK_FINISHED")
-                changed = True
-
-        elif url == "/work/result" and module == "WORK_RESULT" and typ == "WORK_FINISHED":
-            if isinstance(info, dict):
-                self._state["last_result"] = info.get("result")
-                self._state["last_job_time"] = info.get("timeUse")
-                self._state["task_id"] = info.get("taskId")
-                changed = True
-
-        elif url == "/device/config" and module == "DEVICE_CONFIG" and typ == "INFO":
-            if isinstance(info, dict):
-                self._state["config"] = info
-                self._state["flame_alarm_enabled"] = info.get("flameAlarm")
-                self._state["beep_enabled"] = info.get("beepEnable")
-                self._state["gap_check_enabled"] = info.get("gapCheck")
-                self._state["gap_check_with_key_enabled"] = info.get("gapCheckWithKey")
-                self._state["machine_lock_check_enabled"] = info.get(
-                    "machineLockCheck"
-                )
-                self._state["purifier_timeout"] = info.get("purifierTimeout")
-                self._state["working_mode"] = info.get("workingMode")
-                changed = True
-
-        elif url == "/gap/status" and module == "GAP":
-            if typ == "CLOSE":
-                self._state["lid_open"] = False
-                changed = True
-            elif typ == "OPEN":
-                self._state["lid_open"] = True
-                changed = True
-
-        elif url == "/machine_lock/status" and module == "MACHINE_LOCK":
-            if typ == "OPEN":
-                self._state["machine_lock"] = False
-                changed = True
-            elif typ == "CLOSE":
-                self._state["machine_lock"] = True
-                changed = True
-
-        elif url == "/button/status" and module == "BUTTON":
-            self._state["button_last"] = {
-                "type": typ,
-                "info": info,
-                "timestamp": event.get("timestamp") or int(time.time() * 1000),
-            }
-            changed = True
-
-        if changed:
-            self._state["_unavailable"] = False
-            self._state["connection_state"] = "connected"
-            self.async_set_updated_data(dict(self._state))
+        key = (event.get("url"), module, typ)
+
+        handler = self._routes.get(key) or self._routes.get((key[0], module, None))
+        if handler is None:
+            self._count_unknown(key)
+            return False
+        return handler(typ, data.get("info"), event)
+
+    def _count_unknown(self, key: tuple[Any, Any, Any]) -> None:
+        self.unknown_event_total += 1
+        count = self.unknown_events.get(key)
+        if count is not None:
+            self.unknown_events[key] = count + 1
+        elif len(self.unknown_events) < MAX_UNKNOWN_EVENT_KEYS:
+            self.unknown_events[key] = 1
+            _LOGGER.debug("F1 V2 unhandled event %s", key)
+
+    # ---- event handlers (see _routes) ----
+
+    def _on_mode_change(self, typ: str, info: Any, event: dict[str, Any]) -> bool:
+        if not isinstance(info, dict):
+            return False
+        mode = str(info.get("mode", "")).upper()
+        self._set_status(_MODE_STATUS.get(mode, "unknown"), mode)
+        return True
+
+    def _on_work_status(self, typ: str, info: Any, event: dict[str, Any]) -> bool:
+        framing_status, status = _WORK_STATUS[typ]
+        self._set_status(framing_status if str(info).lower() == "framing" else status, typ)
+        return True
+
+    def _on_work_result(self, typ: str, info: Any, event: dict[str, Any]) -> bool:
+        if not isinstance(info, dict):
+            return False
+        self._state["last_result"] = info.get("result")
+        self._state["last_job_time"] = info.get("timeUse")
+        self._state["task_id"] = info.get("taskId")
+        return True
+
+    def _on_config(self, typ: str, info: Any, event: dict[str, Any]) -> bool:
+        if not isinstance(info, dict):
+            return False
+        self._state["config"] = info
+        for state_key, config_key in _CONFIG_FIELDS.items():
+            self._state[state_key] = info.get(config_key)
+        return True
+
+    def _on_gap(self, typ: str, info: Any, event: dict[str, Any]) -> bool:
+        self._state["lid_open"] = typ == "OPEN"
+        return True
+
+    def _on_machine_lock(self, typ: str, info: Any, event: dict[str, Any]) -> bool:
+        self._state["machine_lock"] = typ == "CLOSE"
+        return True
+
+    def _on_button(self, typ: str, info: Any, event: dict[str, Any]) -> bool:
+        self._state["button_last"] = {
+            "type": typ,
+            "info": info,
+            "timestamp": event.get("timestamp") or int(time.time() * 1000),
+        }
+        return True
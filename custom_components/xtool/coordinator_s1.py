@@ -3,20 +3,40 @@ from __future__ import annotations
 import asyncio
 from datetime import timedelta
 import logging
+import random
+import time
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api_s1 import XToolS1Api
-from .const import DEFAULT_UPDATE_INTERVAL
+from .const import DEFAULT_UPDATE_INTERVAL, S1_PURIFIER_POLL_INTERVAL, S1_RUNNING_STATES
 
 _LOGGER = logging.getLogger(__name__)
 
-# Seconds to wait after requesting status before reading _state on first connect.
-# Gives the device time to push back the M2003 response.
-_INITIAL_WAIT = 1.5
+# Max seconds to wait for the M2003/M9039 replies after (re)connecting
+_INITIAL_QUERY_TIMEOUT = 3.0
+
+# Query schedule: (M-code, period while a job runs, period while idle) in seconds.
+# M303 = head position / keepalive, M2003 = full status resync,
+# M9039 = AP2 purifier + filters (only sent with an AP2 attached).
+_QUERY_SCHEDULE: tuple[tuple[str, float, float], ...] = (
+    ("M303", 1.0, 15.0),
+    ("M2003", 300.0, 300.0),
+    ("M9039", 120.0, float(S1_PURIFIER_POLL_INTERVAL)),
+)
+_SCHEDULER_INTERVAL = timedelta(seconds=1)
+
+# Stall watchdog: the link counts as dead when no frame arrived for this many
+# expected M303 reply periods (plus a small margin for the round-trip)
+_STALL_PERIODS = 2.5
+_STALL_MARGIN = 3.0
+# Reconnect backoff (seconds), jittered by +/-50%
+_RECONNECT_BASE = 1.0
+_RECONNECT_MAX = 60.0
 
 _WORK_STATE_MAP = {
     "S3":  "Idle",
@@ -42,10 +62,20 @@ class XToolS1Coordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.has_ap2 = has_ap2
         self.api = XToolS1Api(ip_address, async_get_clientsession(hass))
 
+        self._schedule = [q for q in _QUERY_SCHEDULE if has_ap2 or q[0] != "M9039"]
+        # time.monotonic() each M-code was last sent
+        self._last_sent: dict[str, float] = {}
+        self._running: bool | None = None
+
         # Cache static fields so they survive a bad poll tick
         self._cached_serial: str | None = None
         self._cached_firmware: str | None = None
 
+        self._unsub_scheduler: CALLBACK_TYPE | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._reconnect_attempts = 0
+        self._next_reconnect = 0.0
+
     @staticmethod
     def map_work_state(raw: str | None) -> str:
         """Map M222 state code to a human-readable string."""
@@ -53,21 +83,120 @@ class XToolS1Coordinator(DataUpdateCoordinator[dict[str, Any]]):
             return "Unknown"
         return _WORK_STATE_MAP.get(str(raw).strip(), f"Unknown ({raw})")
 
+    async def _async_connect(self) -> bool:
+        """Open the WebSocket and resync the full state."""
+        if not await self.api.connect():
+            return False
+        # Request full status dump and air cleaner state if AP2 is present;
+        # continue as soon as the replies have arrived
+        now = time.monotonic()
+        codes = [code for code, _run, _idle in self._schedule if code != "M303"]
+        for code in codes:
+            self._last_sent[code] = now
+        await asyncio.gather(
+            *(self.api.query(code, _INITIAL_QUERY_TIMEOUT) for code in codes)
+        )
+        return True
+
+    # ---- query scheduler ----
+
+    def _is_running(self) -> bool:
+        return self.api.state.get("work_state_raw") in S1_RUNNING_STATES
+
+    def _period(self, code: str) -> float:
+        running = self._is_running()
+        for c, run_period, idle_period in self._schedule:
+            if c == code:
+                return run_period if running else idle_period
+        return float(DEFAULT_UPDATE_INTERVAL)
+
+    async def _async_tick(self, _now: Any = None) -> None:
+        """Send the queries that are due, then run the stall watchdog."""
+        if self.api.connected and self._reconnect_task is None:
+            now = time.monotonic()
+            running = self._is_running()
+            if self._running is not None and running != self._running:
+                # Job started/ended: resync everything on the next pass
+                self._last_sent.clear()
+            self._running = running
+
+            for code, run_period, idle_period in self._schedule:
+                period = run_period if running else idle_period
+                last = self._last_sent.get(code)
+                if last is None or now - last >= period:
+                    self._last_sent[code] = now
+                    await self.api.send_code(code)
+
+        self._watchdog()
+
+    # ---- stall watchdog ----
+
+    def _stall_timeout(self) -> float:
+        """Seconds without any frame after which the link is considered dead."""
+        return self._period("M303") * _STALL_PERIODS + _STALL_MARGIN
+
+    @callback
+    def _watchdog(self) -> None:
+        if self._reconnect_task is not None or time.monotonic() < self._next_reconnect:
+            return
+
+        if self.api.connected:
+            age = self.api.data_age
+            if age is None or age < self._stall_timeout():
+                return
+            _LOGGER.debug(
+                "S1 %s silent for %.1f s, reconnecting", self.ip_address, age
+            )
+
+        self._reconnect_task = self.hass.async_create_background_task(
+            self._async_reconnect(), f"xtool s1 reconnect {self.ip_address}"
+        )
+
+    async def _async_reconnect(self) -> None:
+        try:
+            await self.api.disconnect()
+            if await self._async_connect():
+                self._reconnect_attempts = 0
+                self._next_reconnect = 0.0
+                await self.async_request_refresh()
+                return
+
+            self._reconnect_attempts += 1
+            delay = min(_RECONNECT_MAX, _RECONNECT_BASE * 2 ** self._reconnect_attempts)
+            delay *= random.uniform(0.5, 1.5)
+            self._next_reconnect = time.monotonic() + delay
+            _LOGGER.debug(
+                "S1 %s reconnect failed, next attempt in %.1f s", self.ip_address, delay
+            )
+        finally:
+            self._reconnect_task = None
+
+    async def async_stop(self) -> None:
+        if self._unsub_scheduler:
+            self._unsub_scheduler()
+            self._unsub_scheduler = None
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            await asyncio.gather(self._reconnect_task, return_exceptions=True)
+        await self.api.disconnect()
+
     async def _async_update_data(self) -> dict[str, Any]:
         if not self.api.connected:
-            ok = await self.api.connect()
-            if not ok:
+            # Reconnects are normally driven by the watchdog; respect its backoff
+            if (
+                self._reconnect_task is not None
+                or time.monotonic() < self._next_reconnect
+                or not await self._async_connect()
+            ):
                 raise UpdateFailed(f"Cannot connect to S1 at {self.ip_address}:8081")
-            # Request full status dump, then air cleaner state if AP2 is present
-            await self.api.request_status()
-            if self.has_ap2:
-                await self.api.request_purifier_status()
-            await asyncio.sleep(_INITIAL_WAIT)
 
-        # Send keepalive / position refresh
-        await self.api.ping()
+        if self._unsub_scheduler is None:
+            self._unsub_scheduler = async_track_time_interval(
+                self.hass, self._async_tick, _SCHEDULER_INTERVAL
+            )
 
-        # Snapshot the state that the background listener has been updating
+        # Queries are sent by the scheduler; the poll only publishes a snapshot
+        # of the state that the background listener has been updating
         data = dict(self.api.state)
 
         # Cache static fields
@@ -79,4 +208,7 @@ class XToolS1Coordinator(DataUpdateCoordinator[dict[str, Any]]):
         data.setdefault("serial_number", self._cached_serial)
         data.setdefault("firmware_version", self._cached_firmware)
 
+        age = self.api.data_age
+        data["data_age_s"] = round(age, 1) if age is not None else None
+
         return data
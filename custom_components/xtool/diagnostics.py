@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_IP_ADDRESS
+
+TO_REDACT = {CONF_IP_ADDRESS, "serial_number"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    store = hass.data[DOMAIN][entry.entry_id]
+    coordinator = store["coordinator"]
+
+    diag: dict[str, Any] = {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "device_type": store.get("device_type"),
+        "data": async_redact_data(coordinator.data or {}, TO_REDACT),
+        "job_history": store["job_history"].summary(),
+    }
+
+    unknown_events = getattr(coordinator, "unknown_events", None)
+    if unknown_events is not None:
+        diag["unknown_events"] = {
+            "total": coordinator.unknown_event_total,
+            "by_key": {" ".join(map(str, key)): n for key, n in unknown_events.items()},
+        }
+
+    heatmap = store.get("heatmap")
+    if heatmap is not None:
+        diag["heatmap"] = heatmap.export()
+
+    return diag
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from collections import deque
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_FINISH_LEAD_TIME, EVENT_JOB_FINISHING_SOON
+from .job_history import is_job_active
+
+_LOGGER = logging.getLogger(__name__)
+
+# Progress samples older than this are dropped from the rate estimate
+WINDOW_S = 300.0
+MAX_SAMPLES = 150
+# Need at least this much progress change inside the window for an estimate
+MIN_PROGRESS_SPAN = 0.5
+
+
+def supports_eta(device_type: str) -> bool:
+    """D1 and the v2 HTTP devices report a job progress percentage."""
+    return device_type not in ("s1", "f1_v2")
+
+
+def _progress(data: dict[str, Any]) -> float | None:
+    value = data.get("progress_pct")
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class XToolJobEta:
+    """Online estimate of the remaining job time from progress samples.
+
+    The rate is a least-squares slope over a sliding window of
+    (time, progress) samples, so short stalls and jumps in the reported
+    percentage do not make the estimate jump. The window is cleared when a
+    new job starts.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        name: str,
+        device_type: str,
+        lead_time_min: float = DEFAULT_FINISH_LEAD_TIME,
+    ) -> None:
+        self.hass = hass
+        self._entry_id = entry_id
+        self._name = name
+        self.device_type = device_type
+        self.lead_time_s = lead_time_min * 60
+
+        self._samples: deque[tuple[float, float]] = deque(maxlen=MAX_SAMPLES)
+        self._active = False
+        self._notified = False
+
+        self.progress: float | None = None
+        self.remaining_s: float | None = None
+        self.finish_ts: float | None = None
+
+        self._coordinator: DataUpdateCoordinator | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_attach(self, coordinator: DataUpdateCoordinator) -> None:
+        self._coordinator = coordinator
+        self._unsub = coordinator.async_add_listener(self._handle_coordinator_update)
+
+    @callback
+    def async_detach(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    def set_lead_time(self, lead_time_min: float) -> None:
+        self.lead_time_s = lead_time_min * 60
+
+    def _reset(self) -> None:
+        self._samples.clear()
+        self._notified = False
+        self.progress = None
+        self.remaining_s = None
+        self.finish_ts = None
+
+    # ---- estimation ----
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        data = self._coordinator.data if self._coordinator else None
+        if not data or data.get("_unavailable"):
+            return
+
+        active = is_job_active(self.device_type, data)
+        if active != self._active:
+            self._active = active
+            self._reset()
+        if not active:
+            return
+
+        pct = _progress(data)
+        if pct is None:
+            return
+
+        now = time.time()
+        if self._samples and pct < self._samples[-1][1]:
+            # Progress went backwards: a new job or pass started
+            self._reset()
+        self._samples.append((now, pct))
+        while self._samples and now - self._samples[0][0] > WINDOW_S:
+            self._samples.popleft()
+
+        self.progress = pct
+        rate = self._rate()
+        if rate is None:
+            self.remaining_s = None
+            self.finish_ts = None
+            return
+
+        self.remaining_s = max(0.0, (100.0 - pct) / rate)
+        self.finish_ts = now + self.remaining_s
+
+        if not self._notified and self.remaining_s <= self.lead_time_s:
+            self._notified = True
+            self.hass.bus.async_fire(
+                EVENT_JOB_FINISHING_SOON,
+                {
+                    "entry_id": self._entry_id,
+                    "device_name": self._name,
+                    "progress": pct,
+                    "remaining_s": round(self.remaining_s),
+                    "finish": dt_util.utc_from_timestamp(self.finish_ts).isoformat(),
+                },
+            )
+
+    def _rate(self) -> float | None:
+        """Progress percent per second over the window (None = no estimate)."""
+        samples = self._samples
+        n = len(samples)
+        if n < 2 or samples[-1][1] - samples[0][1] < MIN_PROGRESS_SPAN:
+            return None
+        t0 = samples[0][0]
+        sx = sy = sxx = sxy = 0.0
+        for t, p in samples:
+            x = t - t0
+            sx += x
+            sy += p
+            sxx += x * x
+            sxy += x * p
+        den = n * sxx - sx * sx
+        if den <= 1e-9:
+            return None
+        slope = (n * sxy - sx * sy) / den
+        return slope if slope > 0 else None
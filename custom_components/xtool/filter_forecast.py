@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import AP2_FILTERS, DOMAIN, EVENT_FILTER_LOW, S1_RUNNING_STATES
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+LOW_THRESHOLD = 25
+CRITICAL_THRESHOLD = 15
+
+# A reading this much higher than the previous one means the filter was replaced
+REPLACED_JUMP = 5
+
+# Ignore gaps between ticks longer than this when accumulating job time
+_MAX_TICK_GAP = 120.0
+
+
+class _Trend:
+    """Incremental least-squares fit of remaining % over cumulative job hours."""
+
+    __slots__ = ("n", "sx", "sy", "sxx", "sxy", "last")
+
+    def __init__(self, stored: dict[str, Any] | None = None) -> None:
+        stored = stored or {}
+        self.n = int(stored.get("n", 0))
+        self.sx = float(stored.get("sx", 0.0))
+        self.sy = float(stored.get("sy", 0.0))
+        self.sxx = float(stored.get("sxx", 0.0))
+        self.sxy = float(stored.get("sxy", 0.0))
+        self.last: float | None = stored.get("last")
+
+    def reset(self) -> None:
+        self.n = 0
+        self.sx = self.sy = self.sxx = self.sxy = 0.0
+
+    def add(self, x: float, y: float) -> None:
+        self.n += 1
+        self.sx += x
+        self.sy += y
+        self.sxx += x * x
+        self.sxy += x * y
+        self.last = y
+
+    @property
+    def slope(self) -> float | None:
+        """Percent per job hour (negative while the filter wears)."""
+        if self.n < 2:
+            return None
+        den = self.n * self.sxx - self.sx * self.sx
+        if den <= 1e-9:
+            return None
+        return (self.n * self.sxy - self.sx * self.sy) / den
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "n": self.n,
+            "sx": self.sx,
+            "sy": self.sy,
+            "sxx": self.sxx,
+            "sxy": self.sxy,
+            "last": self.last,
+        }
+
+
+class XToolFilterForecast:
+    """Estimate remaining AP2 filter life from the M9039 readings.
+
+    Job hours are accumulated from the coordinator's work state. Every new
+    filter reading is added to a running linear fit, so updating a forecast
+    costs a handful of additions. A single `xtool_filter_low` event is fired
+    when a filter drops below the warning threshold.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, name: str) -> None:
+        self.hass = hass
+        self._entry_id = entry_id
+        self._name = name
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.filter_forecast.{entry_id}"
+        )
+
+        self.job_hours = 0.0
+        self._first_seen: float | None = None
+        self._trends: dict[str, _Trend] = {key: _Trend() for key in AP2_FILTERS}
+        # Last warning level per filter ("low" / "critical"), cleared on replacement
+        self._warned: dict[str, str] = {}
+
+        self._coordinator: DataUpdateCoordinator | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+        self._last_tick: float | None = None
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self.job_hours = float(stored.get("job_hours", 0.0))
+        self._first_seen = stored.get("first_seen")
+        for key, trend in (stored.get("trends") or {}).items():
+            if key in self._trends:
+                self._trends[key] = _Trend(trend)
+        warned = stored.get("warned") or {}
+        self._warned = {k: v for k, v in warned.items() if k in AP2_FILTERS}
+
+    @callback
+    def async_attach(self, coordinator: DataUpdateCoordinator) -> None:
+        self._coordinator = coordinator
+        self._unsub = coordinator.async_add_listener(self._handle_coordinator_update)
+
+    async def async_detach(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        await self._store.async_save(self._data_to_save())
+
+    # ---- forecasts ----
+
+    def job_hours_per_day(self) -> float | None:
+        if self._first_seen is None:
+            return None
+        days = max(1.0, (time.time() - self._first_seen) / 86400.0)
+        return self.job_hours / days if self.job_hours > 0 else None
+
+    def hours_remaining(self, key: str) -> float | None:
+        trend = self._trends[key]
+        slope = trend.slope
+        if slope is None or slope >= 0 or trend.last is None:
+            return None
+        return max(0.0, trend.last / -slope)
+
+    def days_remaining(self, key: str) -> float | None:
+        hours = self.hours_remaining(key)
+        rate = self.job_hours_per_day()
+        if hours is None or not rate:
+            return None
+        return hours / rate
+
+    # ---- state tracking ----
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        data = self._coordinator.data if self._coordinator else None
+        if not data or data.get("_unavailable"):
+            self._last_tick = None
+            return
+
+        now = time.time()
+        changed = False
+
+        if data.get("work_state_raw") in S1_RUNNING_STATES and self._last_tick is not None:
+            self.job_hours += min(now - self._last_tick, _MAX_TICK_GAP) / 3600.0
+            changed = True
+        self._last_tick = now
+
+        for key, name in AP2_AP2_FILTERS.items():
+            value = data.get(key)
+            if not isinstance(value, (int, float)):
+                continue
+            if self._first_seen is None:
+                self._first_seen = now
+                changed = True
+
+            trend = self._trends[key]
+            if trend.last is not None and value == trend.last:
+                continue
+            if trend.last is not None and value >= trend.last + REPLACED_JUMP:
+                _LOGGER.debug("AP2 %s replaced (%s%% -> %s%%)", name, trend.last, value)
+                trend.reset()
+            trend.add(self.job_hours, float(value))
+            changed = True
+
+            self._check_low(key, name, float(value))
+
+        if changed:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _check_low(self, key: str, name: str, value: float) -> None:
+        if value >= LOW_THRESHOLD:
+            self._warned.pop(key, None)
+            return
+        level = "critical" if value < CRITICAL_THRESHOLD else "low"
+        previous = self._warned.get(key)
+        if previous == level or previous == "critical":
+            return
+        self._warned[key] = level
+        days = self.days_remaining(key)
+        self.hass.bus.async_fire(
+            EVENT_FILTER_LOW,
+            {
+                "entry_id": self._entry_id,
+                "device_name": self._name,
+                "filter": key,
+                "filter_name": name,
+                "remaining": value,
+                "level": level,
+                "critical": level == "critical",
+                "days_remaining": round(days, 1) if days is not None else None,
+            },
+        )
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "job_hours": self.job_hours,
+            "first_seen": self._first_seen,
+            "trends": {key: trend.as_dict() for key, trend in self._trends.items()},
+            "warned": self._warned,
+        }
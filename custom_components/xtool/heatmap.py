@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from array import array
+import base64
+from datetime import timedelta
+import logging
+import math
+import struct
+from typing import Any
+import zlib
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, S1_RUNNING_STATES
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Samples arrive continuously during jobs; persist at most this often
+SAVE_INTERVAL = timedelta(minutes=5)
+
+# S1 work area (mm) and grid resolution
+BED_WIDTH_MM = 498.0
+BED_HEIGHT_MM = 319.0
+CELL_MM = 5.0
+
+# Rendered image: pixels per grid cell
+RENDER_SCALE = 4
+
+# Color ramp (dark blue -> red -> yellow -> white) for normalized intensity
+_RAMP: tuple[tuple[float, tuple[int, int, int]], ...] = (
+    (0.0, (16, 16, 48)),
+    (0.35, (120, 28, 110)),
+    (0.65, (230, 80, 30)),
+    (0.9, (250, 210, 60)),
+    (1.0, (255, 255, 230)),
+)
+
+
+def _color(v: float) -> tuple[int, int, int]:
+    for (p0, c0), (p1, c1) in zip(_RAMP, _RAMP[1:]):
+        if v <= p1:
+            f = (v - p0) / (p1 - p0)
+            return (
+                int(c0[0] + (c1[0] - c0[0]) * f),
+                int(c0[1] + (c1[1] - c0[1]) * f),
+                int(c0[2] + (c1[2] - c0[2]) * f),
+            )
+    return _RAMP[-1][1]
+
+
+def _png_chunk(tag: bytes, payload: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(payload))
+        + tag
+        + payload
+        + struct.pack(">I", zlib.crc32(tag + payload) & 0xFFFFFFFF)
+    )
+
+
+def encode_png(width: int, height: int, rows: list[bytes]) -> bytes:
+    """Encode 8-bit RGB scanlines as a PNG (no external imaging library)."""
+    raw = b"".join(b"\x00" + row for row in rows)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + _png_chunk(b"IDAT", zlib.compress(raw, 6))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+def render_png(grid: array, cols: int, rows: int) -> bytes:
+    """Render a grid as PNG; log scaling keeps sparse regions visible."""
+    peak = max(grid) if grid else 0
+    norm = math.log1p(peak) if peak else 1.0
+
+    palette: dict[int, bytes] = {}
+    lines: list[bytes] = []
+    # Row 0 is Y=0 (front of the bed) and is drawn at the bottom
+    for r in range(rows - 1, -1, -1):
+        line = bytearray()
+        for c in range(cols):
+            v = grid[r * cols + c]
+            px = palette.get(v)
+            if px is None:
+                px = palette[v] = bytes(_color(math.log1p(v) / norm)) * RENDER_SCALE
+            line += px
+        line_bytes = bytes(line)
+        lines.extend([line_bytes] * RENDER_SCALE)
+    return encode_png(cols * RENDER_SCALE, rows * RENDER_SCALE, lines)
+
+
+class XToolHeatmap:
+    """Work-area occupancy grid accumulated from S1 head positions.
+
+    Every reported position while a job runs increments one cell of a flat
+    uint32 array, which is O(1) per sample and cheap enough to run for every
+    M303/M27 frame.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self.hass = hass
+        self.cols = math.ceil(BED_WIDTH_MM / CELL_MM)
+        self.rows = math.ceil(BED_HEIGHT_MM / CELL_MM)
+        self.grid = array("I", bytes(4 * self.cols * self.rows))
+        self.samples = 0
+        self.peak = 0
+        self.revision = 0
+
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.heatmap.{entry_id}"
+        )
+        self._api: Any = None
+        self._unsub: CALLBACK_TYPE | None = None
+        self._unsub_save: CALLBACK_TYPE | None = None
+        self._saved_revision = 0
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        if (stored.get("cols"), stored.get("rows"), stored.get("cell_mm")) != (
+            self.cols,
+            self.rows,
+            CELL_MM,
+        ):
+            _LOGGER.debug("Discarding S1 heatmap stored with a different grid layout")
+            return
+        try:
+            grid = array("I")
+            grid.frombytes(zlib.decompress(base64.b64decode(stored["grid"])))
+        except (KeyError, ValueError, zlib.error):
+            _LOGGER.debug("Discarding unreadable S1 heatmap", exc_info=True)
+            return
+        if len(grid) != len(self.grid):
+            return
+        self.grid = grid
+        self.samples = int(stored.get("samples") or 0)
+        self.peak = max(grid) if grid else 0
+
+    @callback
+    def async_attach(self, api: Any) -> None:
+        self._api = api
+        self._unsub = api.add_position_listener(self.add_sample)
+        self._unsub_save = async_track_time_interval(
+            self.hass, self._async_save_if_changed, SAVE_INTERVAL
+        )
+
+    async def async_detach(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        if self._unsub_save:
+            self._unsub_save()
+            self._unsub_save = None
+        await self._async_save_if_changed()
+
+    async def _async_save_if_changed(self, _now: Any = None) -> None:
+        if self.revision == self._saved_revision:
+            return
+        self._saved_revision = self.revision
+        await self._store.async_save(self._data_to_save())
+
+    def add_sample(self, x: float, y: float) -> None:
+        if self._api is not None and self._api.state.get("work_state_raw") not in S1_RUNNING_STATES:
+            return
+        col = int(x / CELL_MM)
+        row = int(y / CELL_MM)
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return
+        idx = row * self.cols + col
+        value = self.grid[idx] + 1
+        self.grid[idx] = value
+        if value > self.peak:
+            self.peak = value
+        self.samples += 1
+        self.revision += 1
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "cell_mm": CELL_MM,
+            "cols": self.cols,
+            "rows": self.rows,
+            "samples": self.samples,
+            "grid": base64.b64encode(zlib.compress(self.grid.tobytes())).decode("ascii"),
+        }
+
+    def as_rows(self) -> list[list[int]]:
+        cols = self.cols
+        return [list(self.grid[r * cols : (r + 1) * cols]) for r in range(self.rows)]
+
+    def export(self) -> dict[str, Any]:
+        """Diagnostics export: layout, totals and the raw counts per cell."""
+        return {
+            "cell_mm": CELL_MM,
+            "bed_mm": [BED_WIDTH_MM, BED_HEIGHT_MM],
+            "cols": self.cols,
+            "rows": self.rows,
+            "samples": self.samples,
+            "peak": self.peak,
+            "grid": self.as_rows(),
+        }
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from array import array
+import logging
+from typing import Any
+
+from homeassistant.components.image import ImageEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, MANUFACTURER
+from .heatmap import CELL_MM, XToolHeatmap, render_png
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the image entities."""
+    store = hass.data[DOMAIN][entry.entry_id]
+    heatmap: XToolHeatmap | None = store.get("heatmap")
+
+    if heatmap is None:
+        _LOGGER.debug(
+            "xTool device type '%s' has no work-area heatmap – no image entities created.",
+            store.get("device_type"),
+        )
+        return
+
+    async_add_entities(
+        [
+            XToolHeatmapImage(
+                hass,
+                store["coordinator"],
+                heatmap,
+                store["name"],
+                store["entry_id"],
+                store.get("device_type", "").lower(),
+            )
+        ]
+    )
+
+
+class XToolHeatmapImage(CoordinatorEntity, ImageEntity):
+    """Rendered work-area usage heatmap of an S1."""
+
+    _attr_has_entity_name = True
+    _attr_content_type = "image/png"
+    _attr_icon = "mdi:grid"
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator,
+        heatmap: XToolHeatmap,
+        name: str,
+        entry_id: str,
+        device_type: str,
+    ) -> None:
+        CoordinatorEntity.__init__(self, coordinator)
+        ImageEntity.__init__(self, hass)
+
+        self._heatmap = heatmap
+        self._device_name = name
+        self._entry_id = entry_id
+        self._device_type = device_type
+        self._attr_name = "Work Area Heatmap"
+        self._attr_unique_id = f"{entry_id}_s1_heatmap"
+        self._attr_image_last_updated = dt_util.utcnow()
+
+        self._announced_revision = heatmap.revision
+        self._rendered_revision: int | None = None
+        self._image: bytes | None = None
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        return {
+            "identifiers": {(DOMAIN, self._entry_id)},
+            "name": self._device_name,
+            "manufacturer": MANUFACTURER,
+            "model": self._device_type.upper(),
+        }
+
+    @property
+    def available(self) -> bool:
+        # Accumulated local data, valid while the device is offline
+        return True
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {
+            "samples": self._heatmap.samples,
+            "peak": self._heatmap.peak,
+            "cell_mm": CELL_MM,
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._heatmap.revision != self._announced_revision:
+            self._announced_revision = self._heatmap.revision
+            self._attr_image_last_updated = dt_util.utcnow()
+        super()._handle_coordinator_update()
+
+    async def async_image(self) -> bytes | None:
+        revision = self._heatmap.revision
+        if self._image is None or revision != self._rendered_revision:
+            grid = array("I", self._heatmap.grid)
+            self._image = await self.hass.async_add_executor_job(
+                render_png, grid, self._heatmap.cols, self._heatmap.rows
+            )
+            self._rendered_revision = revision
+        return self._image
@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, S1_RUNNING_STATES, V2_ACTIVE_MODES
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+# Size caps: the job log is append-only but never grows beyond MAX_JOBS entries,
+# per-day totals are kept for roughly one year.
+MAX_JOBS = 500
+MAX_DAYS = 400
+
+# F1 V2 reports the job result as a separate event that may arrive shortly
+# after the status change. Wait this long before closing a job without it.
+F1_V2_RESULT_GRACE = 15
+
+RESULT_SUCCESS = "success"
+RESULT_FAILED = "failed"
+RESULT_CANCELLED = "cancelled"
+RESULT_UNKNOWN = "unknown"
+
+_V2_DONE_MODES = {"P_WORK_DONE", "P_FINISH"}
+_F1_V2_SUCCESS_RESULTS = {"ok", "success", "succeed", "finish", "finished", "done", "complete", "0"}
+_F1_V2_CANCEL_RESULTS = {"cancel", "cancelled", "canceled", "stop", "stopped", "abort"}
+
+
+def is_job_active(device_type: str, data: dict[str, Any]) -> bool:
+    """Return True while the device is executing a job."""
+    if device_type == "f1_v2":
+        return data.get("status") == "working"
+    if device_type == "s1":
+        return data.get("work_state_raw") in S1_RUNNING_STATES
+    if device_type == "d1":
+        return data.get("working_state") == "Running"
+    return str(data.get("work_state_raw") or "").upper() in V2_ACTIVE_MODES
+
+
+def _end_result(device_type: str, data: dict[str, Any], last_active: dict[str, Any]) -> str:
+    """Infer the job result from the first snapshot after a job ended."""
+    if device_type == "s1":
+        if data.get("alarm_present"):
+            return RESULT_FAILED
+        # S19 ("Finishing") is only reached when the job ran to completion
+        if last_active.get("work_state_raw") == "S19":
+            return RESULT_SUCCESS
+        return RESULT_UNKNOWN
+
+    if device_type == "d1":
+        if any(data.get(k) for k in ("tiltStopFlag", "limitStopFlag", "movingStopFlag")):
+            return RESULT_FAILED
+        pct = last_active.get("progress_pct")
+        if pct is None:
+            return RESULT_UNKNOWN
+        return RESULT_SUCCESS if pct >= 99 else RESULT_CANCELLED
+
+    if device_type == "f1_v2":
+        if data.get("status") == "error" or data.get("alarm_present"):
+            return RESULT_FAILED
+        if data.get("status") == "finished":
+            return RESULT_SUCCESS
+        return RESULT_UNKNOWN
+
+    mode = str(data.get("work_state_raw") or "").upper()
+    if mode == "P_ERROR" or data.get("alarm_present"):
+        return RESULT_FAILED
+    if mode in _V2_DONE_MODES:
+        return RESULT_SUCCESS
+    return RESULT_UNKNOWN
+
+
+def _map_f1_v2_result(raw: Any) -> str:
+    s = str(raw).strip().lower()
+    if s in _F1_V2_SUCCESS_RESULTS:
+        return RESULT_SUCCESS
+    if s in _F1_V2_CANCEL_RESULTS:
+        return RESULT_CANCELLED
+    if s in ("fail", "failed", "error"):
+        return RESULT_FAILED
+    return RESULT_UNKNOWN
+
+
+def _to_float(v: Any) -> float | None:
+    try:
+        return float(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class XToolJobHistory:
+    """Append-only, size-capped job log for one device.
+
+    Jobs are detected from the coordinator's existing state transitions, so no
+    additional device traffic is generated. Aggregates are updated once per
+    finished job and never recomputed from the log.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, device_type: str) -> None:
+        self.hass = hass
+        self.device_type = device_type
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.job_history.{entry_id}"
+        )
+
+        self.jobs: list[dict[str, Any]] = []
+        self.stats: dict[str, Any] = self._empty_stats()
+
+        self._current: dict[str, Any] | None = None
+        self._last_active: dict[str, Any] = {}
+        self._last_result_key: tuple[Any, Any, Any] | None = None
+        self._pending_finalize: CALLBACK_TYPE | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+        self._coordinator: DataUpdateCoordinator | None = None
+
+    @staticmethod
+    def _empty_stats() -> dict[str, Any]:
+        return {
+            "count": 0,
+            "duration_total_s": 0.0,
+            "results": {},
+            "per_day": {},
+        }
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self.jobs = list(stored.get("jobs") or [])[-MAX_JOBS:]
+        stats = stored.get("stats")
+        if isinstance(stats, dict):
+            self.stats = {**self._empty_stats(), **stats}
+
+    @callback
+    def async_attach(self, coordinator: DataUpdateCoordinator) -> None:
+        self._coordinator = coordinator
+        data = coordinator.data or {}
+        if self.device_type == "f1_v2":
+            # Do not record the result that is already present at startup again
+            self._last_result_key = self._result_key(data)
+        self._unsub = coordinator.async_add_listener(self._handle_coordinator_update)
+
+    async def async_detach(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        if self._pending_finalize:
+            self._pending_finalize()
+            self._pending_finalize = None
+        await self._store.async_save(self._data_to_save())
+
+    # ---- derived values ----
+
+    @property
+    def count(self) -> int:
+        return int(self.stats["count"])
+
+    @property
+    def duration_total_s(self) -> float:
+        return float(self.stats["duration_total_s"])
+
+    @property
+    def duration_mean_s(self) -> float | None:
+        if not self.count:
+            return None
+        return self.duration_total_s / self.count
+
+    @property
+    def failure_rate(self) -> float | None:
+        if not self.count:
+            return None
+        return 100.0 * self.stats["results"].get(RESULT_FAILED, 0) / self.count
+
+    @property
+    def last_job(self) -> dict[str, Any] | None:
+        return self.jobs[-1] if self.jobs else None
+
+    def day_totals(self, day: str | None = None) -> dict[str, Any]:
+        if day is None:
+            day = dt_util.now().date().isoformat()
+        return self.stats["per_day"].get(day) or {"count": 0, "duration_s": 0.0}
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "duration_total_s": round(self.duration_total_s, 1),
+            "duration_mean_s": (
+                round(self.duration_mean_s, 1) if self.duration_mean_s is not None else None
+            ),
+            "failure_rate": (
+                round(self.failure_rate, 2) if self.failure_rate is not None else None
+            ),
+            "results": dict(self.stats["results"]),
+            "today": self.day_totals(),
+        }
+
+    def query(self, limit: int, since: float | None = None) -> list[dict[str, Any]]:
+        """Return up to `limit` jobs, newest first, optionally ended after `since`."""
+        out: list[dict[str, Any]] = []
+        for job in reversed(self.jobs):
+            if since is not None and job["end"] < since:
+                break
+            out.append(job)
+            if len(out) >= limit:
+                break
+        return out
+
+    # ---- state tracking ----
+
+    @staticmethod
+    def _result_key(data: dict[str, Any]) -> tuple[Any, Any, Any]:
+        return (data.get("task_id"), data.get("last_result"), data.get("last_job_time"))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        data = self._coordinator.data if self._coordinator else None
+        if not data or data.get("_unavailable"):
+            return
+
+        now = time.time()
+
+        if self.device_type == "f1_v2":
+            key = self._result_key(data)
+            if key != self._last_result_key:
+                self._last_result_key = key
+                if data.get("last_result") is not None:
+                    self._handle_f1_v2_result(data, now)
+
+        active = is_job_active(self.device_type, data)
+
+        if active:
+            if self._current is None:
+                if self._pending_finalize:
+                    # A new job started before the previous result arrived
+                    self._finalize_pending(now)
+                self._current = {
+                    "start": now,
+                    "task_id": data.get("task_id"),
+                    "file": data.get("job_file"),
+                }
+            else:
+                if data.get("task_id") is not None:
+                    self._current["task_id"] = data.get("task_id")
+                if data.get("job_file"):
+                    self._current["file"] = data.get("job_file")
+            self._last_active = dict(data)
+            return
+
+        if self._current is None or "end" in self._current:
+            return
+
+        self._current["end"] = now
+        self._current.setdefault(
+            "result", _end_result(self.device_type, data, self._last_active)
+        )
+        if self.device_type == "d1":
+            self._current["duration"] = _to_float(self._last_active.get("working_s"))
+
+        if self.device_type == "f1_v2" and "result_raw" not in self._current:
+            self._pending_finalize = async_call_later(
+                self.hass, F1_V2_RESULT_GRACE, self._finalize_pending_cb
+            )
+            return
+
+        job, self._current = self._current, None
+        self._finalize(job)
+
+    def _handle_f1_v2_result(self, data: dict[str, Any], now: float) -> None:
+        duration = _to_float(data.get("last_job_time"))
+
+        job = self._current
+        if job is None:
+            # Missed the start (e.g. HA restarted mid-job): rebuild from the result
+            job = {"start": now - (duration or 0.0), "end": now, "file": None}
+
+        job["result"] = _map_f1_v2_result(data.get("last_result"))
+        job["result_raw"] = data.get("last_result")
+        job["task_id"] = data.get("task_id") or job.get("task_id")
+        if duration is not None:
+            job["duration"] = duration
+
+        if job is not self._current:
+            self._finalize(job)
+        elif "end" in job:
+            # Status already left "working": close without waiting for the grace timer
+            self._finalize_pending(now)
+        # Otherwise the job is still running; it is closed on the status change.
+
+    @callback
+    def _finalize_pending_cb(self, _now: Any) -> None:
+        self._pending_finalize = None
+        self._finalize_pending(time.time())
+        if self._coordinator:
+            self._coordinator.async_update_listeners()
+
+    def _finalize_pending(self, now: float) -> None:
+        if self._pending_finalize:
+            self._pending_finalize()
+            self._pending_finalize = None
+        if self._current is not None and "end" in self._current:
+            job, self._current = self._current, None
+            self._finalize(job)
+
+    def _finalize(self, job: dict[str, Any]) -> None:
+        start = float(job["start"])
+        end = float(job.get("end") or time.time())
+        duration = job.get("duration")
+        if duration is None:
+            duration = max(0.0, end - start)
+
+        record = {
+            "start": round(start, 1),
+            "end": round(end, 1),
+            "duration": round(float(duration), 1),
+            "result": job.get("result") or RESULT_UNKNOWN,
+            "task_id": job.get("task_id"),
+            "file": job.get("file"),
+        }
+        if job.get("result_raw") is not None:
+            record["result_raw"] = job["result_raw"]
+
+        self.jobs.append(record)
+        if len(self.jobs) > MAX_JOBS:
+            del self.jobs[: len(self.jobs) - MAX_JOBS]
+
+        stats = self.stats
+        stats["count"] += 1
+        stats["duration_total_s"] += record["duration"]
+        results = stats["results"]
+        results[record["result"]] = results.get(record["result"], 0) + 1
+
+        day = dt_util.as_local(dt_util.utc_from_timestamp(end)).date().isoformat()
+        per_day = stats["per_day"]
+        totals = per_day.setdefault(day, {"count": 0, "duration_s": 0.0})
+        totals["count"] += 1
+        totals["duration_s"] = round(totals["duration_s"] + record["duration"], 1)
+        if len(per_day) > MAX_DAYS:
+            for old in sorted(per_day)[: len(per_day) - MAX_DAYS]:
+                del per_day[old]
+
+        _LOGGER.debug("XTool job recorded: %s", record)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"jobs": self.jobs, "stats": self.stats}
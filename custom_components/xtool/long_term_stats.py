@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _working_info_value(key: str) -> Callable[[dict[str, Any]], Any]:
+    def _get(data: dict[str, Any]) -> Any:
+        wi = data.get("working_info")
+        if isinstance(wi, dict) and isinstance(wi.get("data"), dict):
+            return wi["data"].get(key)
+        return None
+
+    return _get
+
+
+@dataclass(frozen=True)
+class _CounterDescription:
+    key: str
+    name: str
+    unit: str | None
+    value_fn: Callable[[dict[str, Any]], Any]
+    scale: float = 1.0
+
+
+_V2_COUNTERS: tuple[_CounterDescription, ...] = (
+    _CounterDescription(
+        "system_runtime",
+        "System Runtime",
+        UnitOfTime.HOURS,
+        _working_info_value("timeSystemWork"),
+        1 / 3600,
+    ),
+    _CounterDescription(
+        "laser_runtime",
+        "Laser Runtime",
+        UnitOfTime.HOURS,
+        _working_info_value("timeLaserWork"),
+        1 / 3600,
+    ),
+    _CounterDescription(
+        "jobs",
+        "Jobs",
+        None,
+        _working_info_value("numOnlineWorking"),
+    ),
+)
+
+_D1_COUNTERS: tuple[_CounterDescription, ...] = (
+    _CounterDescription(
+        "working_time",
+        "Working Time",
+        UnitOfTime.HOURS,
+        lambda data: data.get("working_s"),
+        1 / 3600,
+    ),
+)
+
+
+def counters_for(device_type: str) -> tuple[_CounterDescription, ...]:
+    """Return the cumulative counters a device type reports."""
+    if device_type == "d1":
+        return _D1_COUNTERS
+    if device_type in ("s1", "f1_v2"):
+        return ()
+    return _V2_COUNTERS
+
+
+class _CounterState:
+    """Running hourly sum for one cumulative device counter."""
+
+    def __init__(self, description: _CounterDescription, statistic_id: str, name: str) -> None:
+        self.description = description
+        self.metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"{name} {description.name}",
+            source=DOMAIN,
+            statistic_id=statistic_id,
+            unit_of_measurement=description.unit,
+        )
+        self.last_state: float | None = None
+        self.sum = 0.0
+        self.hour: datetime | None = None
+        self.pending: list[StatisticData] = []
+
+    def add_sample(self, value: float, hour: datetime) -> None:
+        if self.last_state is None:
+            # First sample ever: start the sum at zero like a total_increasing sensor
+            delta = 0.0
+        elif value < self.last_state:
+            # Counter was reset (e.g. D1 per-job working time): count from zero
+            delta = value
+        else:
+            delta = value - self.last_state
+
+        if self.hour is not None and hour > self.hour and self.last_state is not None:
+            # The previous hour is complete
+            self.pending.append(self._row())
+        self.sum += delta
+        self.last_state = value
+        self.hour = hour
+
+    def _row(self) -> StatisticData:
+        return StatisticData(start=self.hour, state=self.last_state, sum=self.sum)
+
+    def take_rows(self, include_current: bool) -> list[StatisticData]:
+        rows, self.pending = self.pending, []
+        if include_current and self.hour is not None and self.last_state is not None:
+            rows.append(self._row())
+        return rows
+
+
+class XToolStatisticsImporter:
+    """Write cumulative device counters as hourly external long-term statistics.
+
+    The device keeps its own lifetime totals, so after an outage the next
+    reading simply carries the whole delta; nothing has to be replayed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        name: str,
+        device_type: str,
+    ) -> None:
+        self.hass = hass
+        self._counters = [
+            _CounterState(
+                description,
+                f"{DOMAIN}:{slugify(entry_id)}_{description.key}",
+                name,
+            )
+            for description in counters_for(device_type)
+        ]
+        self._coordinator: DataUpdateCoordinator | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+
+    async def async_attach(self, coordinator: DataUpdateCoordinator) -> None:
+        await self._async_restore()
+        self._coordinator = coordinator
+        self._unsub = coordinator.async_add_listener(self._handle_coordinator_update)
+        self._handle_coordinator_update()
+
+    async def async_detach(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        self._flush(include_current=True)
+
+    async def _async_restore(self) -> None:
+        """Continue the sums from the last rows stored in the recorder."""
+        recorder = get_instance(self.hass)
+        for counter in self._counters:
+            statistic_id = counter.metadata["statistic_id"]
+            last = await recorder.async_add_executor_job(
+                get_last_statistics, self.hass, 1, statistic_id, True, {"state", "sum"}
+            )
+            rows = last.get(statistic_id) if last else None
+            if not rows:
+                continue
+            row = rows[0]
+            counter.sum = float(row.get("sum") or 0.0)
+            if row.get("state") is not None:
+                counter.last_state = float(row["state"])
+            start = row.get("start")
+            if isinstance(start, (int, float)):
+                counter.hour = dt_util.utc_from_timestamp(start)
+            elif isinstance(start, datetime):
+                counter.hour = start
+            _LOGGER.debug(
+                "Continuing statistic %s at sum=%s state=%s",
+                statistic_id,
+                counter.sum,
+                counter.last_state,
+            )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        data = self._coordinator.data if self._coordinator else None
+        if not data or data.get("_unavailable"):
+            return
+
+        hour = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        for counter in self._counters:
+            raw = counter.description.value_fn(data)
+            try:
+                value = float(raw) * counter.description.scale
+            except (TypeError, ValueError):
+                continue
+            if counter.hour is not None and hour < counter.hour:
+                # Clock went backwards; never rewrite already imported hours
+                continue
+            counter.add_sample(value, hour)
+
+        # Completed hours of all counters are handed to the recorder in one pass
+        if any(c.pending for c in self._counters):
+            self._flush(include_current=False)
+
+    def _flush(self, include_current: bool) -> None:
+        for counter in self._counters:
+            rows = counter.take_rows(include_current)
+            if rows:
+                async_add_external_statistics(self.hass, counter.metadata, rows)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+
+# Peripheral reads of the v2 HTTP API: name -> (method, path). The coordinator
+# normalizes each reply with its `_normalize_<name>` method; POSTs send
+# {"action": "get"}.
+PERIPHERAL_ENDPOINTS: dict[str, tuple[str, str]] = {
+    "gap": ("GET", "/peripheral/gap"),
+    "smoking_fan": ("GET", "/peripheral/smoking_fan"),
+    "ext_purifier": ("GET", "/peripheral/ext_purifier"),
+    "machine_lock": ("GET", "/peripheral/machine_lock"),
+    "airassist": ("GET", "/peripheral/airassist"),
+    "drawer": ("GET", "/peripheral/drawer"),
+    "heighten": ("GET", "/peripheral/heighten"),
+    "workhead": ("POST", "/peripheral/workhead_ID"),
+    "knife_head": ("POST", "/peripheral/knife_head"),
+    "inkjet": ("POST", "/peripheral/inkjet_printer"),
+}
+
+# Optional accessories: peripheral name -> key of the presence flag its
+# normalizer reports. Reads of a missing accessory are skipped on fast ticks
+# and its entities are only added once it is detected (see
+# DeviceProfile.accessories for which of them a model treats as optional).
+ACCESSORY_EXIST_KEYS: dict[str, str] = {
+    "smoking_fan": "fan_exist",
+    "ext_purifier": "ext_purifier_exist",
+    "airassist": "airassist_exist",
+    "inkjet": "inkjet_exist",
+}
+
+_LASER_PERIPHERALS = ("gap", "smoking_fan", "ext_purifier", "machine_lock", "airassist")
+_M1U_MODULES = ("heighten", "workhead", "knife_head", "inkjet")
+
+_BASE_PLATFORMS = ("sensor", "binary_sensor")
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceProfile:
+    """Static per-model behavior, selected once per config entry."""
+
+    # Platforms that get entities for this model
+    platforms: tuple[str, ...] = _BASE_PLATFORMS
+    # v2 HTTP models: peripheral reads per tick (keys of PERIPHERAL_ENDPOINTS)
+    peripherals: tuple[str, ...] = ()
+    # /peripheral/gap reports "off" for an open lid
+    gap_inverted: bool = False
+    # Skip peripheral and slow GETs while sleeping so the machine can stay asleep
+    # (the config POST is never sent while sleeping, on any model)
+    quiet_sleep: bool = False
+    # Entities
+    machine_lock_entity: bool = True
+    exhaust_via_purifier: bool = False  # F1 reports its fan as ext_purifier
+    legacy_status: bool = False  # M1 water temperature/purifier from /status
+    module_entities: bool = False  # M1 Ultra carriages, hatch, ink module
+
+    @property
+    def has_drawer(self) -> bool:
+        return "drawer" in self.peripherals
+
+    @property
+    def has_exhaust_fan(self) -> bool:
+        return "smoking_fan" in self.peripherals
+
+    @property
+    def has_airassist(self) -> bool:
+        return "airassist" in self.peripherals
+
+    @property
+    def accessories(self) -> frozenset[str]:
+        """Peripherals that are optional add-ons on this model.
+
+        The F1 reports its built-in exhaust fan through ext_purifier, so that
+        read is never treated as a missing accessory there.
+        """
+        optional = {name for name in self.peripherals if name in ACCESSORY_EXIST_KEYS}
+        if self.exhaust_via_purifier:
+            optional.discard("ext_purifier")
+        return frozenset(optional)
+
+
+_P2 = DeviceProfile(
+    platforms=(*_BASE_PLATFORMS, "camera", "switch"),
+    peripherals=(*_LASER_PERIPHERALS, "drawer"),
+)
+# Galvo lasers: no bottom drawer
+_F2 = DeviceProfile(
+    platforms=(*_BASE_PLATFORMS, "switch"),
+    peripherals=_LASER_PERIPHERALS,
+)
+_M1U = DeviceProfile(
+    platforms=(*_BASE_PLATFORMS, "switch", "button"),
+    peripherals=(*_LASER_PERIPHERALS, *_M1U_MODULES),
+    gap_inverted=True,
+    quiet_sleep=True,
+    module_entities=True,
+)
+
+# Full v2 peripheral set for models without a tuned profile (e.g. the Apparel
+# Printer, which has no profile of its own until its peripherals are known)
+DEFAULT_PROFILE = DeviceProfile(
+    platforms=(*_BASE_PLATFORMS, "switch"),
+    peripherals=(*_LASER_PERIPHERALS, "drawer"),
+)
+
+PROFILES: dict[str, DeviceProfile] = {
+    "p2": replace(_P2, machine_lock_entity=False),
+    "p3": _P2,
+    "f1": DeviceProfile(
+        peripherals=("gap", "ext_purifier", "machine_lock"),
+        exhaust_via_purifier=True,
+    ),
+    "f2": _F2,
+    "f2u": _F2,
+    "f2uuv": _F2,
+    "m1": replace(DEFAULT_PROFILE, legacy_status=True),
+    "m1u": _M1U,
+    "m1 ultra": _M1U,
+    # Own API stacks (no v2 peripherals)
+    "s1": DeviceProfile(platforms=(*_BASE_PLATFORMS, "image")),
+    "d1": DeviceProfile(),
+    "f1_v2": DeviceProfile(),
+}
+
+
+def get_profile(device_type: str) -> DeviceProfile:
+    return PROFILES.get(device_type, DEFAULT_PROFILE)
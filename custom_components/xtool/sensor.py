@@ -1,16 +1,36 @@
 from __future__ import annotations
 
-from typing import Any
-
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.const import UnitOfTemperature, UnitOfTime, PERCENTAGE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfDataRate,
+    UnitOfTemperature,
+    UnitOfTime,
+    PERCENTAGE,
+)
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .accessories import async_add_accessory_entities
+from .const import AP2_FILTERS, DOMAIN, MANUFACTURER, CONF_HAS_AP2
+from .eta import XToolJobEta
+from .job_history import XToolJobHistory
+from .profiles import DeviceProfile
 
-from .const import DOMAIN, MANUFACTURER, CONF_HAS_AP2
-from .coordinator_s1 import XToolS1Coordinator
+if TYPE_CHECKING:
+    # Model-specific modules, only imported by the entries that use them
+    from .filter_forecast import XToolFilterForecast
+    from .upload_d1 import XToolD1Uploader
 
 
 async def async_setup_entry(
@@ -27,6 +47,29 @@ async def async_setup_entry(
 
     entities: list[SensorEntity] = []
 
+    # Job history statistics (all device types)
+    history: XToolJobHistory = store["job_history"]
+    entities.extend(
+        [
+            XToolJobCountSensor(coordinator, name, entry_id, device_type, history),
+            XToolJobTimeTotalSensor(coordinator, name, entry_id, device_type, history),
+            XToolJobDurationMeanSensor(coordinator, name, entry_id, device_type, history),
+            XToolJobFailureRateSensor(coordinator, name, entry_id, device_type, history),
+            XToolJobsTodaySensor(coordinator, name, entry_id, device_type, history),
+            XToolJobTimeTodaySensor(coordinator, name, entry_id, device_type, history),
+        ]
+    )
+
+    # Job ETA (devices reporting a progress percentage)
+    eta: XToolJobEta | None = store.get("eta")
+    if eta is not None:
+        entities.extend(
+            [
+                XToolJobTimeRemainingSensor(coordinator, name, entry_id, device_type, eta),
+                XToolJobFinishSensor(coordinator, name, entry_id, device_type, eta),
+            ]
+        )
+
     if device_type == "f1_v2":
         entities.extend(
             [
@@ -35,7 +78,7 @@ async def async_setup_entry(
                 XToolF1V2LastJobTimeSensor(coordinator, name, entry_id, device_type),
             ]
         )
-        async_add_entities(entities, True)
+        async_add_entities(entities)
         return
     
     if device_type == "d1":
@@ -48,7 +91,14 @@ async def async_setup_entry(
                 D1MachineTypeSensor(coordinator, name, entry_id, device_type),
             ]
         )
-        async_add_entities(entities, True)
+        uploader: XToolD1Uploader = store["uploader"]
+        entities.extend(
+            [
+                D1UploadProgressSensor(coordinator, name, entry_id, device_type, uploader),
+                D1UploadThroughputSensor(coordinator, name, entry_id, device_type, uploader),
+            ]
+        )
+        async_add_entities(entities)
         return
 
     if device_type == "s1":
@@ -61,6 +111,7 @@ async def async_setup_entry(
                 S1PositionYSensor(coordinator, name, entry_id, device_type),
                 S1FanASensor(coordinator, name, entry_id, device_type),
                 S1FanBSensor(coordinator, name, entry_id, device_type),
+                S1DataAgeSensor(coordinator, name, entry_id, device_type),
             ]
         )
         if entry.data.get(CONF_HAS_AP2, False):
@@ -77,7 +128,14 @@ async def async_setup_entry(
                     S1FilterHepaSensor(coordinator, name, entry_id, device_type),
                 ]
             )
-        async_add_entities(entities, True)
+            forecast: XToolFilterForecast = store["filter_forecast"]
+            entities.extend(
+                S1FilterDaysRemainingSensor(
+                    coordinator, name, entry_id, device_type, forecast, filter_key
+                )
+                for filter_key in AP2_FILTERS
+            )
+        async_add_entities(entities)
         return
 
     # Common (P2/F1/M1/M1U)
@@ -92,20 +150,28 @@ async def async_setup_entry(
     )
 
     # Peripherals Sensors
-    if device_type == "f1":
+    profile: DeviceProfile = store["profile"]
+    if profile.exhaust_via_purifier:
         # F1: the device reports "fan" via ext_purifier_state -> show it as Exhaust Fan State
         entities.append(XToolF1ExhaustFanStateViaPurifierSensor(coordinator, name, entry_id, device_type))
-        # F1: explicitly no AirAssist sensor (and you said no drawer etc. handled elsewhere)
     else:
-        entities.extend(
-            [
-                XToolFanStateSensor(coordinator, name, entry_id, device_type),
-                XToolExtPurifierStateSensor(coordinator, name, entry_id, device_type),
-                XToolAirAssistSensor(coordinator, name, entry_id, device_type),
-            ]
-        )
+        # Accessories are added once the device reports them as connected
+        accessories = {
+            "ext_purifier": lambda: XToolExtPurifierStateSensor(
+                coordinator, name, entry_id, device_type
+            ),
+        }
+        if profile.has_exhaust_fan:
+            accessories["smoking_fan"] = lambda: XToolFanStateSensor(
+                coordinator, name, entry_id, device_type
+            )
+        if profile.has_airassist:
+            accessories["airassist"] = lambda: XToolAirAssistSensor(
+                coordinator, name, entry_id, device_type
+            )
+        async_add_accessory_entities(entry, coordinator, accessories, async_add_entities)
 
-    if device_type == "m1":
+    if profile.legacy_status:
         entities.extend(
             [
                 XToolLegacyWaterTempSensor(coordinator, name, entry_id, device_type),
@@ -113,7 +179,7 @@ async def async_setup_entry(
             ]
         )
 
-    if device_type in ("m1u", "m1 ultra"):
+    if profile.module_entities:
         entities.extend(
             [
                 XToolBasicCarriageSensor(coordinator, name, entry_id, device_type),
@@ -122,7 +188,7 @@ async def async_setup_entry(
             ]
         )
 
-    async_add_entities(entities, True)
+    async_add_entities(entities)
 
 
 class _BaseSensor(CoordinatorEntity, SensorEntity):
@@ -135,6 +201,9 @@ class _BaseSensor(CoordinatorEntity, SensorEntity):
         self._device_name = name
         self._entry_id = entry_id
         self._device_type = device_type
+        self._snapshot: dict[str, Any] = {}
+        self._snapshot_unavailable = False
+        self._take_snapshot()
 
     @property
     def device_info(self) -> dict[str, Any]:
@@ -145,11 +214,196 @@ class _BaseSensor(CoordinatorEntity, SensorEntity):
             "model": self._device_type.upper(),
         }
 
+    def _take_snapshot(self) -> None:
+        self._snapshot = self.coordinator.data or {}
+        self._snapshot_unavailable = bool(self._snapshot.get("_unavailable"))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # Resolve data and availability once per update, not per property read
+        self._take_snapshot()
+        super()._handle_coordinator_update()
+
     def _data(self) -> dict[str, Any]:
-        return self.coordinator.data or {}
+        return self._snapshot
 
     def _unavailable(self) -> bool:
-        return bool(self._data().get("_unavailable"))
+        return self._snapshot_unavailable
+
+
+# --- Job history (all devices) ---
+class _JobHistorySensor(_BaseSensor):
+    """Base class for sensors backed by the persistent job history."""
+
+    def __init__(
+        self,
+        coordinator,
+        name: str,
+        entry_id: str,
+        device_type: str,
+        history: XToolJobHistory,
+    ) -> None:
+        super().__init__(coordinator, name, entry_id, device_type)
+        self._history = history
+
+    @property
+    def available(self) -> bool:
+        # The history is local data and stays valid while the device is offline
+        return True
+
+
+class XToolJobCountSensor(_JobHistorySensor):
+    _attr_icon = "mdi:history"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, coordinator, name, entry_id, device_type, history):
+        super().__init__(coordinator, name, entry_id, device_type, history)
+        self._attr_name = "Logged Jobs"
+        self._attr_unique_id = f"{entry_id}_job_history_count"
+
+    @property
+    def native_value(self) -> int:
+        return self._history.count
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {
+            "results": dict(self._history.stats["results"]),
+            "last_job": self._history.last_job,
+        }
+
+
+class XToolJobTimeTotalSensor(_JobHistorySensor):
+    _attr_icon = "mdi:timer-sand-complete"
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, coordinator, name, entry_id, device_type, history):
+        super().__init__(coordinator, name, entry_id, device_type, history)
+        self._attr_name = "Total Job Time"
+        self._attr_unique_id = f"{entry_id}_job_history_time_total"
+
+    @property
+    def native_value(self) -> float:
+        return round(self._history.duration_total_s / 3600.0, 2)
+
+
+class XToolJobDurationMeanSensor(_JobHistorySensor):
+    _attr_icon = "mdi:timer-outline"
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, name, entry_id, device_type, history):
+        super().__init__(coordinator, name, entry_id, device_type, history)
+        self._attr_name = "Average Job Duration"
+        self._attr_unique_id = f"{entry_id}_job_history_duration_mean"
+
+    @property
+    def native_value(self) -> float | None:
+        mean = self._history.duration_mean_s
+        return round(mean / 60.0, 1) if mean is not None else None
+
+
+class XToolJobFailureRateSensor(_JobHistorySensor):
+    _attr_icon = "mdi:alert-circle-outline"
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, name, entry_id, device_type, history):
+        super().__init__(coordinator, name, entry_id, device_type, history)
+        self._attr_name = "Job Failure Rate"
+        self._attr_unique_id = f"{entry_id}_job_history_failure_rate"
+
+    @property
+    def native_value(self) -> float | None:
+        rate = self._history.failure_rate
+        return round(rate, 1) if rate is not None else None
+
+
+class XToolJobsTodaySensor(_JobHistorySensor):
+    _attr_icon = "mdi:calendar-today"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, coordinator, name, entry_id, device_type, history):
+        super().__init__(coordinator, name, entry_id, device_type, history)
+        self._attr_name = "Jobs Today"
+        self._attr_unique_id = f"{entry_id}_job_history_jobs_today"
+
+    @property
+    def native_value(self) -> int:
+        return int(self._history.day_totals()["count"])
+
+
+class XToolJobTimeTodaySensor(_JobHistorySensor):
+    _attr_icon = "mdi:calendar-clock"
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, coordinator, name, entry_id, device_type, history):
+        super().__init__(coordinator, name, entry_id, device_type, history)
+        self._attr_name = "Job Time Today"
+        self._attr_unique_id = f"{entry_id}_job_history_time_today"
+
+    @property
+    def native_value(self) -> float:
+        return round(float(self._history.day_totals()["duration_s"]) / 60.0, 1)
+
+
+# --- Job ETA (D1, P2/F1/M1/M1U) ---
+class _JobEtaSensor(_BaseSensor):
+    """Base class for sensors backed by the progress-based ETA estimator."""
+
+    def __init__(
+        self,
+        coordinator,
+        name: str,
+        entry_id: str,
+        device_type: str,
+        eta: XToolJobEta,
+    ) -> None:
+        super().__init__(coordinator, name, entry_id, device_type)
+        self._eta = eta
+
+    @property
+    def available(self) -> bool:
+        return super().available and not self._unavailable()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {"progress": self._eta.progress}
+
+
+class XToolJobTimeRemainingSensor(_JobEtaSensor):
+    _attr_icon = "mdi:timer-sand"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+
+    def __init__(self, coordinator, name: str, entry_id: str, device_type: str, eta) -> None:
+        super().__init__(coordinator, name, entry_id, device_type, eta)
+        self._attr_name = "Time Remaining"
+        self._attr_unique_id = f"{entry_id}_job_time_remaining"
+
+    @property
+    def native_value(self) -> float | None:
+        s = self._eta.remaining_s
+        return round(s / 60.0, 1) if s is not None else None
+
+
+class XToolJobFinishSensor(_JobEtaSensor):
+    _attr_icon = "mdi:flag-checkered"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    def __init__(self, coordinator, name: str, entry_id: str, device_type: str, eta) -> None:
+        super().__init__(coordinator, name, entry_id, device_type, eta)
+        self._attr_name = "Estimated Finish"
+        self._attr_unique_id = f"{entry_id}_job_estimated_finish"
+
+    @property
+    def native_value(self) -> datetime | None:
+        ts = self._eta.finish_ts
+        # Whole seconds: avoids a state write for every sub-second estimate change
+        return dt_util.utc_from_timestamp(round(ts)) if ts is not None else None
+
 
 class XToolF1V2StatusSensor(_BaseSensor):
     _attr_icon = "mdi:laser-pointer"
@@ -326,6 +580,71 @@ class D1MachineTypeSensor(_BaseSensor):
         return self._data().get("machine_type")
 
 
+class _D1UploadSensor(_BaseSensor):
+    """Base class for sensors fed by the D1 job uploader."""
+
+    def __init__(
+        self,
+        coordinator,
+        name: str,
+        entry_id: str,
+        device_type: str,
+        uploader: XToolD1Uploader,
+    ) -> None:
+        super().__init__(coordinator, name, entry_id, device_type)
+        self._uploader = uploader
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self._uploader.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def available(self) -> bool:
+        # Upload results stay readable while the D1 is offline
+        return True
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {
+            "state": self._uploader.state,
+            "file": self._uploader.filename,
+            "bytes_sent": self._uploader.sent,
+            "bytes_total": self._uploader.total,
+            "error": self._uploader.error,
+        }
+
+
+class D1UploadProgressSensor(_D1UploadSensor):
+    _attr_icon = "mdi:upload"
+    _attr_native_unit_of_measurement = PERCENTAGE
+
+    def __init__(self, coordinator, name: str, entry_id: str, device_type: str, uploader) -> None:
+        super().__init__(coordinator, name, entry_id, device_type, uploader)
+        self._attr_name = "Upload Progress"
+        self._attr_unique_id = f"{entry_id}_d1_upload_progress"
+
+    @property
+    def native_value(self) -> float | None:
+        pct = self._uploader.progress
+        return round(pct, 1) if pct is not None else None
+
+
+class D1UploadThroughputSensor(_D1UploadSensor):
+    _attr_icon = "mdi:speedometer"
+    _attr_device_class = SensorDeviceClass.DATA_RATE
+    _attr_native_unit_of_measurement = UnitOfDataRate.KIBIBYTES_PER_SECOND
+
+    def __init__(self, coordinator, name: str, entry_id: str, device_type: str, uploader) -> None:
+        super().__init__(coordinator, name, entry_id, device_type, uploader)
+        self._attr_name = "Upload Throughput"
+        self._attr_unique_id = f"{entry_id}_d1_upload_throughput"
+
+    @property
+    def native_value(self) -> float | None:
+        rate = self._uploader.throughput
+        return round(rate / 1024, 1) if rate is not None else None
+
+
 # --- P2/F1/M1/M1U ---
 class XToolWorkStateSensor(_BaseSensor):
     _attr_icon = "mdi:laser-pointer"
@@ -335,47 +654,12 @@ class XToolWorkStateSensor(_BaseSensor):
         self._attr_name = "Status"
         self._attr_unique_id = f"{entry_id}_status"
 
-    def _map_mode(self, mode: str) -> str:
-        mapping = {
-            "P_ERROR": "Error",
-            "WORK": "Running",
-            "P_WORK": "Running",
-            "P_WORKING": "Running",
-            "P_WORK_DONE": "Done",
-            "P_FINISH": "Done",
-            "P_IDLE": "Idle",
-            "P_SLEEP": "Sleep",
-            "P_ONLINE_READY_WORK": "Ready",
-            "P_OFFLINE_READY_WORK": "Ready",
-            "P_READY": "Ready",
-            "P_MEASURE": "Measuring",
-        }
-        return mapping.get(mode, "Unknown")
-
-    def _map_status(self, status: str) -> str:
-        mapping = {
-            "P_ONLINE_READY_WORK": "Ready",
-            "P_OFFLINE_READY_WORK": "Ready",
-            "P_WORK_DONE": "Done",
-            "P_IDLE": "Idle",
-            "P_SLEEP": "Sleep",
-            "P_MEASURE": "Measuring",
-            "P_ERROR": "Error",
-        }
-        return mapping.get(status, self._map_mode(status))
-
     @property
     def native_value(self) -> str:
-        d = self._data()
-        if d.get("_unavailable"):
+        if self._unavailable():
             return "Unavailable"
-        if self._device_type == "m1":
-            legacy = d.get("legacy") if isinstance(d.get("legacy"), dict) else {}
-            status = str(legacy.get("STATUS", "")).strip().upper()
-            if status:
-                return self._map_status(status)
-        raw = str(d.get("work_state_raw") or "").strip().upper()
-        return self._map_mode(raw) if raw else "Unknown"
+        # Mapped by the coordinator (legacy /status on the M1)
+        return self._data().get("display_status") or "Unknown"
 
 
 class XToolCpuTempSensor(_BaseSensor):
@@ -419,6 +703,10 @@ class XToolJobsSensor(_BaseSensor):
     _attr_icon = "mdi:counter"
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
 
+    # Long-term history is imported as external statistics (xtool:<entry>_*),
+    # so the per-tick states are not recorded unless the user enables this entity.
+    _attr_entity_registry_enabled_default = False
+
     def __init__(self, coordinator, name: str, entry_id: str, device_type: str) -> None:
         super().__init__(coordinator, name, entry_id, device_type)
         self._attr_name = "Jobs"
@@ -426,13 +714,9 @@ class XToolJobsSensor(_BaseSensor):
 
     @property
     def native_value(self) -> Any:
-        d = self._data()
         if self._unavailable():
             return None
-        wi = d.get("working_info")
-        if isinstance(wi, dict) and isinstance(wi.get("data"), dict):
-            return wi["data"].get("numOnlineWorking")
-        return None
+        return self._data().get("jobs_total")
 
 
 class XToolSystemRuntimeSensor(_BaseSensor):
@@ -440,6 +724,10 @@ class XToolSystemRuntimeSensor(_BaseSensor):
     _attr_native_unit_of_measurement = UnitOfTime.HOURS
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
 
+    # Long-term history is imported as external statistics (xtool:<entry>_*),
+    # so the per-tick states are not recorded unless the user enables this entity.
+    _attr_entity_registry_enabled_default = False
+
     def __init__(self, coordinator, name: str, entry_id: str, device_type: str) -> None:
         super().__init__(coordinator, name, entry_id, device_type)
         self._attr_name = "System Runtime"
@@ -447,16 +735,9 @@ class XToolSystemRuntimeSensor(_BaseSensor):
 
     @property
     def native_value(self) -> Any:
-        d = self._data()
         if self._unavailable():
             return None
-        wi = d.get("working_info")
-        if isinstance(wi, dict) and isinstance(wi.get("data"), dict):
-            seconds = wi["data"].get("timeSystemWork")
-            if seconds is None:
-                return None
-            return round(float(seconds) / 3600.0, 2)
-        return None
+        return self._data().get("runtime_system_h")
 
 
 class XToolFanStateSensor(_BaseSensor):
@@ -680,7 +961,7 @@ class S1StatusSensor(_BaseSensor):
         if self._unavailable():
             return "Unavailable"
         raw = self._data().get("work_state_raw")
-        return XToolS1Coordinator.map_work_state(raw)
+        return self.coordinator.map_work_state(raw)
 
 
 class S1FirmwareSensor(_BaseSensor):
@@ -714,6 +995,27 @@ class S1JobFileSensor(_BaseSensor):
         return self._data().get("job_file")
 
 
+class S1DataAgeSensor(_BaseSensor):
+    """Seconds since the last WebSocket frame, as seen at the last poll."""
+
+    _attr_icon = "mdi:timer-alert-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, name: str, entry_id: str, device_type: str) -> None:
+        super().__init__(coordinator, name, entry_id, device_type)
+        self._attr_name = "Data Age"
+        self._attr_unique_id = f"{entry_id}_s1_data_age"
+
+    @property
+    def native_value(self) -> Any:
+        if self._unavailable():
+            return None
+        return self._data().get("data_age_s")
+
+
 class S1PositionXSensor(_BaseSensor):
     _attr_icon = "mdi:axis-x-arrow"
     _attr_native_unit_of_measurement = "mm"
@@ -926,3 +1228,44 @@ class S1FilterHepaSensor(_S1FilterSensor):
         super().__init__(coordinator, name, entry_id, device_type)
         self._attr_name = "High Efficiency Filter Remaining"
         self._attr_unique_id = f"{entry_id}_s1_filter_hepa"
+
+
+class S1FilterDaysRemainingSensor(_BaseSensor):
+    """Forecast of the days until an AP2 filter is used up."""
+
+    _attr_icon = "mdi:calendar-clock"
+    _attr_native_unit_of_measurement = UnitOfTime.DAYS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator,
+        name: str,
+        entry_id: str,
+        device_type: str,
+        forecast: XToolFilterForecast,
+        filter_key: str,
+    ) -> None:
+        super().__init__(coordinator, name, entry_id, device_type)
+        self._forecast = forecast
+        self._filter_key = filter_key
+        self._attr_name = f"{AP2_FILTERS[filter_key]} Days Remaining"
+        self._attr_unique_id = f"{entry_id}_s1_{filter_key}_days_remaining"
+
+    @property
+    def available(self) -> bool:
+        return self._forecast.days_remaining(self._filter_key) is not None
+
+    @property
+    def native_value(self) -> float | None:
+        days = self._forecast.days_remaining(self._filter_key)
+        return round(days, 1) if days is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        hours = self._forecast.hours_remaining(self._filter_key)
+        rate = self._forecast.job_hours_per_day()
+        return {
+            "job_hours_remaining": round(hours, 1) if hours is not None else None,
+            "job_hours_per_day": round(rate, 2) if rate is not None else None,
+        }
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    SERVICE_GET_JOB_HISTORY,
+    SERVICE_GET_TELEMETRY,
+    SERVICE_GET_TIMELAPSE,
+    SERVICE_UPLOAD_JOB,
+    ATTR_ENTRY_ID,
+    ATTR_LIMIT,
+    ATTR_SINCE,
+    ATTR_START,
+    ATTR_END,
+    ATTR_FIELDS,
+    ATTR_MAX_POINTS,
+    ATTR_JOB,
+    ATTR_STREAM,
+    ATTR_ASSEMBLE,
+    ATTR_PATH,
+    TELEMETRY_FIELDS,
+    TIMELAPSE_STREAMS,
+)
+from .job_history import MAX_JOBS
+
+GET_JOB_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_LIMIT, default=20): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_JOBS)
+        ),
+        vol.Optional(ATTR_SINCE): cv.datetime,
+    }
+)
+
+GET_TELEMETRY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_FIELDS): vol.All(
+            cv.ensure_list, [vol.In(TELEMETRY_FIELDS)]
+        ),
+        vol.Optional(ATTR_MAX_POINTS, default=300): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=5000)
+        ),
+    }
+)
+
+GET_TIMELAPSE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_JOB): cv.string,
+        vol.Optional(ATTR_STREAM, default=0): vol.All(
+            vol.Coerce(int), vol.In(TIMELAPSE_STREAMS)
+        ),
+        vol.Optional(ATTR_ASSEMBLE, default=False): cv.boolean,
+    }
+)
+
+UPLOAD_JOB_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): cv.string,
+        vol.Required(ATTR_PATH): cv.string,
+    }
+)
+
+
+def _entry_store(hass: HomeAssistant, entry_id: str) -> dict[str, Any]:
+    """Return the runtime store of a loaded xTool config entry."""
+    store = hass.data.get(DOMAIN, {}).get(entry_id)
+    if not store:
+        raise ServiceValidationError(f"xTool config entry {entry_id} is not loaded")
+    return store
+
+
+def _iso(ts: float | None) -> str | None:
+    if ts is None:
+        return None
+    return dt_util.utc_from_timestamp(ts).isoformat()
+
+
+async def _async_get_job_history(call: ServiceCall) -> ServiceResponse:
+    store = _entry_store(call.hass, call.data[ATTR_ENTRY_ID])
+    history = store["job_history"]
+
+    since = call.data.get(ATTR_SINCE)
+    since_ts = dt_util.as_utc(since).timestamp() if since else None
+
+    jobs = [
+        {**job, "start": _iso(job["start"]), "end": _iso(job["end"])}
+        for job in history.query(call.data[ATTR_LIMIT], since_ts)
+    ]
+    return {"stats": history.summary(), "jobs": jobs}
+
+
+async def _async_get_telemetry(call: ServiceCall) -> ServiceResponse:
+    store = _entry_store(call.hass, call.data[ATTR_ENTRY_ID])
+    telemetry = store.get("telemetry")
+    if telemetry is None:
+        raise ServiceValidationError("Telemetry is only recorded for the S1")
+
+    end = call.data.get(ATTR_END) or dt_util.utcnow()
+    start = call.data.get(ATTR_START) or end - timedelta(hours=1)
+    start_ts = dt_util.as_utc(start).timestamp()
+    end_ts = dt_util.as_utc(end).timestamp()
+    if end_ts <= start_ts:
+        raise ServiceValidationError("'end' must be after 'start'")
+
+    result = await telemetry.async_query(
+        start_ts, end_ts, call.data[ATTR_MAX_POINTS], call.data.get(ATTR_FIELDS)
+    )
+    return {"start": _iso(start_ts), "end": _iso(end_ts), **result}
+
+
+async def _async_get_timelapse(call: ServiceCall) -> ServiceResponse:
+    store = _entry_store(call.hass, call.data[ATTR_ENTRY_ID])
+    timelapse = store.get("timelapse")
+    if timelapse is None:
+        raise ServiceValidationError("Timelapse is only recorded for the P2 cameras")
+
+    result = await timelapse.async_get_frames(
+        call.data.get(ATTR_JOB), call.data[ATTR_STREAM], call.data[ATTR_ASSEMBLE]
+    )
+    if result is None:
+        raise ServiceValidationError("No recorded timelapse found for this job")
+
+    result["start"] = _iso(float(result["job"]))
+    result["jobs"] = await timelapse.async_list_jobs()
+    return result
+
+
+async def _async_upload_job(call: ServiceCall) -> ServiceResponse:
+    store = _entry_store(call.hass, call.data[ATTR_ENTRY_ID])
+    uploader = store.get("uploader")
+    if uploader is None:
+        raise ServiceValidationError("Job upload is only supported for the D1")
+
+    result = await uploader.async_upload(call.data[ATTR_PATH])
+    return result if call.return_response else None
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration-wide services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_JOB_HISTORY,
+        _async_get_job_history,
+        schema=GET_JOB_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TELEMETRY,
+        _async_get_telemetry,
+        schema=GET_TELEMETRY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TIMELAPSE,
+        _async_get_timelapse,
+        schema=GET_TIMELAPSE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UPLOAD_JOB,
+        _async_upload_job,
+        schema=UPLOAD_JOB_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -8,7 +8,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .accessories import async_add_accessory_entities
 from .const import DOMAIN, MANUFACTURER
+from .profiles import DeviceProfile
 
 
 async def async_setup_entry(
@@ -23,19 +25,22 @@ async def async_setup_entry(
     entry_id: str = store["entry_id"]
     device_type: str = store.get("device_type", "").lower()
 
-    entities: list[SwitchEntity] = []
-
-    # D1 and S1 have their own API stacks -> no v2 peripheral switches here
-    if device_type in ("d1", "s1", "f1_v2"):
-        async_add_entities(entities, True)
-        return
-
-    # F1: no exhaust fan control 
-    # M1 Ultra: keep as-is (it supports peripherals)
-    if device_type != "f1":
-        entities.append(XToolExhaustFanSwitch(coordinator, name, entry_id, device_type))
-
-    async_add_entities(entities, True)
+    profile: DeviceProfile = store["profile"]
+
+    # Exhaust fan control where the model has /peripheral/smoking_fan
+    # (not on F1; D1/S1/F1 V2 have their own API stacks). Added once the
+    # fan is reported as connected.
+    if profile.has_exhaust_fan:
+        async_add_accessory_entities(
+            entry,
+            coordinator,
+            {
+                "smoking_fan": lambda: XToolExhaustFanSwitch(
+                    coordinator, name, entry_id, device_type
+                )
+            },
+            async_add_entities,
+        )
 
 
 class XToolExhaustFanSwitch(CoordinatorEntity, SwitchEntity):
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+from array import array
+from datetime import timedelta
+import logging
+import math
+import os
+import struct
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import slugify
+
+from .const import DOMAIN, S1_RUNNING_STATES, TELEMETRY_FIELDS as FIELDS
+
+_LOGGER = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL = timedelta(seconds=1)
+CAPACITY = 3600  # one hour of 1 Hz samples kept in memory (~230 kB)
+SPILL_EVERY = 300  # records appended to the job file per write
+MAX_JOB_FILES = 50
+
+_MAGIC = b"XTT1"
+# <timestamp float64><one float32 per field>, NaN = value unknown
+_RECORD = struct.Struct("<d" + "f" * len(FIELDS))
+_NAMES_LEN = struct.Struct("<H")
+_STRIDE = 1 + len(FIELDS)
+_NAN = float("nan")
+
+
+def _header() -> bytes:
+    names = ",".join(FIELDS).encode("ascii")
+    return _MAGIC + _NAMES_LEN.pack(len(names)) + names
+
+
+def _read_records(path: str) -> list[tuple[float, ...]]:
+    """Read all records of a spill file (empty list for foreign/corrupt files)."""
+    with open(path, "rb") as fh:
+        raw = fh.read()
+    if raw[:4] != _MAGIC:
+        return []
+    (names_len,) = _NAMES_LEN.unpack_from(raw, 4)
+    offset = 4 + _NAMES_LEN.size + names_len
+    if tuple(raw[4 + _NAMES_LEN.size : offset].decode("ascii").split(",")) != FIELDS:
+        return []
+    body = raw[offset:]
+    usable = len(body) - len(body) % _RECORD.size
+    return list(_RECORD.iter_unpack(body[:usable]))
+
+
+def downsample(
+    records: list[tuple[float, ...]],
+    start: float,
+    end: float,
+    max_points: int,
+    field_idx: list[int],
+) -> dict[str, Any]:
+    """Average records into at most `max_points` equally sized time buckets."""
+    if not records:
+        return {"t": [], "series": {FIELDS[i]: [] for i in field_idx}}
+
+    width = max((end - start) / max_points, SAMPLE_INTERVAL.total_seconds())
+    buckets: dict[int, list[Any]] = {}
+    for rec in records:
+        b = int((rec[0] - start) // width)
+        acc = buckets.get(b)
+        if acc is None:
+            # [time sum, count, per-field sums, per-field counts]
+            acc = buckets[b] = [0.0, 0, [0.0] * len(field_idx), [0] * len(field_idx)]
+        acc[0] += rec[0]
+        acc[1] += 1
+        for j, i in enumerate(field_idx):
+            v = rec[1 + i]
+            if not math.isnan(v):
+                acc[2][j] += v
+                acc[3][j] += 1
+
+    t: list[float] = []
+    series: dict[str, list[float | None]] = {FIELDS[i]: [] for i in field_idx}
+    for b in sorted(buckets):
+        acc = buckets[b]
+        t.append(round(acc[0] / acc[1], 3))
+        for j, i in enumerate(field_idx):
+            n = acc[3][j]
+            series[FIELDS[i]].append(round(acc[2][j] / n, 3) if n else None)
+    return {"t": t, "series": series}
+
+
+class XToolTelemetryBuffer:
+    """Fixed-memory 1 Hz telemetry ring for one S1, spilled to a file per job.
+
+    Sampling only runs while a job is active; the coordinator's scheduler
+    refreshes the head position at the same rate. Records live in a flat
+    preallocated float array; completed chunks are appended to a compact
+    binary file so a job can be analysed after it left the ring.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self.hass = hass
+        self._dir = hass.config.path(DOMAIN, "telemetry", slugify(entry_id))
+
+        self._ring = array("d", [_NAN]) * (CAPACITY * _STRIDE)
+        self._head = 0  # next write slot
+        self._size = 0
+        self._unspilled = 0
+
+        self._coordinator: DataUpdateCoordinator | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+        self._unsub_sample: CALLBACK_TYPE | None = None
+        self._job_file: str | None = None
+        self._files: list[tuple[str, float, float]] = []  # (path, first, last)
+
+    async def async_attach(self, coordinator: DataUpdateCoordinator) -> None:
+        self._files = await self.hass.async_add_executor_job(self._scan_files)
+        self._coordinator = coordinator
+        self._unsub = coordinator.async_add_listener(self._handle_coordinator_update)
+
+    async def async_detach(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        await self._async_stop_job()
+
+    # ---- sampling ----
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        data = self._coordinator.data if self._coordinator else None
+        running = bool(data) and data.get("work_state_raw") in S1_RUNNING_STATES
+        if running and self._unsub_sample is None:
+            self._start_job()
+        elif not running and self._unsub_sample is not None:
+            self.hass.async_create_task(self._async_stop_job())
+
+    def _start_job(self) -> None:
+        now = time.time()
+        self._job_file = os.path.join(self._dir, f"{int(now)}.bin")
+        self._unspilled = 0
+        self._unsub_sample = async_track_time_interval(
+            self.hass, self._async_sample, SAMPLE_INTERVAL
+        )
+        _LOGGER.debug("S1 telemetry sampling started (%s)", self._job_file)
+
+    async def _async_stop_job(self) -> None:
+        if self._unsub_sample is None:
+            return
+        self._unsub_sample()
+        self._unsub_sample = None
+        await self._async_spill()
+        self._job_file = None
+
+    async def _async_sample(self, _now: Any = None) -> None:
+        api = getattr(self._coordinator, "api", None)
+        if api is None:
+            return
+        state = api.state
+        if state.get("_unavailable"):
+            return
+
+        base = self._head * _STRIDE
+        ring = self._ring
+        ring[base] = time.time()
+        for i, field in enumerate(FIELDS, start=1):
+            v = state.get(field)
+            ring[base + i] = float(v) if isinstance(v, (int, float)) else _NAN
+
+        self._head = (self._head + 1) % CAPACITY
+        if self._size < CAPACITY:
+            self._size += 1
+        self._unspilled = min(self._unspilled + 1, CAPACITY)
+
+        if self._unspilled >= SPILL_EVERY:
+            await self._async_spill()
+
+    def _records(self, count: int) -> list[tuple[float, ...]]:
+        """Return the newest `count` records, oldest first."""
+        count = min(count, self._size)
+        out: list[tuple[float, ...]] = []
+        ring = self._ring
+        for k in range(count):
+            slot = (self._head - count + k) % CAPACITY
+            base = slot * _STRIDE
+            out.append(tuple(ring[base : base + _STRIDE]))
+        return out
+
+    # ---- spill files ----
+
+    async def _async_spill(self) -> None:
+        if not self._unspilled or not self._job_file:
+            return
+        records = self._records(self._unspilled)
+        self._unspilled = 0
+        blob = b"".join(_RECORD.pack(*rec) for rec in records)
+        path = self._job_file
+        await self.hass.async_add_executor_job(self._append, path, blob)
+
+        first = records[0][0]
+        last = records[-1][0]
+        if self._files and self._files[-1][0] == path:
+            self._files[-1] = (path, self._files[-1][1], last)
+        else:
+            self._files.append((path, first, last))
+            if len(self._files) > MAX_JOB_FILES:
+                stale = self._files[: len(self._files) - MAX_JOB_FILES]
+                del self._files[: len(stale)]
+                await self.hass.async_add_executor_job(
+                    self._remove, [p for p, _f, _l in stale]
+                )
+
+    def _append(self, path: str, blob: bytes) -> None:
+        os.makedirs(self._dir, exist_ok=True)
+        new = not os.path.exists(path)
+        with open(path, "ab") as fh:
+            if new:
+                fh.write(_header())
+            fh.write(blob)
+
+    @staticmethod
+    def _remove(paths: list[str]) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _scan_files(self) -> list[tuple[str, float, float]]:
+        if not os.path.isdir(self._dir):
+            return []
+        out: list[tuple[str, float, float]] = []
+        for fname in sorted(os.listdir(self._dir)):
+            if not fname.endswith(".bin"):
+                continue
+            path = os.path.join(self._dir, fname)
+            try:
+                records = _read_records(path)
+            except (OSError, struct.error, UnicodeDecodeError):
+                continue
+            if records:
+                out.append((path, records[0][0], records[-1][0]))
+        return out[-MAX_JOB_FILES:]
+
+    # ---- query ----
+
+    async def async_query(
+        self,
+        start: float,
+        end: float,
+        max_points: int,
+        fields: list[str] | None = None,
+    ) -> dict[str, Any]:
+        field_idx = [FIELDS.index(f) for f in (fields or FIELDS)]
+
+        # Oldest sample still in memory; everything before comes from files
+        ring = self._records(self._size)
+        in_ring = [r for r in ring if start <= r[0] <= end]
+        ring_first = ring[0][0] if ring else math.inf
+
+        paths = [p for p, first, last in self._files if last >= start and first <= end]
+
+        def _load() -> list[tuple[float, ...]]:
+            out: list[tuple[float, ...]] = []
+            for path in paths:
+                try:
+                    out.extend(
+                        r
+                        for r in _read_records(path)
+                        if start <= r[0] <= end and r[0] < ring_first
+                    )
+                except (OSError, struct.error, UnicodeDecodeError):
+                    continue
+            return out
+
+        records = await self.hass.async_add_executor_job(_load) if paths else []
+        records.extend(in_ring)
+        records.sort(key=lambda r: r[0])
+
+        result = downsample(records, start, end, max_points, field_idx)
+        result["samples"] = len(records)
+        return result
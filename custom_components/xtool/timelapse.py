@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import time
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import slugify
+
+from .const import DOMAIN, TIMELAPSE_STREAMS as STREAMS, V2_ACTIVE_MODES
+
+_LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_PORT = 8329
+
+# Capture interval adapts to the scene: back off while frames stay identical,
+# return to the fast rate as soon as something changes.
+MIN_INTERVAL = 5.0
+MAX_INTERVAL = 60.0
+SNAPSHOT_TIMEOUT = 5
+
+MAX_FRAMES_PER_STREAM = 720  # per job; the oldest frames are overwritten
+MAX_JOBS = 10
+
+
+def _frame_name(stream: int, ts: float) -> str:
+    return f"s{stream}_{int(ts * 1000)}.jpg"
+
+
+def _parse_frame_name(fname: str) -> tuple[int, float] | None:
+    if not (fname.startswith("s") and fname.endswith(".jpg")):
+        return None
+    try:
+        stream, ms = fname[1:-4].split("_", 1)
+        return int(stream), int(ms) / 1000
+    except ValueError:
+        return None
+
+
+class XToolTimelapseRecorder:
+    """Job-scoped snapshot recorder for both P2 cameras.
+
+    Capture only runs while the coordinator reports a working mode, so an idle
+    machine sees no additional requests. Every job gets its own directory that
+    holds at most MAX_FRAMES_PER_STREAM frames per camera.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, ip_address: str) -> None:
+        self.hass = hass
+        self._ip = ip_address
+        self._dir = hass.config.path(DOMAIN, "timelapse", slugify(entry_id))
+
+        self._coordinator: DataUpdateCoordinator | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+        self._unsub_capture: CALLBACK_TYPE | None = None
+
+        self._job_dir: str | None = None
+        self._interval = MIN_INTERVAL
+        self._last_hash: dict[int, str] = {}
+        self._frames: dict[int, list[str]] = {}
+        self._capture_task: asyncio.Task | None = None
+
+    @callback
+    def async_attach(self, coordinator: DataUpdateCoordinator) -> None:
+        self._coordinator = coordinator
+        self._unsub = coordinator.async_add_listener(self._handle_coordinator_update)
+
+    async def async_detach(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        self._stop_job()
+        if self._capture_task:
+            await asyncio.gather(self._capture_task, return_exceptions=True)
+
+    @property
+    def recording(self) -> bool:
+        return self._job_dir is not None
+
+    # ---- job tracking ----
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        data = self._coordinator.data if self._coordinator else None
+        active = (
+            bool(data)
+            and not data.get("_unavailable")
+            and str(data.get("work_state_raw") or "").upper() in V2_ACTIVE_MODES
+        )
+        if active and self._job_dir is None:
+            self._start_job()
+        elif not active and self._job_dir is not None:
+            self._stop_job()
+
+    def _start_job(self) -> None:
+        self._job_dir = os.path.join(self._dir, str(int(time.time())))
+        self._interval = MIN_INTERVAL
+        self._last_hash = {}
+        self._frames = {stream: [] for stream in STREAMS}
+        _LOGGER.debug("XTool timelapse started (%s)", self._job_dir)
+        self.hass.async_create_task(self._async_start_job(self._job_dir))
+
+    async def _async_start_job(self, job_dir: str) -> None:
+        try:
+            await self.hass.async_add_executor_job(self._prepare_job_dir, job_dir)
+        except OSError as err:
+            _LOGGER.warning("Timelapse directory %s not prepared: %s", job_dir, err)
+        if self._job_dir == job_dir:
+            self._schedule(0)
+
+    def _stop_job(self) -> None:
+        if self._unsub_capture:
+            self._unsub_capture()
+            self._unsub_capture = None
+        if self._job_dir is not None:
+            _LOGGER.debug("XTool timelapse stopped (%s)", self._job_dir)
+        self._job_dir = None
+
+    def _schedule(self, delay: float) -> None:
+        self._unsub_capture = async_call_later(self.hass, delay, self._capture_cb)
+
+    @callback
+    def _capture_cb(self, _now: Any) -> None:
+        self._unsub_capture = None
+        if self._job_dir is None:
+            return
+        self._capture_task = self.hass.async_create_task(self._async_capture(self._job_dir))
+
+    # ---- capture ----
+
+    async def _async_capture(self, job_dir: str) -> None:
+        session = async_get_clientsession(self.hass)
+        images = await asyncio.gather(
+            *(self._async_fetch(session, stream) for stream in STREAMS)
+        )
+
+        now = time.time()
+        changed = False
+        writes: list[tuple[str, bytes]] = []
+        drops: list[str] = []
+        for stream, image in zip(STREAMS, images):
+            if not image:
+                continue
+            digest = hashlib.sha1(image).hexdigest()
+            if self._last_hash.get(stream) == digest:
+                continue
+            self._last_hash[stream] = digest
+            changed = True
+
+            name = _frame_name(stream, now)
+            frames = self._frames[stream]
+            frames.append(name)
+            writes.append((name, image))
+            if len(frames) > MAX_FRAMES_PER_STREAM:
+                drops.extend(frames[: len(frames) - MAX_FRAMES_PER_STREAM])
+                del frames[: len(frames) - MAX_FRAMES_PER_STREAM]
+
+        if writes or drops:
+            try:
+                await self.hass.async_add_executor_job(
+                    self._write_frames, job_dir, writes, drops
+                )
+            except OSError as err:
+                # Keep capturing: a full or read-only disk may recover mid-job
+                _LOGGER.warning("Timelapse frames not written to %s: %s", job_dir, err)
+
+        if changed:
+            self._interval = MIN_INTERVAL
+        else:
+            self._interval = min(self._interval * 2, MAX_INTERVAL)
+
+        if self._job_dir == job_dir:
+            self._schedule(self._interval)
+
+    async def _async_fetch(self, session: aiohttp.ClientSession, stream: int) -> bytes | None:
+        url = f"http://{self._ip}:{SNAPSHOT_PORT}/camera/snap?stream={stream}"
+        try:
+            async with session.get(
+                url, timeout=aiohttp.ClientTimeout(total=SNAPSHOT_TIMEOUT)
+            ) as resp:
+                resp.raise_for_status()
+                return await resp.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Timelapse snapshot failed (camera %s): %s", stream, err)
+            return None
+
+    # ---- disk ----
+
+    def _prepare_job_dir(self, job_dir: str) -> None:
+        os.makedirs(job_dir, exist_ok=True)
+        jobs = sorted(
+            (d for d in os.listdir(self._dir) if d.isdigit()), key=int
+        )
+        for stale in jobs[: max(0, len(jobs) - MAX_JOBS)]:
+            shutil.rmtree(os.path.join(self._dir, stale), ignore_errors=True)
+
+    @staticmethod
+    def _write_frames(job_dir: str, writes: list[tuple[str, bytes]], drops: list[str]) -> None:
+        for name, image in writes:
+            with open(os.path.join(job_dir, name), "wb") as fh:
+                fh.write(image)
+        for name in drops:
+            try:
+                os.remove(os.path.join(job_dir, name))
+            except OSError:
+                pass
+
+    # ---- query ----
+
+    def _list_jobs(self) -> list[dict[str, Any]]:
+        if not os.path.isdir(self._dir):
+            return []
+        out: list[dict[str, Any]] = []
+        for job in sorted((d for d in os.listdir(self._dir) if d.isdigit()), key=int):
+            path = os.path.join(self._dir, job)
+            counts = {stream: 0 for stream in STREAMS}
+            for fname in os.listdir(path):
+                parsed = _parse_frame_name(fname)
+                if parsed and parsed[0] in counts:
+                    counts[parsed[0]] += 1
+            out.append({"job": job, "start": int(job), "frames": counts})
+        return out
+
+    def _frames_of(self, job: str, stream: int) -> list[tuple[float, str]]:
+        path = os.path.join(self._dir, job)
+        frames: list[tuple[float, str]] = []
+        for fname in os.listdir(path):
+            parsed = _parse_frame_name(fname)
+            if parsed and parsed[0] == stream:
+                frames.append((parsed[1], os.path.join(path, fname)))
+        frames.sort()
+        return frames
+
+    def _assemble(self, job: str, stream: int) -> str:
+        """Concatenate the frames of one camera into a raw MJPEG file."""
+        out = os.path.join(self._dir, job, f"stream{stream}.mjpeg")
+        with open(out, "wb") as dst:
+            for _ts, path in self._frames_of(job, stream):
+                with open(path, "rb") as src:
+                    dst.write(src.read())
+        return out
+
+    async def async_list_jobs(self) -> list[dict[str, Any]]:
+        return await self.hass.async_add_executor_job(self._list_jobs)
+
+    async def async_get_frames(
+        self, job: str | None, stream: int, assemble: bool
+    ) -> dict[str, Any] | None:
+        """Return the frame sequence of a job (latest if `job` is None)."""
+        jobs = await self.async_list_jobs()
+        if job is None:
+            if not jobs:
+                return None
+            job = jobs[-1]["job"]
+        elif not any(j["job"] == job for j in jobs):
+            return None
+
+        frames = await self.hass.async_add_executor_job(self._frames_of, job, stream)
+        result: dict[str, Any] = {
+            "job": job,
+            "stream": stream,
+            "recording": self._job_dir is not None
+            and os.path.basename(self._job_dir) == job,
+            "frames": [{"t": ts, "path": path} for ts, path in frames],
+        }
+        if assemble and frames:
+            result["mjpeg"] = await self.hass.async_add_executor_job(
+                self._assemble, job, stream
+            )
+        return result
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientError
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+if TYPE_CHECKING:
+    from .api_d1 import XToolD1Api
+
+_LOGGER = logging.getLogger(__name__)
+
+CHUNK_SIZE = 256 * 1024
+# Listener (sensor) updates while uploading are limited to this rate
+NOTIFY_INTERVAL = 1.0
+
+ALLOWED_SUFFIXES = (".gcode", ".nc", ".gc", ".txt")
+
+STATE_IDLE = "idle"
+STATE_UPLOADING = "uploading"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+
+# Replies that confirm a stored job. The D1 has no file list or checksum query,
+# so anything else (including an empty body) counts as a failed upload.
+_OK_RESULTS = {"ok", "success", "succeed"}
+
+
+def _reply_ok(reply: Any) -> bool:
+    """Return True for the reply shapes the D1 sends after storing a job.
+
+    Plain text "ok"/"success", or JSON with such a "result"/"msg" value or a
+    zero "code".
+    """
+    if isinstance(reply, dict):
+        if "code" in reply:
+            return str(reply["code"]).strip() == "0"
+        reply = reply.get("result", reply.get("msg"))
+    return isinstance(reply, str) and reply.strip().lower() in _OK_RESULTS
+
+
+class XToolD1Uploader:
+    """Upload G-code files to a D1 without reading them into memory.
+
+    The file is read in CHUNK_SIZE blocks in the executor and handed to
+    aiohttp as an async iterator, so memory use stays constant regardless of
+    the file size. Progress and throughput are published to listeners.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: XToolD1Api) -> None:
+        self.hass = hass
+        self._api = api
+        self._lock = asyncio.Lock()
+        self._listeners: list[Callable[[], None]] = []
+        self._last_notify = 0.0
+
+        self.state = STATE_IDLE
+        self.filename: str | None = None
+        self.total = 0
+        self.sent = 0
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.error: str | None = None
+
+    # ---- listeners ----
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        self._listeners.append(update_callback)
+
+        @callback
+        def _remove() -> None:
+            self._listeners.remove(update_callback)
+
+        return _remove
+
+    def _notify(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_notify < NOTIFY_INTERVAL:
+            return
+        self._last_notify = now
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    # ---- derived values ----
+
+    @property
+    def progress(self) -> float | None:
+        if not self.total:
+            return None
+        return 100.0 * self.sent / self.total
+
+    @property
+    def throughput(self) -> float | None:
+        """Average upload rate in bytes per second."""
+        if self.started is None:
+            return None
+        elapsed = (self.finished or time.monotonic()) - self.started
+        return self.sent / elapsed if elapsed > 0 else None
+
+    # ---- upload ----
+
+    def validate_path(self, path: str) -> str:
+        """Resolve `path` and make sure it is an allowed media/config file."""
+        path = os.path.realpath(path)
+        roots = [self.hass.config.config_dir, *self.hass.config.media_dirs.values()]
+        if not any(
+            os.path.commonpath([path, os.path.realpath(root)]) == os.path.realpath(root)
+            for root in roots
+        ):
+            raise ServiceValidationError(
+                f"{path} is not inside the config or a media directory"
+            )
+        if not self.hass.config.is_allowed_path(path):
+            raise ServiceValidationError(f"Access to {path} is not allowed")
+        if not path.lower().endswith(ALLOWED_SUFFIXES):
+            raise ServiceValidationError(f"{path} is not a G-code file")
+        return path
+
+    async def _read_chunks(self, path: str) -> AsyncIterator[bytes]:
+        fh = await self.hass.async_add_executor_job(open, path, "rb")
+        try:
+            while chunk := await self.hass.async_add_executor_job(fh.read, CHUNK_SIZE):
+                self.sent += len(chunk)
+                self._notify()
+                yield chunk
+        finally:
+            await self.hass.async_add_executor_job(fh.close)
+
+    async def async_upload(self, path: str) -> dict[str, Any]:
+        path = self.validate_path(path)
+        if self._lock.locked():
+            raise ServiceValidationError("Another upload to this D1 is still running")
+
+        async with self._lock:
+            try:
+                size = await self.hass.async_add_executor_job(os.path.getsize, path)
+            except OSError as err:
+                raise ServiceValidationError(f"Cannot read {path}: {err}") from err
+
+            self.state = STATE_UPLOADING
+            self.filename = os.path.basename(path)
+            self.total = size
+            self.sent = 0
+            self.error = None
+            self.started = time.monotonic()
+            self.finished = None
+            self._notify(force=True)
+            _LOGGER.debug("Uploading %s (%s bytes) to D1 %s", path, size, self._api.host)
+
+            try:
+                reply = await self._api.upload_job(self.filename, self._read_chunks(path))
+                if not _reply_ok(reply):
+                    raise HomeAssistantError(f"D1 did not confirm the upload: {reply!r}")
+            except (ClientError, asyncio.TimeoutError, OSError, HomeAssistantError) as err:
+                self.finished = time.monotonic()
+                self.state = STATE_FAILED
+                self.error = str(err)
+                self._notify(force=True)
+                if isinstance(err, HomeAssistantError):
+                    raise
+                raise HomeAssistantError(f"Upload to D1 failed: {err}") from err
+
+            self.finished = time.monotonic()
+            self.state = STATE_DONE
+            self._notify(force=True)
+
+        elapsed = self.finished - self.started
+        return {
+            "file": self.filename,
+            "bytes": self.sent,
+            "seconds": round(elapsed, 2),
+            "throughput_kib_s": round(self.sent / elapsed / 1024, 1) if elapsed > 0 else None,
+            "reply": reply,
+        }
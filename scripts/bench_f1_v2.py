@@ -0,0 +1,272 @@
+"""Drive XToolF1V2Coordinator against the local stand-in and report numbers.
+
+Starts ``f1_v2_standin.StandIn`` on a local port and points a real
+``XToolF1V2Coordinator`` at it (a bare ``HomeAssistant`` instance, no
+integration setup). Three runs:
+
+* burst: events/s through ``_parse_frame``/``_handle_event`` and the latency
+  from a frame reaching ``_parse_frame`` to ``async_set_updated_data``
+* drop: the stand-in closes the socket; time to ``_handle_disconnect``, to
+  the next connection and to its first event, and the state kept in between
+* mute: the stand-in stops answering pings; time until ``_heartbeat`` closes
+  the socket and ``_run`` reaches ``_handle_disconnect`` and reconnects
+
+Reconnect delay and heartbeat intervals are shortened for the run.
+
+    python scripts/bench_f1_v2.py --events 5000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import deque
+import logging
+from pathlib import Path
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any
+
+from aiohttp import web
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.xtool import coordinator_f1_v2  # noqa: E402
+from custom_components.xtool.coordinator_f1_v2 import XToolF1V2Coordinator  # noqa: E402
+from f1_v2_standin import DEFAULT_SCRIPT, StandIn, self_signed_context  # noqa: E402
+
+
+class Probe:
+    """Timestamps around one coordinator instance."""
+
+    def __init__(self, coordinator: XToolF1V2Coordinator) -> None:
+        self.coordinator = coordinator
+        self.frames = 0
+        self.handled = 0
+        self.handler_time = 0.0
+        self.first_frame: float | None = None
+        self.last_publish = 0.0
+        # Frame -> publish, for live events and for events held back until
+        # the connect snapshot was merged
+        self.latencies: list[float] = []
+        self.replay_latencies: list[float] = []
+        self._live = False
+        self.disconnects: list[tuple[float, dict[str, Any]]] = []
+        self.connects: list[float] = []
+        self.first_event_after: dict[int, float] = {}
+        self.heartbeat_closes: list[float] = []
+        self._rx: deque[float] = deque()
+
+        parse_frame = coordinator._parse_frame
+        handle_event = coordinator._handle_event
+        set_updated = coordinator.async_set_updated_data
+        handle_disconnect = coordinator._handle_disconnect
+        heartbeat = coordinator._heartbeat
+
+        def _parse_frame(raw: bytes) -> Any:
+            now = time.perf_counter()
+            if self.first_frame is None:
+                self.first_frame = now
+            self.frames += 1
+            self._rx.append(now)
+            self.first_event_after.setdefault(len(self.connects), now)
+            event = parse_frame(raw)
+            self.handler_time += time.perf_counter() - now
+            return event
+
+        def _handle_event(event: dict[str, Any]) -> None:
+            started = time.perf_counter()
+            self._live = True
+            try:
+                handle_event(event)
+            finally:
+                self._live = False
+            self.handled += 1
+            self.handler_time += time.perf_counter() - started
+
+        def _set_updated(data: dict[str, Any]) -> None:
+            now = time.perf_counter()
+            if data.get("connection_state") == "connected" and (
+                coordinator.data is None
+                or coordinator.data.get("connection_state") != "connected"
+            ):
+                self.connects.append(now)
+            set_updated(data)
+            latencies = self.latencies if self._live else self.replay_latencies
+            while self._rx:
+                latencies.append(now - self._rx.popleft())
+            self.last_publish = now
+
+        def _handle_disconnect() -> None:
+            handle_disconnect()
+            self.disconnects.append((time.perf_counter(), dict(coordinator.data)))
+
+        async def _heartbeat(ws: Any) -> None:
+            close = ws.close
+
+            async def _close(*args: Any, **kwargs: Any) -> Any:
+                self.heartbeat_closes.append(time.perf_counter())
+                return await close(*args, **kwargs)
+
+            ws.close = _close
+            await heartbeat(ws)
+
+        coordinator._parse_frame = _parse_frame
+        coordinator._handle_event = _handle_event
+        coordinator.async_set_updated_data = _set_updated
+        coordinator._handle_disconnect = _handle_disconnect
+        coordinator._heartbeat = _heartbeat
+
+
+async def _serve(standin: StandIn) -> tuple[web.AppRunner, int]:
+    app = web.Application()
+    app.router.add_get("/websocket", standin.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0, ssl_context=self_signed_context(None, None))
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+def _standin(**overrides: Any) -> StandIn:
+    args = argparse.Namespace(
+        script=None, format="binary", repeat=False, drop_every=0, burst=0, mute_after=0
+    )
+    vars(args).update(overrides)
+    return StandIn(args)
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _until(predicate: Any, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def _run(hass: HomeAssistant, standin: StandIn, done: Any, timeout: float) -> Probe:
+    runner, port = await _serve(standin)
+    coordinator_f1_v2.XTOOL_WS_PORT = port
+    # Nothing listens there: the snapshot fails fast, like an unreachable API
+    coordinator_f1_v2.XTOOL_HTTP_PORT = _closed_port()
+    coordinator = XToolF1V2Coordinator(hass, "127.0.0.1")
+    probe = Probe(coordinator)
+    coordinator.async_add_listener(lambda: None)
+    await coordinator.async_start()
+    try:
+        if not await _until(lambda: done(probe), timeout):
+            print("  (timed out)")
+    finally:
+        await coordinator.async_stop()
+        await runner.cleanup()
+    return probe
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.2f} ms"
+
+
+async def bench_burst(hass: HomeAssistant, events: int) -> None:
+    standin = _standin(burst=events)
+    probe = await _run(hass, standin, lambda p: p.frames >= events and not p._rx, 60)
+    span = probe.last_publish - (probe.first_frame or probe.last_publish)
+    print(f"burst: {probe.frames} frames, {probe.handled} live + "
+          f"{probe.frames - probe.handled} replayed after the snapshot")
+    if span:
+        print(f"  {probe.frames / span:,.0f} events/s end to end")
+    if probe.frames:
+        print(f"  {probe.handler_time / probe.frames * 1e6:.1f} us/event in "
+              "_parse_frame + _handle_event")
+    for name, latencies in (("live", probe.latencies), ("replayed", probe.replay_latencies)):
+        lat = sorted(latencies)
+        if lat:
+            print(f"  {name} frame -> async_set_updated_data: "
+                  f"p50 {_ms(statistics.median(lat))}, "
+                  f"p95 {_ms(lat[max(int(len(lat) * 0.95) - 1, 0)])}, max {_ms(lat[-1])}")
+
+
+def _scaled_script(scale: float) -> list[dict[str, Any]]:
+    return [{**step, "delay": step["delay"] * scale} for step in DEFAULT_SCRIPT]
+
+
+def _report_reconnect(name: str, probe: Probe, trigger: float) -> None:
+    disconnected, kept = probe.disconnects[0]
+    print(f"{name}:")
+    print(f"  trigger -> _handle_disconnect: {_ms(disconnected - trigger)}")
+    print(f"  state while disconnected: status={kept['status']} "
+          f"available={not kept['_unavailable']} running={kept['running']}")
+    if len(probe.connects) > 1:
+        print(f"  _handle_disconnect -> reconnected: {_ms(probe.connects[1] - disconnected)} "
+              f"(reconnect delay {coordinator_f1_v2.RECONNECT_DELAY * 1000:.0f} ms)")
+        first = probe.first_event_after.get(2)
+        if first:
+            print(f"  reconnected -> first event: {_ms(first - probe.connects[1])}")
+
+
+async def bench_drop(hass: HomeAssistant, drop_after: float) -> None:
+    standin = _standin(repeat=True, drop_every=drop_after)
+    standin.script = _scaled_script(0.02)
+    drops: list[float] = []
+    drop_after_orig = standin._drop_after
+
+    async def _drop_after(ws: Any, conn: int, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+        drops.append(time.perf_counter())
+        await drop_after_orig(ws, conn, 0)
+
+    standin._drop_after = _drop_after
+    probe = await _run(hass, standin, lambda p: 2 in p.first_event_after, 30)
+    if probe.disconnects and drops:
+        _report_reconnect("drop", probe, drops[0])
+
+
+async def bench_mute(hass: HomeAssistant, mute_after: float) -> None:
+    standin = _standin(repeat=True, mute_after=mute_after)
+    standin.script = _scaled_script(0.02)
+    probe = await _run(hass, standin, lambda p: len(p.connects) > 1, 30)
+    if not probe.disconnects:
+        return
+    silence = (
+        max(coordinator_f1_v2.HEARTBEAT_WORKING, coordinator_f1_v2.HEARTBEAT_IDLE)
+        * coordinator_f1_v2.HEARTBEAT_MAX_MISSED
+    )
+    muted = probe.connects[0] + mute_after
+    _report_reconnect("mute", probe, muted)
+    print(f"  closed by _heartbeat: {bool(probe.heartbeat_closes)} "
+          f"(limit {_ms(silence)} of silence, {standin.pings} pings answered)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=5000, help="burst size")
+    parser.add_argument("--reconnect-delay", type=float, default=0.2)
+    parser.add_argument("--heartbeat", type=float, default=0.2, help="heartbeat interval")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    coordinator_f1_v2.RECONNECT_DELAY = args.reconnect_delay
+    coordinator_f1_v2.HEARTBEAT_WORKING = args.heartbeat
+    coordinator_f1_v2.HEARTBEAT_IDLE = args.heartbeat
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await bench_burst(hass, args.events)
+        await bench_drop(hass, 0.5)
+        await bench_mute(hass, 0.5)
+        await hass.async_stop(force=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
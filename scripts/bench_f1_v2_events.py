@@ -0,0 +1,90 @@
+"""Time F1 V2 event routing over an event stream.
+
+Feeds an event stream through ``XToolF1V2Coordinator._apply_event`` (the
+routing and state merge, without publishing) and reports the time per event.
+The stream is the stand-in's default job, or a stand-in script (``--script``),
+mixed with a share of events no handler knows about. Use ``--root`` to run
+the same stream against another checkout (e.g. a git worktree of an older
+commit); the final state digest should match between checkouts.
+
+    python scripts/bench_f1_v2_events.py --events 200000
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import json
+from pathlib import Path
+import sys
+import time
+from typing import Any
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parents[1]
+
+from f1_v2_standin import DEFAULT_SCRIPT, load_script  # noqa: E402
+
+# Events seen on the device that no handler is interested in
+UNHANDLED: list[dict[str, Any]] = [
+    {"url": "/device/heartbeat", "data": {"module": "SYSTEM", "type": "HEARTBEAT"}},
+    {"url": "/fan/status", "data": {"module": "FAN", "type": "SPEED", "info": {"speed": 3}}},
+]
+
+
+def build_stream(script: list[dict[str, Any]], count: int, unknown_every: int) -> list[dict]:
+    known = [
+        {
+            "url": step["url"],
+            "timestamp": 0,
+            "data": {"module": step["module"], "type": step["type"], "info": step.get("info")},
+        }
+        for step in script
+        if not step.get("drop")
+    ]
+    stream: list[dict[str, Any]] = []
+    known_cycle = itertools.cycle(known)
+    unknown_cycle = itertools.cycle(UNHANDLED)
+    for i in range(count):
+        if unknown_every and i % unknown_every == unknown_every - 1:
+            stream.append(next(unknown_cycle))
+        else:
+            stream.append(next(known_cycle))
+    return stream
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--script", help="stand-in JSON lines script")
+    parser.add_argument(
+        "--unknown-every", type=int, default=10, help="every n-th event is unhandled (0: none)"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--root", type=Path, default=ROOT, help="checkout to measure")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(args.root))
+    from custom_components.xtool.coordinator_f1_v2 import XToolF1V2Coordinator
+
+    script = load_script(args.script) if args.script else DEFAULT_SCRIPT
+    stream = build_stream(script, args.events, args.unknown_every)
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        coordinator = XToolF1V2Coordinator(MagicMock(), "192.0.2.1")
+        apply_event = coordinator._apply_event
+        started = time.perf_counter()
+        for event in stream:
+            apply_event(event)
+        best = min(best, time.perf_counter() - started)
+
+    state = {k: v for k, v in coordinator._state.items() if k != "button_last"}
+    digest = hashlib.sha1(json.dumps(state, sort_keys=True).encode()).hexdigest()[:12]
+    print(f"{args.root}: {len(stream)} events, best of {args.repeat}")
+    print(f"  {best / len(stream) * 1e9:.0f} ns/event ({len(stream) / best:,.0f} events/s)")
+    print(f"  final state digest {digest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Measure the import time of the integration package.
+
+Each run is a fresh interpreter that first imports the Home Assistant modules
+a running instance has loaded anyway (including the recorder, a manifest
+dependency that is set up before this integration), then times ``import
+custom_components.xtool`` (what HA does before any entry is set up) and lists
+the xtool modules that import pulled in.
+
+    python scripts/bench_import.py --runs 15
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_CHILD = """
+import json, sys, time
+import aiohttp
+import homeassistant.core
+import homeassistant.components.recorder
+import homeassistant.components.recorder.statistics
+import homeassistant.config_entries
+import homeassistant.helpers.aiohttp_client
+import homeassistant.helpers.config_validation
+import homeassistant.helpers.event
+import homeassistant.helpers.storage
+import homeassistant.helpers.update_coordinator
+started = time.perf_counter()
+import custom_components.xtool
+elapsed = time.perf_counter() - started
+modules = sorted(m for m in sys.modules if m.startswith("custom_components.xtool."))
+print(json.dumps({"ms": elapsed * 1000, "modules": modules}))
+"""
+
+
+def run_once(root: Path) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        cwd=root,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument(
+        "--root", type=Path, default=ROOT, help="checkout to measure (e.g. a git worktree)"
+    )
+    args = parser.parse_args()
+
+    results = [run_once(args.root) for _ in range(args.runs)]
+    times = sorted(r["ms"] for r in results)
+    modules = [m.rsplit(".", 1)[1] for m in results[0]["modules"]]
+    print(f"import custom_components.xtool, {args.runs} runs:")
+    print(f"  median {statistics.median(times):.1f} ms, min {times[0]:.1f} ms")
+    print(f"  {len(modules)} xtool modules loaded: {', '.join(modules)}")
+
+
+if __name__ == "__main__":
+    main()
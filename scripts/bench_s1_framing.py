@@ -0,0 +1,64 @@
+"""Time S1 websocket frame splitting against the old single-match path.
+
+Runs every frame of ``tests/fixtures/s1_frames.json`` through
+``split_text_frame``/``split_binary_frame`` and through the listener code
+they replaced, and reports the time per frame and the messages found.
+
+    python scripts/bench_s1_framing.py --number 20000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import re
+import sys
+import timeit
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from custom_components.xtool.api_s1 import split_binary_frame, split_text_frame  # noqa: E402
+
+CORPUS = ROOT / "tests" / "fixtures" / "s1_frames.json"
+
+
+def legacy_split(frame: str | bytes) -> list[str]:
+    if isinstance(frame, bytes):
+        m = re.search(r'(M\d+ \S.*)', frame.decode("latin-1"))
+        return [m.group(1)] if m else []
+    return [frame]
+
+
+def split(frame: str | bytes) -> list[str]:
+    if isinstance(frame, bytes):
+        return split_binary_frame(frame)
+    return split_text_frame(frame)
+
+
+def load_frames() -> list[str | bytes]:
+    entries = json.loads(CORPUS.read_text(encoding="utf-8"))
+    return [
+        e["frame"].encode("latin-1") if e["kind"] == "binary" else e["frame"]
+        for e in entries
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=20000, help="passes over the corpus")
+    args = parser.parse_args()
+
+    frames = load_frames()
+    print(f"{len(frames)} frames, {args.number} passes")
+    for name, func in (("legacy", legacy_split), ("split", split)):
+        messages = sum(len(func(f)) for f in frames)
+        elapsed = min(
+            timeit.repeat(lambda: [func(f) for f in frames], number=args.number, repeat=5)
+        )
+        per_frame = elapsed / (args.number * len(frames)) * 1e6
+        print(f"{name:>7}: {per_frame:6.2f} us/frame, {messages} messages per pass")
+
+
+if __name__ == "__main__":
+    main()
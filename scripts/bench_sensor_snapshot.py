@@ -0,0 +1,118 @@
+"""Time sensor state computation per coordinator snapshot.
+
+Sets up a v2 HTTP model against the fake device of ``bench_setup.py``, which
+reports every optional accessory as present, so the entry has all of its
+entities. It then pushes snapshots through ``async_set_updated_data`` and
+reports, per snapshot:
+
+* update: deriving the display values (where the coordinator does that) and
+  the whole listener pass, i.e. every entity of the entry computing and
+  writing its state
+* sensors: the ``available``/``native_value``/``extra_state_attributes``
+  reads of the entry's sensor entities alone
+
+Use ``--root`` to measure another checkout.
+
+    python scripts/bench_sensor_snapshot.py --model m1u --snapshots 2000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+import statistics
+import tempfile
+import time
+from typing import Any
+
+from aiohttp import web
+
+from bench_setup import DEVICE_PORT, FakeDevice, ROOT, _config_entry, _hass
+
+
+def _sensor_entities(hass: Any, entry_id: str) -> list[Any]:
+    component = hass.data["sensor"]
+    return [
+        e for e in component.entities
+        if e.platform is not None and e.platform.config_entry is not None
+        and e.platform.config_entry.entry_id == entry_id
+    ]
+
+
+def _read(entities: list[Any]) -> None:
+    for entity in entities:
+        if entity.available:
+            entity.native_value
+            entity.extra_state_attributes
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default="m1u")
+    parser.add_argument("--snapshots", type=int, default=2000)
+    parser.add_argument("--root", type=Path, default=ROOT, help="checkout to measure")
+    args = parser.parse_args()
+
+    from homeassistant.helpers import entity_registry as er
+
+    logging.basicConfig(level=logging.ERROR)
+    logging.getLogger("homeassistant.components.camera.img_util").setLevel(logging.CRITICAL)
+    device = FakeDevice()
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", device.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", DEVICE_PORT).start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _hass(config_dir, args.root)
+        entry = _config_entry(args.model)
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        coordinator = hass.data["xtool"][entry.entry_id]["coordinator"]
+        # Checkouts before accessory detection add every accessory entity anyway
+        accessories = sorted(getattr(hass.data["xtool"][entry.entry_id]["profile"], "accessories", ()))
+        missing = [n for n in accessories if not coordinator.accessories.get(n)]
+        if missing:
+            raise SystemExit(f"accessories not detected: {', '.join(missing)}")
+        entities = _sensor_entities(hass, entry.entry_id)
+        registered = len(er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id))
+
+        idle = {
+            **coordinator.data,
+            "work_state_raw": "P_IDLE",
+            "working_info": {"code": 0, "data": {"numOnlineWorking": 12, "timeSystemWork": 7200}},
+        }
+        snapshots = [idle, {**idle, "work_state_raw": "P_WORKING"}]
+        # Since the display values are derived per snapshot, count that too
+        derive = getattr(coordinator, "_derive_display_values", None)
+
+        updates: list[float] = []
+        reads: list[float] = []
+        for i in range(args.snapshots):
+            snapshot = dict(snapshots[i % 2])
+            started = time.perf_counter()
+            if derive is not None:
+                derive(snapshot)
+            coordinator.async_set_updated_data(snapshot)
+            updates.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            _read(entities)
+            reads.append(time.perf_counter() - started)
+
+        print(
+            f"{args.root}: {args.model}, {registered} entities ({len(entities)} sensors, "
+            f"accessories: {', '.join(accessories) or 'all'}), "
+            f"{args.snapshots} snapshots"
+        )
+        print(f"  update:  median {statistics.median(updates) * 1e6:.0f} us/snapshot")
+        print(f"  sensors: median {statistics.median(reads) * 1e6:.1f} us/snapshot "
+              f"({statistics.median(reads) / len(entities) * 1e9:.0f} ns/sensor)")
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop(force=True)
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,188 @@
+"""Time config entry setup against a fake v2 HTTP device.
+
+Serves canned replies of the v2 HTTP API on 127.0.0.1:8080 (the port the
+coordinator uses) and sets up one config entry per model on a bare
+``HomeAssistant`` instance. Reported per model: setup time, time spent
+forwarding to the entity platforms, the platforms forwarded to, the entities
+created and the requests the device saw during setup.
+
+The entity platform components (and the recorder, a manifest dependency) are
+set up before timing, as they would be in a running instance. Use ``--root``
+to measure another checkout, e.g. a git worktree of an older commit.
+
+    python scripts/bench_setup.py --models p2 f1 m1u --runs 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+import inspect
+import logging
+import os
+from pathlib import Path
+import socket
+import statistics
+import tempfile
+import time
+from types import MappingProxyType
+from typing import Any
+
+from aiohttp import web
+
+ROOT = Path(__file__).resolve().parents[1]
+
+DEVICE_PORT = 8080
+PLATFORM_COMPONENTS = ("sensor", "binary_sensor", "camera", "switch", "button", "image")
+
+_OK = {"code": 0, "data": {}}
+REPLIES: dict[str, Any] = {
+    "/device/runningStatus": {"code": 0, "data": {"curMode": {"mode": "P_IDLE"}, "cpuTemp": 40}},
+    "/device/machineInfo": {"code": 0, "data": {"sn": "BENCH0001", "firmware": "40.51"}},
+    "/device/workingInfo": {"code": 0, "data": {"workingTime": 3600, "jobsTotal": 12}},
+}
+# Peripheral reads report a connected accessory
+PERIPHERAL = {"code": 0, "data": {"state": "off", "exist": True, "version": "1.0"}}
+
+
+class FakeDevice:
+    def __init__(self) -> None:
+        self.requests: Counter[str] = Counter()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests[request.path] += 1
+        if request.path.startswith("/peripheral/"):
+            return web.json_response(PERIPHERAL)
+        return web.json_response(REPLIES.get(request.path, _OK))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _config_entry(model: str) -> Any:
+    from homeassistant.config_entries import ConfigEntry
+
+    kwargs = {
+        "data": {"ip_address": "127.0.0.1", "device_type": model},
+        "discovery_keys": MappingProxyType({}),
+        "domain": "xtool",
+        "minor_version": 1,
+        "options": {},
+        "source": "user",
+        "title": f"bench {model}",
+        "unique_id": None,
+        "version": 1,
+    }
+    params = inspect.signature(ConfigEntry.__init__).parameters
+    return ConfigEntry(**{k: v for k, v in kwargs.items() if k in params})
+
+
+async def _hass(config_dir: str, root: Path) -> Any:
+    from homeassistant import auth, bootstrap, loader
+    from homeassistant.config_entries import ConfigEntries
+    from homeassistant.core import HomeAssistant
+    from homeassistant.setup import async_setup_component
+
+    os.symlink(root / "custom_components", Path(config_dir) / "custom_components")
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await loader.async_get_custom_components(hass)
+    if hasattr(bootstrap, "async_load_base_functionality"):
+        await bootstrap.async_load_base_functionality(hass)
+    else:
+        await bootstrap.load_registries(hass)  # older cores: only the registries
+    hass.auth = await auth.auth_manager_from_config(hass, [], [])
+    await async_setup_component(hass, "homeassistant", {})
+    await async_setup_component(hass, "http", {"http": {"server_port": _free_port()}})
+    try:
+        from homeassistant.helpers import recorder
+
+        recorder.async_initialize_recorder(hass)
+    except (ImportError, AttributeError):
+        pass  # older cores set the recorder up without it
+    await async_setup_component(hass, "recorder", {})
+    for domain in PLATFORM_COMPONENTS:
+        await async_setup_component(hass, domain, {})
+    await hass.async_block_till_done()
+    return hass
+
+
+async def _setup_once(hass: Any, device: FakeDevice, model: str) -> dict[str, Any]:
+    from homeassistant.helpers import entity_registry as er
+
+    entries = hass.config_entries
+    forward = entries.async_forward_entry_setups
+    forwarded: dict[str, Any] = {}
+
+    async def _timed_forward(entry: Any, platforms: Any) -> None:
+        started = time.perf_counter()
+        await forward(entry, platforms)
+        forwarded["platforms"] = list(platforms)
+        forwarded["seconds"] = time.perf_counter() - started
+
+    entries.async_forward_entry_setups = _timed_forward
+    device.requests.clear()
+    entry = _config_entry(model)
+    started = time.perf_counter()
+    await entries.async_add(entry)
+    await hass.async_block_till_done()
+    elapsed = time.perf_counter() - started
+    requests = sum(device.requests.values())
+    state = entry.state.value
+    entities = len(
+        er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    )
+    await entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    entries.async_forward_entry_setups = forward
+    return {
+        "state": state,
+        "seconds": elapsed,
+        "forward": forwarded.get("seconds", 0.0),
+        "platforms": forwarded.get("platforms", []),
+        "entities": entities,
+        "requests": requests,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--models", nargs="+", default=["p2", "f1", "m1u"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--root", type=Path, default=ROOT, help="checkout to measure")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    # No libturbojpeg needed for a setup benchmark
+    logging.getLogger("homeassistant.components.camera.img_util").setLevel(logging.CRITICAL)
+    device = FakeDevice()
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", device.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", DEVICE_PORT).start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _hass(config_dir, args.root)
+        print(f"{args.root}, median of {args.runs} setups:")
+        for model in args.models:
+            runs = [await _setup_once(hass, device, model) for _ in range(args.runs)]
+            last = runs[-1]
+            print(
+                f"  {model:>4}: setup {statistics.median(r['seconds'] for r in runs) * 1000:.1f} ms, "
+                f"forward {statistics.median(r['forward'] for r in runs) * 1000:.1f} ms "
+                f"to {len(last['platforms'])} platforms ({', '.join(last['platforms'])}), "
+                f"{last['entities']} entities, {last['requests']} device requests "
+                f"[{last['state']}]"
+            )
+        await hass.async_stop(force=True)
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
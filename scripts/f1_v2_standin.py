@@ -0,0 +1,257 @@
+"""Local stand-in for the F1 V2 (firmware 40.51+) websocket.
+
+Serves a self-signed ``wss://`` endpoint that behaves like the laser as far as
+``XToolF1V2Coordinator`` is concerned:
+
+* the first text message must be the handshake string, otherwise the socket
+  is closed with 1008
+* the binary ping is answered with the same two bytes
+* events from a script are sent either as text JSON or as a binary frame
+  with a short prefix in front of the JSON
+* ``--drop-every`` closes every connection after that many seconds so the
+  reconnect path can be watched
+* ``--mute-after`` goes silent (no events, no ping replies) after that many
+  seconds with the socket left open, so the client heartbeat has to notice
+
+Script files are JSON lines, one step per line::
+
+    {"delay": 1, "url": "/work/mode", "module": "STATUS_CONTROLLER",
+     "type": "MODE_CHANGE", "info": {"mode": "P_WORKING"}, "format": "binary"}
+    {"delay": 5, "drop": true}
+
+Without ``--script`` a short job (ready, framing, work, lid, button, finish)
+is played. Only aiohttp is needed; the certificate is generated with the
+``openssl`` command line tool unless ``--cert``/``--key`` are given.
+
+    python scripts/f1_v2_standin.py --port 28900 --repeat
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import ssl
+import subprocess
+import tempfile
+import time
+from typing import Any
+
+from aiohttp import WSMsgType, web
+
+_LOGGER = logging.getLogger("f1_v2_standin")
+
+# Must match custom_components/xtool/coordinator_f1_v2.py
+XTOOL_WS_PORT = 28900
+XTOOL_WS_HANDSHAKE = "bWFrZWJsb2NrLXh0b29s"
+XTOOL_WS_PING = b"\xC0\x00"
+
+BINARY_PREFIX = b"\xC1\x00"
+
+
+def _step(delay: float, url: str, module: str, typ: str, info: Any = None) -> dict[str, Any]:
+    return {"delay": delay, "url": url, "module": module, "type": typ, "info": info}
+
+
+DEFAULT_SCRIPT: list[dict[str, Any]] = [
+    _step(1, "/work/mode", "STATUS_CONTROLLER", "MODE_CHANGE", {"mode": "P_READY"}),
+    _step(1, "/device/status", "STATUS_CONTROLLER", "WORK_PREPARED", "framing"),
+    _step(2, "/device/status", "STATUS_CONTROLLER", "WORK_STARTED", "framing"),
+    _step(2, "/device/status", "STATUS_CONTROLLER", "WORK_FINISHED", "framing"),
+    _step(1, "/button/status", "BUTTON", "PRESS", {"key": "start"}),
+    _step(1, "/work/mode", "STATUS_CONTROLLER", "MODE_CHANGE", {"mode": "P_WORKING"}),
+    _step(1, "/device/status", "STATUS_CONTROLLER", "WORK_STARTED", "work"),
+    _step(3, "/gap/status", "GAP", "OPEN"),
+    _step(2, "/gap/status", "GAP", "CLOSE"),
+    _step(3, "/device/status", "STATUS_CONTROLLER", "WORK_FINISHED", "work"),
+    _step(
+        0,
+        "/work/result",
+        "WORK_RESULT",
+        "WORK_FINISHED",
+        {"result": "ok", "timeUse": 9000, "taskId": "standin"},
+    ),
+    _step(1, "/work/mode", "STATUS_CONTROLLER", "MODE_CHANGE", {"mode": "P_IDLE"}),
+    _step(5, "/machine_lock/status", "MACHINE_LOCK", "CLOSE"),
+    _step(5, "/machine_lock/status", "MACHINE_LOCK", "OPEN"),
+]
+
+
+def load_script(path: str) -> list[dict[str, Any]]:
+    with open(path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def encode_event(step: dict[str, Any], fmt: str) -> str | bytes:
+    event = {
+        "url": step["url"],
+        "timestamp": int(time.time() * 1000),
+        "data": {"module": step["module"], "type": step["type"], "info": step.get("info")},
+    }
+    text = json.dumps(event, separators=(",", ":"))
+    if fmt == "text":
+        return text
+    return BINARY_PREFIX + text.encode("utf-8")
+
+
+def self_signed_context(cert: str | None, key: str | None) -> ssl.SSLContext:
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    if cert and key:
+        ctx.load_cert_chain(cert, key)
+        return ctx
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cert = os.path.join(tmp, "cert.pem")
+        key = os.path.join(tmp, "key.pem")
+        subprocess.run(
+            [
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                "-days", "1", "-subj", "/CN=xtool-f1-standin",
+                "-keyout", key, "-out", cert,
+            ],
+            check=True,
+            capture_output=True,
+        )
+        ctx.load_cert_chain(cert, key)
+    return ctx
+
+
+class StandIn:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.script = load_script(args.script) if args.script else DEFAULT_SCRIPT
+        self.format = args.format
+        self.repeat = args.repeat
+        self.drop_every = args.drop_every
+        self.burst = args.burst
+        self.mute_after = args.mute_after
+        self.connections = 0
+        self.pings = 0
+
+    async def handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        self.connections += 1
+        conn = self.connections
+        _LOGGER.info("#%d connected from %s (%s)", conn, request.remote, request.query_string)
+
+        try:
+            first = await ws.receive(timeout=10)
+        except asyncio.TimeoutError:
+            await ws.close(code=1008, message=b"no handshake")
+            return ws
+        if first.type != WSMsgType.TEXT or first.data != XTOOL_WS_HANDSHAKE:
+            _LOGGER.warning("#%d bad handshake: %r", conn, first.data)
+            await ws.close(code=1008, message=b"bad handshake")
+            return ws
+
+        muted_at = time.monotonic() + self.mute_after if self.mute_after else None
+        sender = asyncio.create_task(self._play(ws, conn, muted_at))
+        dropper = (
+            asyncio.create_task(self._drop_after(ws, conn, self.drop_every))
+            if self.drop_every
+            else None
+        )
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.BINARY and msg.data == XTOOL_WS_PING:
+                    if muted_at is not None and time.monotonic() >= muted_at:
+                        continue
+                    self.pings += 1
+                    await ws.send_bytes(XTOOL_WS_PING)
+                elif msg.type == WSMsgType.ERROR:
+                    break
+                else:
+                    _LOGGER.info("#%d received %s %r", conn, msg.type, msg.data)
+        finally:
+            for task in (sender, dropper):
+                if task:
+                    task.cancel()
+            _LOGGER.info("#%d closed (%d pings so far)", conn, self.pings)
+        return ws
+
+    async def _drop_after(self, ws: web.WebSocketResponse, conn: int, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+        _LOGGER.info("#%d injected drop", conn)
+        await ws.close(code=1011, message=b"injected drop")
+
+    async def _send(self, ws: web.WebSocketResponse, step: dict[str, Any]) -> None:
+        frame = encode_event(step, step.get("format", self.format))
+        if isinstance(frame, bytes):
+            await ws.send_bytes(frame)
+        else:
+            await ws.send_str(frame)
+
+    async def _play(
+        self, ws: web.WebSocketResponse, conn: int, muted_at: float | None
+    ) -> None:
+        if self.burst:
+            # Throughput run: the whole script back to back, no delays
+            started = time.perf_counter()
+            for i in range(self.burst):
+                await self._send(ws, self.script[i % len(self.script)])
+            elapsed = time.perf_counter() - started
+            _LOGGER.info(
+                "#%d sent %d events in %.3fs (%.0f/s)",
+                conn, self.burst, elapsed, self.burst / elapsed if elapsed else 0,
+            )
+            return
+
+        while True:
+            for step in self.script:
+                await asyncio.sleep(step.get("delay", 0))
+                if muted_at is not None and time.monotonic() >= muted_at:
+                    _LOGGER.info("#%d muted", conn)
+                    return
+                if step.get("drop"):
+                    _LOGGER.info("#%d scripted drop", conn)
+                    await ws.close(code=1011, message=b"scripted drop")
+                    return
+                await self._send(ws, step)
+                _LOGGER.info("#%d -> %s %s", conn, step["url"], step["type"])
+            if not self.repeat:
+                return
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=XTOOL_WS_PORT)
+    parser.add_argument("--cert", help="PEM certificate (generated if omitted)")
+    parser.add_argument("--key", help="PEM private key (generated if omitted)")
+    parser.add_argument("--script", help="JSON lines event script")
+    parser.add_argument(
+        "--format", choices=("binary", "text"), default="binary",
+        help="frame format for steps that do not set one",
+    )
+    parser.add_argument("--repeat", action="store_true", help="loop the script")
+    parser.add_argument(
+        "--drop-every", type=float, default=0,
+        help="close each connection after this many seconds",
+    )
+    parser.add_argument(
+        "--burst", type=int, default=0,
+        help="send this many events without delay, then idle",
+    )
+    parser.add_argument(
+        "--mute-after", type=float, default=0,
+        help="stop sending and answering pings after this many seconds",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    standin = StandIn(args)
+    app = web.Application()
+    app.router.add_get("/websocket", standin.handle)
+    web.run_app(
+        app,
+        host=args.host,
+        port=args.port,
+        ssl_context=self_signed_context(args.cert, args.key),
+        print=lambda msg: _LOGGER.info("%s", msg),
+    )
+
+
+if __name__ == "__main__":
+    main()
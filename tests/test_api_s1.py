@@ -0,0 +1,95 @@
+"""Splitting of S1 websocket frames into M-code messages."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import re
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.xtool.api_s1 import (
+    XToolS1Api,
+    split_binary_frame,
+    split_text_frame,
+)
+from custom_components.xtool.const import S1_RUNNING_STATES
+
+# Binary frames are stored as latin-1 strings so every byte stays readable
+CORPUS: list[dict[str, Any]] = json.loads(
+    (Path(__file__).parent / "fixtures" / "s1_frames.json").read_text(encoding="utf-8")
+)
+
+
+def _frame(entry: dict[str, Any]) -> str | bytes:
+    if entry["kind"] == "binary":
+        return entry["frame"].encode("latin-1")
+    return entry["frame"]
+
+
+def _split(frame: str | bytes) -> list[str]:
+    if isinstance(frame, bytes):
+        return split_binary_frame(frame)
+    return split_text_frame(frame)
+
+
+def _legacy_split(frame: str | bytes) -> list[str]:
+    """The listener before frames were split: one message per frame at most."""
+    if isinstance(frame, bytes):
+        m = re.search(r'(M\d+ \S.*)', frame.decode("latin-1"))
+        return [m.group(1)] if m else []
+    return [frame]
+
+
+def _state(messages: list[str]) -> dict[str, Any]:
+    api = XToolS1Api("192.0.2.1", MagicMock())
+    for message in messages:
+        api._handle_message(message)
+    return api.state
+
+
+@pytest.mark.parametrize("entry", CORPUS, ids=[e["name"] for e in CORPUS])
+def test_corpus(entry: dict[str, Any]) -> None:
+    assert _split(_frame(entry)) == entry["messages"]
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [e for e in CORPUS if e["legacy"]],
+    ids=[e["name"] for e in CORPUS if e["legacy"]],
+)
+def test_parity_with_legacy_split(entry: dict[str, Any]) -> None:
+    """Frames the old listener handled give the same state as before."""
+    frame = _frame(entry)
+    assert _state(_split(frame)) == _state(_legacy_split(frame))
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [e for e in CORPUS if not e["legacy"]],
+    ids=[e["name"] for e in CORPUS if not e["legacy"]],
+)
+def test_legacy_split_lost_messages(entry: dict[str, Any]) -> None:
+    """The remaining corpus entries are the ones the old listener got wrong."""
+    frame = _frame(entry)
+    assert _state(_split(frame)) != _state(_legacy_split(frame))
+
+
+def test_concatenated_binary_frames() -> None:
+    """Several binary payloads in one frame give all of their messages, in order."""
+    entries = [e for e in CORPUS if e["kind"] == "binary"]
+    frame = b"".join(_frame(e) for e in entries)
+    expected = [m for e in entries for m in e["messages"]]
+    assert split_binary_frame(frame) == expected
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["M222 S14", "M222 14", 'M2003{"M222":"S14"}', 'M2003{"M222":14}'],
+)
+def test_work_state_raw_matches_running_states(message: str) -> None:
+    """M222 replies and the M2003 field both give the "S14" form."""
+    raw = _state([message])["work_state_raw"]
+    assert raw == "S14"
+    assert raw in S1_RUNNING_STATES
@@ -0,0 +1,56 @@
+"""Peripheral polling of the v2 HTTP coordinator."""
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.xtool.coordinator import XToolCoordinator
+
+RUNNING_STATUS = {"code": 0, "data": {"curMode": {"mode": "P_IDLE"}, "cpuTemp": 40}}
+# An accessory port with nothing plugged in
+ABSENT = {"code": 0, "data": {"state": "off", "exist": False, "version": ""}}
+
+
+def _coordinator(device_type: str) -> tuple[XToolCoordinator, list[list[str]]]:
+    coordinator = XToolCoordinator(MagicMock(), "192.0.2.1", device_type)
+    ticks: list[list[str]] = []
+
+    def _request(path: str, payload: Any = None) -> Any:
+        ticks[-1].append(path)
+        return RUNNING_STATUS if path == "/device/runningStatus" else ABSENT
+
+    coordinator._get = _request
+    coordinator._post = _request
+    return coordinator, ticks
+
+
+def _run_ticks(coordinator: XToolCoordinator, ticks: list[list[str]], count: int) -> None:
+    for _ in range(count):
+        ticks.append([])
+        coordinator.data = coordinator._fetch_data_sync()
+
+
+def test_f1_polls_ext_purifier_every_fast_tick() -> None:
+    """The F1's own exhaust fan is read through ext_purifier; never gate it."""
+    coordinator, ticks = _coordinator("f1")
+    _run_ticks(coordinator, ticks, 3)
+
+    assert "ext_purifier" not in coordinator.accessories
+    for paths in ticks:
+        assert "/peripheral/ext_purifier" in paths
+
+
+@pytest.mark.parametrize("device_type", ["p2", "m1"])
+def test_missing_accessories_move_to_slow_tier(device_type: str) -> None:
+    coordinator, ticks = _coordinator(device_type)
+    _run_ticks(coordinator, ticks, 2)
+
+    first, fast = ticks
+    for path in ("/peripheral/smoking_fan", "/peripheral/ext_purifier", "/peripheral/airassist"):
+        assert path in first
+        assert path not in fast
+    # Non-accessory peripherals keep the fast cadence
+    assert "/peripheral/gap" in fast
+    assert coordinator.accessories["ext_purifier"] is False
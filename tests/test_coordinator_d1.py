@@ -0,0 +1,49 @@
+"""Read scheduling of the D1 coordinator."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.xtool.coordinator_d1 import XToolD1Coordinator
+
+PERIPH = {"sdCard": "1", "limitStopFlag": "0"}
+
+
+def _coordinator(working_state: str) -> XToolD1Coordinator:
+    with patch("custom_components.xtool.coordinator_d1.async_get_clientsession"):
+        coordinator = XToolD1Coordinator(MagicMock(), "192.0.2.1")
+    coordinator.api = MagicMock(
+        get_working_state=AsyncMock(return_value=working_state),
+        get_peripheral_status=AsyncMock(return_value=PERIPH),
+        get_progress=AsyncMock(return_value={"progress": "10"}),
+        get_machine_type=AsyncMock(return_value="D1"),
+    )
+    return coordinator
+
+
+def _run_ticks(coordinator: XToolD1Coordinator, count: int) -> list[dict[str, Any]]:
+    async def _ticks() -> list[dict[str, Any]]:
+        out = []
+        for _ in range(count):
+            coordinator.data = await coordinator._async_update_data()
+            out.append(coordinator.data)
+        return out
+
+    return asyncio.run(_ticks())
+
+
+def test_peripheral_status_on_slow_ticks_while_running() -> None:
+    coordinator = _coordinator("1")
+    ticks = _run_ticks(coordinator, coordinator._periph_every * 2)
+
+    # The first tick (state not known yet), then every _periph_every ticks
+    assert coordinator.api.get_peripheral_status.await_count == 3
+    # The last reply is kept in between
+    assert all(t["peripheral_raw"] == PERIPH and t["sdCard"] is True for t in ticks)
+
+
+def test_peripheral_status_every_idle_tick() -> None:
+    coordinator = _coordinator("0")
+    _run_ticks(coordinator, 3)
+    assert coordinator.api.get_peripheral_status.await_count == 3
@@ -0,0 +1,123 @@
+"""Config entry setup and the options flow on a real HomeAssistant instance."""
+from __future__ import annotations
+
+import asyncio
+import inspect
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant  # before loader (import cycle on 2024.1)
+from homeassistant import loader
+from homeassistant.config_entries import ConfigEntries, ConfigEntry
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from custom_components.xtool import async_setup_entry, async_unload_entry
+from custom_components.xtool.config_flow import XToolConfigFlow
+from custom_components.xtool.const import (
+    CONF_FINISH_LEAD_TIME,
+    DEFAULT_FINISH_LEAD_TIME,
+    DOMAIN,
+)
+
+
+def _entry(device_type: str, **data: Any) -> ConfigEntry:
+    kwargs = {
+        "data": {"ip_address": "192.0.2.1", "device_type": device_type, **data},
+        "discovery_keys": MappingProxyType({}),
+        "domain": DOMAIN,
+        "minor_version": 1,
+        "options": {},
+        "source": "user",
+        "title": f"test {device_type}",
+        "unique_id": None,
+        "version": 1,
+    }
+    # Newer cores require arguments older ones do not accept
+    params = inspect.signature(ConfigEntry.__init__).parameters
+    return ConfigEntry(**{k: v for k, v in kwargs.items() if k in params})
+
+
+async def _hass(config_dir: Path) -> HomeAssistant:
+    hass = HomeAssistant(str(config_dir))
+    if hasattr(loader, "async_setup"):  # 2024.3+
+        loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    return hass
+
+
+@pytest.mark.parametrize(
+    ("device_type", "data", "deferred"),
+    [
+        ("p2", {}, "timelapse"),
+        ("s1", {"has_ap2": True}, "filter_forecast"),
+        ("d1", {}, "uploader"),
+        ("f1_v2", {}, None),
+    ],
+)
+def test_setup_and_unload_entry(
+    tmp_path: Path, device_type: str, data: dict[str, Any], deferred: str | None
+) -> None:
+    """Setup imports the coordinator and feature modules the model needs."""
+
+    async def _run() -> dict[str, Any]:
+        hass = await _hass(tmp_path)
+        entry = _entry(device_type, **data)
+        hass.config_entries._entries[entry.entry_id] = entry
+        with patch.object(
+            DataUpdateCoordinator, "async_config_entry_first_refresh", AsyncMock()
+        ), patch(
+            "custom_components.xtool.long_term_stats.XToolStatisticsImporter._async_restore",
+            AsyncMock(),
+        ), patch(
+            "custom_components.xtool.coordinator_f1_v2.XToolF1V2Coordinator.async_start",
+            AsyncMock(),
+        ), patch.object(
+            hass.config_entries, "async_forward_entry_setups", AsyncMock()
+        ) as forward, patch.object(
+            hass.config_entries, "async_unload_platforms", AsyncMock(return_value=True)
+        ):
+            assert await async_setup_entry(hass, entry)
+            store = dict(hass.data[DOMAIN][entry.entry_id])
+            forward.assert_awaited_once_with(entry, store["platforms"])
+            assert await async_unload_entry(hass, entry)
+        assert entry.entry_id not in hass.data[DOMAIN]
+        await hass.async_stop(force=True)
+        return store
+
+    store = asyncio.run(_run())
+    assert store["device_type"] == device_type
+    if deferred is not None:
+        assert store[deferred] is not None
+
+
+def test_options_flow(tmp_path: Path) -> None:
+    """The options dialog opens with the current lead time and saves a new one."""
+
+    async def _run() -> tuple[dict[str, Any], dict[str, Any]]:
+        hass = await _hass(tmp_path)
+        entry = _entry("p2")
+        hass.config_entries._entries[entry.entry_id] = entry
+        # Resolve the handler directly instead of loading the integration
+        with patch(
+            "homeassistant.config_entries._async_get_flow_handler",
+            AsyncMock(return_value=XToolConfigFlow),
+        ):
+            options = hass.config_entries.options
+            form = await options.async_init(entry.entry_id)
+            result = await options.async_configure(
+                form["flow_id"], {CONF_FINISH_LEAD_TIME: 10}
+            )
+        await hass.async_stop(force=True)
+        return form, result
+
+    form, result = asyncio.run(_run())
+    assert form["type"] == FlowResultType.FORM
+    (field,) = form["data_schema"].schema
+    assert field.default() == DEFAULT_FINISH_LEAD_TIME
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_FINISH_LEAD_TIME: 10}
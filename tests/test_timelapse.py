@@ -0,0 +1,23 @@
+"""Capture loop of the P2 timelapse recorder."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.xtool.timelapse import STREAMS, XToolTimelapseRecorder
+
+
+def test_capture_reschedules_after_write_error(tmp_path) -> None:
+    hass = MagicMock()
+    hass.config.path.return_value = str(tmp_path)
+    hass.async_add_executor_job = AsyncMock(side_effect=OSError(28, "No space left on device"))
+    recorder = XToolTimelapseRecorder(hass, "entry", "192.0.2.1")
+    recorder._job_dir = job_dir = str(tmp_path / "1")
+    recorder._frames = {stream: [] for stream in STREAMS}
+    recorder._async_fetch = AsyncMock(return_value=b"\xff\xd8frame")
+    recorder._schedule = MagicMock()
+
+    with patch("custom_components.xtool.timelapse.async_get_clientsession"):
+        asyncio.run(recorder._async_capture(job_dir))
+
+    recorder._schedule.assert_called_once_with(recorder._interval)
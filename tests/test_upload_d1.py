@@ -0,0 +1,24 @@
+"""Reply check of the D1 job upload."""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from custom_components.xtool.upload_d1 import _reply_ok
+
+
+@pytest.mark.parametrize(
+    "reply",
+    ["ok", "OK\n", "success", {"result": "ok"}, {"msg": "Success"}, {"code": 0}],
+)
+def test_confirmed_upload(reply: Any) -> None:
+    assert _reply_ok(reply)
+
+
+@pytest.mark.parametrize(
+    "reply",
+    ["", "fail", "busy", "<html>", None, {}, {"result": "error"}, {"code": 1}, ["ok"]],
+)
+def test_unconfirmed_upload(reply: Any) -> None:
+    assert not _reply_ok(reply)